@@ -0,0 +1,10 @@
+"""
+Offline benchmarks for the analysis pipeline.
+
+    cd backend
+    python -m benchmarks.pipeline_benchmark --durations 5m,1h --repeat 3
+
+The real AnalysisPipeline is built by PipelineFactory and run end to end
+against deterministic stand-ins for Gemini, Tavily, AssemblyAI and
+Firestore (see fakes.py), so no network or credentials are needed.
+"""
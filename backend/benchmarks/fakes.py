@@ -0,0 +1,482 @@
+"""
+Deterministic stand-ins for the services the pipeline calls.
+
+Each stand-in has the interface of the real client it replaces (the same
+methods, arguments and response shapes) and waits for a latency drawn from
+a seeded LatencyModel before answering, so a benchmark runs the real
+pipeline code with provider time simulated instead of spent on the network.
+
+- ReplayChatModel: Gemini, answering with llm_responses.scripted_response
+- ReplayTavilyClient: TavilyClient.search
+- ReplayTranscriber: AssemblyAIProcessor, returning synthetic transcripts
+- InMemoryDBManager: the db_manager functions the pipeline uses, and the
+  Firestore client behind the entity cache
+"""
+
+import asyncio
+import copy
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import ConfigDict, PrivateAttr
+
+from src.pipeline.interfaces import AudioProcessor
+
+from .llm_responses import scripted_response
+
+# z-score of the 95th percentile of a standard normal distribution
+_Z95 = 1.6448536
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """
+    Log-normal latency with the given median and 95th percentile, in
+    seconds. A median of 0 means no delay.
+    """
+
+    p50: float = 0.0
+    p95: Optional[float] = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        """From "p50" or "p50:p95", e.g. "1.2:4"."""
+        p50, _, p95 = spec.partition(":")
+        model = cls(float(p50), float(p95) if p95 else None)
+        if model.p50 < 0 or (model.p95 is not None and model.p95 < model.p50):
+            raise ValueError(f"Invalid latency '{spec}'; expected p50[:p95] with p95 >= p50")
+        return model
+
+    def scaled(self, factor: float) -> "LatencyModel":
+        return LatencyModel(
+            self.p50 * factor, self.p95 * factor if self.p95 is not None else None
+        )
+
+    def sample(self, rng: random.Random) -> float:
+        if self.p50 <= 0:
+            return 0.0
+        if not self.p95 or self.p95 <= self.p50:
+            return self.p50
+        sigma = math.log(self.p95 / self.p50) / _Z95
+        return rng.lognormvariate(math.log(self.p50), sigma)
+
+    def __str__(self) -> str:
+        return f"{self.p50:g}:{self.p95:g}" if self.p95 else f"{self.p50:g}"
+
+
+class _Delay:
+    """Latency samples from a seeded generator, safe to share between threads."""
+
+    def __init__(self, latency: LatencyModel, seed: int):
+        self.latency = latency
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def next(self) -> float:
+        with self._lock:
+            return self.latency.sample(self._rng)
+
+    def sleep(self):
+        seconds = self.next()
+        if seconds:
+            time.sleep(seconds)
+
+    async def asleep(self):
+        seconds = self.next()
+        if seconds:
+            await asyncio.sleep(seconds)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(len(text) // 4, 1)
+
+
+class ReplayChatModel(BaseChatModel):
+    """Chat model that answers the pipeline's prompts with scripted responses."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model: str = "replay"
+    latency: LatencyModel = LatencyModel()
+    seed: int = 0
+
+    _delay: _Delay = PrivateAttr()
+    _lock: Any = PrivateAttr()
+    _calls: int = PrivateAttr(default=0)
+    _unmatched: List[str] = PrivateAttr(default_factory=list)
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        self._delay = _Delay(self.latency, self.seed)
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    @property
+    def unmatched(self) -> List[str]:
+        """Starts of the prompts that had no scripted response."""
+        return list(self._unmatched)
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model}
+
+    def _respond(self, messages: List[BaseMessage]) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        text = scripted_response(prompt)
+        with self._lock:
+            self._calls += 1
+            if text is None:
+                self._unmatched.append(prompt[:200])
+        if text is None:
+            text = "{}"
+        input_tokens = _estimate_tokens(prompt)
+        output_tokens = _estimate_tokens(text)
+        message = AIMessage(
+            content=text,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self._delay.sleep()
+        return self._respond(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await self._delay.asleep()
+        return self._respond(messages)
+
+
+class ReplayClients(SimpleNamespace):
+    """
+    Stands in for the src.clients module: get_llm returns one
+    ReplayChatModel per model name, like the module's shared clients.
+    """
+
+    def __init__(self, llm_latency: LatencyModel, seed: int = 0, **clients: Any):
+        super().__init__(httpx_client=None, gcs_client=None, **clients)
+        self.llms = {
+            name: ReplayChatModel(model=name, latency=llm_latency, seed=seed + i)
+            for i, name in enumerate(("best", "best-lite", "main"))
+        }
+
+    def get_llm(self, model_name: str, temperature: Optional[float] = None):
+        llm = self.llms.get(model_name)
+        if llm is None:
+            raise ValueError(f"LLM client '{model_name}' not found or not initialized.")
+        options = {}
+        if temperature is not None:
+            options["temperature"] = temperature
+        return llm, options
+
+
+class ReplayTavilyClient:
+    """TavilyClient.search with generated results; blocking, like the real client."""
+
+    def __init__(self, latency: LatencyModel, seed: int = 0, results_per_query: int = 3):
+        self._delay = _Delay(latency, seed)
+        self.results_per_query = results_per_query
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def search(self, query: str, search_depth: str = "basic", **kwargs) -> Dict[str, Any]:
+        self._delay.sleep()
+        with self._lock:
+            self.calls += 1
+        slug = "-".join(query.lower().split())[:60]
+        return {
+            "query": query,
+            "results": [
+                {
+                    "url": f"https://example.com/{slug}/{i}",
+                    "title": f"{query} ({i + 1})",
+                    "content": f"An overview of {query}. " * 12,
+                    "score": round(0.9 - i * 0.1, 2),
+                }
+                for i in range(self.results_per_query)
+            ],
+        }
+
+
+class ReplayTranscriber(AudioProcessor):
+    """
+    Returns the synthetic transcript registered for a storage path after the
+    transcription latency. Responses are kept as JSON and parsed per call,
+    as the real processor parses AssemblyAI's response body.
+    """
+
+    def __init__(self, latency: LatencyModel, seed: int = 0):
+        self._delay = _Delay(latency, seed)
+        self._responses: Dict[str, bytes] = {}
+        self.calls = 0
+
+    def register(self, storage_path: str, response: Dict[str, Any]):
+        self._responses[storage_path] = json.dumps(response).encode("utf-8")
+
+    async def transcribe(
+        self,
+        storage_path: str,
+        model_name: str = "universal",
+        audio_duration: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        if storage_path not in self._responses:
+            raise ValueError(f"No transcript registered for '{storage_path}'")
+        await self._delay.asleep()
+        self.calls += 1
+        return json.loads(self._responses[storage_path])
+
+
+class _Snapshot:
+    def __init__(self, doc_id: str, data: Optional[Dict[str, Any]]):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self._data)
+
+
+class _DocumentRef:
+    def __init__(self, store: "InMemoryFirestore", path: str):
+        self._store = store
+        self._path = path
+
+    def get(self) -> _Snapshot:
+        self._store.pause("get")
+        return _Snapshot(self._path.rsplit("/", 1)[-1], self._store.documents.get(self._path))
+
+    def set(self, data: Dict[str, Any]):
+        self._store.pause("set")
+        self._store.documents[self._path] = copy.deepcopy(data)
+
+
+class _CollectionRef:
+    def __init__(self, store: "InMemoryFirestore", path: str):
+        self._store = store
+        self._path = path
+
+    def document(self, doc_id: str) -> _DocumentRef:
+        return _DocumentRef(self._store, f"{self._path}/{doc_id}")
+
+
+class InMemoryFirestore:
+    """The slice of the Firestore client used directly by the pipeline (the entity cache)."""
+
+    def __init__(self, delay: _Delay, calls: Counter):
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self._delay = delay
+        self._calls = calls
+
+    def pause(self, operation: str):
+        self._calls[f"firestore.{operation}"] += 1
+        self._delay.sleep()
+
+    def collection(self, path: str) -> _CollectionRef:
+        return _CollectionRef(self, path)
+
+
+def _set_field(document: Dict[str, Any], path: str, value: Any):
+    """Firestore update semantics: dotted paths address nested map fields."""
+    *parents, name = path.split(".")
+    for parent in parents:
+        document = document.setdefault(parent, {})
+    document[name] = value
+
+
+class InMemoryDBManager:
+    """
+    The db_manager functions the pipeline calls, backed by dictionaries.
+    Every call waits for the Firestore latency, blocking like the real
+    client, and is counted in calls.
+    """
+
+    def __init__(self, latency: LatencyModel, seed: int = 0):
+        self._delay = _Delay(latency, seed)
+        self._lock = threading.Lock()
+        self.calls: Counter = Counter()
+        self.db = InMemoryFirestore(self._delay, self.calls)
+
+        self.jobs: Dict[tuple, Dict[str, Any]] = {}
+        self.results: Dict[tuple, Dict[str, Dict[str, Any]]] = {}
+        self.logs: Dict[tuple, List[Dict[str, Any]]] = {}
+        self.checkpoints: Dict[tuple, Dict[str, Dict[str, Any]]] = {}
+        self.usage_records: List[Dict[str, Any]] = []
+        self.cached_transcripts: Dict[str, Dict[str, Any]] = {}
+        self.refunds = 0
+
+    def _call(self, name: str):
+        with self._lock:
+            self.calls[name] += 1
+        self._delay.sleep()
+
+    # --- Set-up helpers, not part of db_manager ---
+
+    def create_job(self, user_id: str, request_data: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        self.jobs[(user_id, job_id)] = {
+            "job_id": job_id,
+            "status": "QUEUED",
+            "progress": "Job has been queued.",
+            "request_data": copy.deepcopy(request_data),
+            "job_title": "Benchmark job",
+        }
+        return job_id
+
+    def cache_transcript(self, transcript_id: str, data: Dict[str, Any]):
+        self.cached_transcripts[transcript_id] = data
+
+    # --- Jobs ---
+
+    def get_job_status(self, user_id: str, job_id: str) -> Optional[Dict[str, Any]]:
+        self._call("get_job_status")
+        job = self.jobs.get((user_id, job_id))
+        return copy.deepcopy(job) if job is not None else None
+
+    def update_job_status(self, user_id, job_id, status, progress=None, transcript=None):
+        fields = {"status": status}
+        if progress:
+            fields["progress"] = progress
+        if transcript:
+            fields["transcript"] = transcript
+        self.update_job_fields(user_id, job_id, fields)
+
+    def update_job_fields(self, user_id: str, job_id: str, fields: Dict[str, Any], touch: bool = False):
+        self._call("update_job_fields")
+        fields = copy.deepcopy(fields)
+        with self._lock:
+            job = self.jobs[(user_id, job_id)]
+            for path, value in fields.items():
+                _set_field(job, path, value)
+            if touch:
+                job["updatedAt"] = time.time()
+
+    def update_job_with_metadata(self, user_id, job_id, new_title, metadata=None):
+        self.update_job_fields(user_id, job_id, {"job_title": new_title, **(metadata or {})})
+
+    def claim_awaiting_transcription(self, user_id: str, job_id: str) -> bool:
+        self._call("claim_awaiting_transcription")
+        with self._lock:
+            job = self.jobs.get((user_id, job_id)) or {}
+            if job.get("status") != "PROCESSING" or not job.get("awaiting_transcription"):
+                return False
+            job["awaiting_transcription"] = False
+            return True
+
+    def claim_stale_job(self, user_id: str, job_id: str, stale_after_seconds: float) -> bool:
+        self._call("claim_stale_job")
+        return False
+
+    def log_progress(self, user_id: str, job_id: str, message: str):
+        self._call("log_progress")
+        with self._lock:
+            self.logs.setdefault((user_id, job_id), []).append({"message": message})
+
+    def log_progress_batch(self, user_id: str, job_id: str, entries: List[Dict[str, Any]]):
+        if not entries:
+            return
+        self._call("log_progress_batch")
+        with self._lock:
+            self.logs.setdefault((user_id, job_id), []).extend(copy.deepcopy(entries))
+
+    # --- Section results ---
+
+    def _store_results(self, user_id: str, job_id: str, results: Dict[int, Dict]):
+        results = copy.deepcopy(results)
+        with self._lock:
+            stored = self.results.setdefault((user_id, job_id), {})
+            for section_index, section_data in results.items():
+                stored[f"section_{section_index:03d}"] = section_data
+
+    def save_section_result(self, user_id: str, job_id: str, section_index: int, section_data: Dict):
+        self._call("save_section_result")
+        self._store_results(user_id, job_id, {section_index: section_data})
+
+    def save_section_results_batch(self, user_id: str, job_id: str, results: Dict[int, Dict]):
+        if not results:
+            return
+        self._call("save_section_results_batch")
+        self._store_results(user_id, job_id, results)
+
+    def get_section_results_by_id(self, user_id: str, job_id: str) -> Dict[str, Dict[str, Any]]:
+        self._call("get_section_results_by_id")
+        return copy.deepcopy(self.results.get((user_id, job_id), {}))
+
+    def list_section_results(self, user_id: str, job_id: str) -> List[Dict[str, Any]]:
+        self._call("list_section_results")
+        stored = self.results.get((user_id, job_id), {})
+        return [copy.deepcopy(stored[doc_id]) for doc_id in sorted(stored)]
+
+    def get_section_result(self, user_id: str, job_id: str, section_doc_id: str):
+        self._call("get_section_result")
+        result = self.results.get((user_id, job_id), {}).get(section_doc_id)
+        return copy.deepcopy(result) if result is not None else None
+
+    def does_section_result_exist(self, user_id: str, job_id: str, section_doc_id: str) -> bool:
+        self._call("does_section_result_exist")
+        return section_doc_id in self.results.get((user_id, job_id), {})
+
+    # --- Checkpoints ---
+
+    def save_job_checkpoint(self, user_id: str, job_id: str, stage: str, version: int, data: Any) -> bool:
+        self._call("save_job_checkpoint")
+        # Stored as JSON, like the real checkpoint documents
+        payload = json.dumps(data, separators=(",", ":"), default=str)
+        with self._lock:
+            self.checkpoints.setdefault((user_id, job_id), {})[stage] = {
+                "version": version,
+                "data": payload,
+            }
+        return True
+
+    def get_job_checkpoints(self, user_id: str, job_id: str) -> Dict[str, Dict[str, Any]]:
+        self._call("get_job_checkpoints")
+        return {
+            stage: {"version": entry["version"], "data": json.loads(entry["data"])}
+            for stage, entry in self.checkpoints.get((user_id, job_id), {}).items()
+        }
+
+    def delete_job_checkpoints(self, user_id: str, job_id: str):
+        self._call("delete_job_checkpoints")
+        with self._lock:
+            self.checkpoints.pop((user_id, job_id), None)
+
+    # --- Everything else ---
+
+    def create_usage_record(self, user_id: str, job_id: str, usage_data: Dict):
+        self._call("create_usage_record")
+        with self._lock:
+            self.usage_records.append({**copy.deepcopy(usage_data), "userId": user_id, "jobId": job_id})
+
+    def refund_analysis_credit(self, user_id: str, amount: int = 1):
+        self._call("refund_analysis_credit")
+        with self._lock:
+            self.refunds += amount
+
+    def delete_gcs_file(self, storage_path: str):
+        self._call("delete_gcs_file")
+
+    def get_cached_transcript(self, transcript_id: str) -> Optional[Dict]:
+        self._call("get_cached_transcript")
+        with self._lock:
+            return self.cached_transcripts.pop(transcript_id, None)
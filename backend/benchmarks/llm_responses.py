@@ -0,0 +1,251 @@
+"""
+Scripted answers to the pipeline's LLM prompts.
+
+Each prompt the pipeline sends is recognized by a phrase from its system
+message and answered with output of the shape its parser expects. Answers
+are built from the prompt itself: quotes are sentences of the transcript
+text being analyzed and entities are its most frequent long words, so
+quote matching, entity enrichment and quiz generation do the work they
+would do with a real model. Nothing is random; the same prompt always
+gets the same answer.
+"""
+
+import ast
+import json
+import re
+from collections import Counter
+from typing import Any, Callable, List, Optional, Tuple
+
+_SENTENCE = re.compile(r"[^.!?]+[.!?]")
+_WORD = re.compile(r"[A-Za-z][A-Za-z'-]+")
+
+TAKEAWAY_TYPES = ("Prescriptive Action", "Mental Model", "Reflective Question")
+
+
+def _between(prompt: str, start: str, end: str) -> str:
+    begin = prompt.find(start)
+    if begin == -1:
+        return ""
+    begin += len(start)
+    finish = prompt.find(end, begin)
+    return prompt[begin : finish if finish != -1 else len(prompt)]
+
+
+def _count(prompt: str, pattern: str, default: int) -> int:
+    match = re.search(pattern, prompt)
+    return int(match.group(1)) if match else default
+
+
+def _literal_list(prompt: str, label: str) -> List[str]:
+    """The Python list literal that follows label in the prompt."""
+    match = re.search(re.escape(label) + r"\s*(\[.*?\])", prompt, re.DOTALL)
+    if not match:
+        return []
+    try:
+        return [str(item) for item in ast.literal_eval(match.group(1))]
+    except (ValueError, SyntaxError):
+        return []
+
+
+def _spoken_text(text: str) -> str:
+    """Transcript text without the "Speaker A:" labels of each line."""
+    return " ".join(line.split(":", 1)[-1] for line in text.splitlines())
+
+
+def _quotes(text: str, count: int) -> List[str]:
+    """count sentences of 6-40 words, spread evenly over the text."""
+    sentences = [
+        sentence.strip()
+        for sentence in _SENTENCE.findall(_spoken_text(text))
+        if 6 <= len(sentence.split()) <= 40
+    ]
+    if not sentences:
+        words = text.split()
+        return [" ".join(words[:20])] if words else []
+    step = max(len(sentences) // count, 1)
+    return sentences[::step][:count]
+
+
+def _keywords(text: str, count: int) -> List[str]:
+    """The most frequent words of 7 or more letters, title-cased."""
+    counts = Counter(word.lower() for word in _WORD.findall(text) if len(word) >= 7)
+    return [word.title() for word, _ in counts.most_common(count)]
+
+
+def _title(keywords: List[str], fallback: str = "Key Ideas") -> str:
+    if len(keywords) >= 2:
+        return f"{keywords[0]} and {keywords[1]}"
+    return keywords[0] if keywords else fallback
+
+
+def section_deep_dive(prompt: str) -> Any:
+    text = _between(prompt, "--- TEXT TO ANALYZE ---", "--- END TEXT ---")
+    keywords = _keywords(text, 5)
+    quotes = _quotes(text, 3)
+    return {
+        "section_title": _title(keywords),
+        "section_summary": (
+            f"This section explores {', '.join(keywords[:3]) or 'the main topic'}. "
+            f"It explains why they matter and how to apply them."
+        ),
+        "actionable_takeaways": [
+            {
+                "type": TAKEAWAY_TYPES[i % len(TAKEAWAY_TYPES)],
+                "takeaway": f"Apply the idea of {keywords[i % len(keywords)] if keywords else 'focus'} this week.",
+                "supporting_quote": quote,
+            }
+            for i, quote in enumerate(quotes)
+        ],
+        "entities": keywords,
+    }
+
+
+def section_podcaster(prompt: str) -> Any:
+    text = _between(prompt, "--- TEXT TO ANALYZE ---", "--- END TEXT ---")
+    keywords = _keywords(text, 5)
+    return {
+        "section_title": _title(keywords),
+        "section_summary": (
+            f"The discussion covers {', '.join(keywords[:3]) or 'the main topic'} "
+            f"and why each one matters."
+        ),
+        "key_points": [f"Why {keyword.lower()} matters in practice." for keyword in keywords[:3]],
+        "notable_quotes": [
+            {"quote": quote, "context": "A memorable line from this part of the episode."}
+            for quote in _quotes(text, 2)
+        ],
+        "entities": keywords,
+    }
+
+
+def search_query(prompt: str) -> Any:
+    match = re.search(r"explain the term '(.*?)' using", prompt, re.DOTALL)
+    return f"What is {match.group(1) if match else 'this'}"
+
+
+def explanations(prompt: str) -> Any:
+    return {
+        topic: f"{topic} is a concept discussed in the episode and explained by the sources."
+        for topic in _literal_list(prompt, "TOPICS TO EXPLAIN:")
+    }
+
+
+def key_entities(prompt: str) -> Any:
+    return {"entities": _literal_list(prompt, "LIST OF POTENTIAL ENTITIES:")[:3]}
+
+
+def best_claim(prompt: str) -> Any:
+    return {"best_claim": ""}
+
+
+def show_notes(prompt: str) -> Any:
+    return {"description": "In this episode we cover the ideas that matter most and how to use them."}
+
+
+def title_variations(prompt: str) -> Any:
+    return {
+        "curiosity_gap": "Why the Obvious Advice Keeps Failing You",
+        "benefit_driven": "How to Turn Small Habits Into Lasting Results",
+        "contrarian": "Stop Waiting for Motivation Before You Start",
+        "direct": "Habits, Focus and the Long Game Explained",
+    }
+
+
+def linkedin_post(prompt: str) -> Any:
+    return {"post": "One idea from this week's episode changed how I plan my mornings."}
+
+
+def twitter_thread(prompt: str) -> Any:
+    return {"tweets": [f"{i}/5 A point from this week's episode." for i in range(1, 6)]}
+
+
+def youtube_description(prompt: str) -> Any:
+    return {"description": "Chapters, key ideas and resources from this episode."}
+
+
+def quiz_questions(prompt: str) -> Any:
+    count = _count(prompt, r"Generate EXACTLY (\d+) questions \(no more", 5)
+    sections = _count(prompt, r"with (\d+) section\(s\)", 1)
+    summaries = re.findall(r'"summary": "((?:[^"\\]|\\.)*)"', prompt) or ["The main idea."]
+    return {
+        "quiz_questions": [
+            {
+                "question": f"Which idea does section {i % sections + 1} emphasize?",
+                "options": ["A. The first idea", "B. The second idea", "C. The third idea", "D. None"],
+                "correct_answer": "A",
+                "explanation": "The section states it directly.",
+                "supporting_quote": summaries[i % len(summaries)],
+                "related_timestamp": "",
+                "source_section": i % sections + 1,
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def core_insights(prompt: str) -> Any:
+    text = _between(prompt, "--- TRANSCRIPT ---", "--- END TRANSCRIPT ---")
+    return [
+        {
+            "principle": f"Small consistent actions around {keyword.lower()} compound over time.",
+            "evidence": quote,
+            "why_it_matters": "It changes where effort is best spent.",
+        }
+        for keyword, quote in zip(_keywords(text, 3) or ["practice"] * 3, _quotes(text, 3))
+    ]
+
+
+def open_ended_questions(prompt: str) -> Any:
+    count = _count(prompt, r"Generate EXACTLY (\d+) questions that", 2)
+    return {
+        "questions": [
+            {
+                "question_text": f"The video explained idea {i + 1}. Why does it work?",
+                "insight_principle": "Small consistent actions compound over time.",
+                "evaluation_criteria": ["Explains the idea", "Gives a personal example"],
+                "generic_answer": "Because repeated small actions add up to large results.",
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def final_title(prompt: str) -> Any:
+    return "Lessons That Compound Over Time"
+
+
+def library_metadata(prompt: str) -> Any:
+    return {
+        "description": "A practical episode about habits, focus and long-term growth.",
+        "tags": ["habits", "productivity", "learning"],
+    }
+
+
+# (phrase of the prompt, answer); the first phrase found in a prompt wins
+SCRIPTED_RESPONSES: Tuple[Tuple[str, Callable[[str], Any]], ...] = (
+    ("expert learning coach and instructional designer", section_deep_dive),
+    ("expert podcast production assistant", section_podcaster),
+    ("You are a search query generator", search_query),
+    ("concise, 1-2 sentence definitions", explanations),
+    ("From the 'LIST OF POTENTIAL ENTITIES'", key_entities),
+    ("meticulous podcast editor", best_claim),
+    ("expert podcast show notes writer", show_notes),
+    ("expert podcast marketing strategist", title_variations),
+    ("expert LinkedIn content strategist", linkedin_post),
+    ("expert Twitter/X content strategist", twitter_thread),
+    ("expert YouTube SEO specialist", youtube_description),
+    ("expert quiz generator specializing", quiz_questions),
+    ("identifying transformative insights", core_insights),
+    ("creating educational questions that test understanding", open_ended_questions),
+    ("You are a master copywriter", final_title),
+    ("expert content curator for an educational platform library", library_metadata),
+)
+
+
+def scripted_response(prompt: str) -> Optional[str]:
+    """The answer to prompt as the model's text, or None if it is not recognized."""
+    for phrase, respond in SCRIPTED_RESPONSES:
+        if phrase in prompt:
+            answer = respond(prompt)
+            return answer if isinstance(answer, str) else json.dumps(answer)
+    return None
@@ -0,0 +1,443 @@
+"""
+End-to-end benchmark of the analysis pipeline, runnable offline.
+
+Builds pipelines with PipelineFactory.create_default_pipeline and runs
+AnalysisPipeline.run_analysis on synthetic jobs, with Gemini, Tavily,
+AssemblyAI and Firestore replaced by the stand-ins in fakes.py. Provider
+latency is simulated from configurable distributions, so the numbers show
+the pipeline's own CPU time, memory and concurrency rather than the
+network's.
+
+Each persona runs in a fresh process, so its CPU time and peak memory are
+its own. Reports jobs per minute, p50/p95 job latency, CPU seconds and
+peak RSS per persona, and can compare them with a saved baseline:
+
+    python -m benchmarks.pipeline_benchmark --output baseline.json
+    python -m benchmarks.pipeline_benchmark --baseline baseline.json
+
+Latencies are "p50:p95" in seconds; --latency-scale 0 turns every delay off
+to measure CPU cost alone.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext, redirect_stdout
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from rich import print
+from rich.table import Table
+
+from src.cost_tracking import TokenCostCallbackHandler
+from src.pipeline.config import get_available_personas
+from src.pipeline.factories.pipeline_factory import PipelineFactory
+from src.pipeline.orchestrators.analysis_pipeline import AnalysisRequest
+from src.pipeline.services.enrichment import TavilySearchProvider
+from src.pipeline.utils import get_cpu_executor, shutdown_cpu_executor
+
+from .fakes import (
+    InMemoryDBManager,
+    LatencyModel,
+    ReplayClients,
+    ReplayTavilyClient,
+    ReplayTranscriber,
+)
+from .transcripts import (
+    RECORDINGS_DIR,
+    format_duration,
+    load_recordings,
+    parse_duration,
+    synthesize_assemblyai_response,
+    youtube_transcript,
+)
+
+BENCHMARK_USER_ID = "benchmark-user"
+
+# Metrics compared against a baseline, and whether higher is better
+COMPARED_METRICS = {
+    "jobs_per_minute": True,
+    "latency_p50_s": False,
+    "latency_p95_s": False,
+    "cpu_seconds": False,
+    "peak_rss_mb": False,
+}
+
+
+@dataclass
+class BenchmarkConfig:
+    """What to run and how slow each stand-in provider is."""
+
+    personas: List[str]
+    durations: List[float]
+    repeat: int = 1
+    concurrency: int = 4
+    source: str = "audio"  # "audio" (AssemblyAI) or "youtube" (cached captions)
+    speakers: int = 1
+    llm_latency: LatencyModel = field(default_factory=LatencyModel)
+    search_latency: LatencyModel = field(default_factory=LatencyModel)
+    db_latency: LatencyModel = field(default_factory=LatencyModel)
+    transcription_latency: LatencyModel = field(default_factory=LatencyModel)
+    seed: int = 0
+    recordings_dir: str = str(RECORDINGS_DIR)
+    llm_cache: bool = False
+    trace_path: Optional[str] = None
+    verbose: bool = False
+
+
+class OfflinePipelineFactory(PipelineFactory):
+    """
+    PipelineFactory that takes its search client and audio processor from
+    the clients module instead of building real Tavily and AssemblyAI
+    clients from API keys.
+    """
+
+    def _get_search_provider(self) -> TavilySearchProvider:
+        if self._search_provider is None:
+            provider = TavilySearchProvider(api_key="offline")
+            provider.client = self.clients.tavily_client
+            self._search_provider = provider
+        return self._search_provider
+
+    def _get_audio_processor(self):
+        return self.clients.audio_processor
+
+
+def percentile(values: List[float], q: float) -> float:
+    """The q-th percentile (0-100) of values, interpolating between ranks."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def _max_rss_mb(who: int) -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    maxrss = resource.getrusage(who).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process and of its finished children (the CPU executor's pool)."""
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+async def run_persona(config: BenchmarkConfig, persona: str) -> Dict[str, Any]:
+    """
+    Run every job of the benchmark for one persona in this process and
+    return its measurements.
+    """
+    db = InMemoryDBManager(config.db_latency, seed=config.seed)
+    transcriber = ReplayTranscriber(config.transcription_latency, seed=config.seed)
+    clients = ReplayClients(
+        config.llm_latency,
+        seed=config.seed,
+        tavily_client=ReplayTavilyClient(config.search_latency, seed=config.seed),
+        audio_processor=transcriber,
+    )
+
+    # Transcripts are built before timing starts; only parsing them is measured
+    recordings = load_recordings(config.recordings_dir)
+    responses = {
+        duration: synthesize_assemblyai_response(
+            duration, recordings, speakers=config.speakers, seed=config.seed
+        )
+        for duration in config.durations
+    }
+    for duration, response in responses.items():
+        transcriber.register(f"benchmarks/{format_duration(duration)}.mp3", response)
+    captions = (
+        {duration: youtube_transcript(response) for duration, response in responses.items()}
+        if config.source == "youtube"
+        else {}
+    )
+    del responses
+
+    if config.llm_cache:
+        try:
+            from src import llm_cache
+        except ImportError:
+            import llm_cache
+        llm_cache.install_llm_cache()
+
+    get_cpu_executor().warm_up()
+    startup_rss_mb = _max_rss_mb(resource.RUSAGE_SELF)
+
+    semaphore = asyncio.Semaphore(config.concurrency)
+    jobs = [duration for duration in config.durations for _ in range(config.repeat)]
+
+    async def run_job(number: int, duration: float) -> Dict[str, Any]:
+        async with semaphore:
+            request_data = {"persona": persona, "source_type": config.source}
+            job_id = db.create_job(BENCHMARK_USER_ID, request_data)
+            request = AnalysisRequest(
+                user_id=BENCHMARK_USER_ID,
+                job_id=job_id,
+                persona=persona,
+                audio_duration_seconds=duration,
+            )
+            if config.source == "youtube":
+                request.transcript_id = f"benchmark-{number}"
+                db.cache_transcript(
+                    request.transcript_id,
+                    {"structured_transcript": captions[duration], "youtube_title": "Benchmark"},
+                )
+            else:
+                request.storage_path = f"benchmarks/{format_duration(duration)}.mp3"
+
+            token_tracker = TokenCostCallbackHandler(BENCHMARK_USER_ID, job_id)
+            started = time.perf_counter()
+            try:
+                pipeline = OfflinePipelineFactory.create_default_pipeline(
+                    db, clients, token_tracker, persona
+                )
+                result = await pipeline.run_analysis(request)
+                status, sections = result.status, result.sections_processed
+            except Exception as e:
+                print(f"[red]Benchmark job {number} raised {type(e).__name__}: {e}[/red]")
+                status, sections = "error", 0
+            return {
+                "duration_s": duration,
+                "status": status,
+                "latency_s": time.perf_counter() - started,
+                "sections": sections,
+                "llm_calls": token_tracker.llm_calls_count,
+                "input_tokens": token_tracker.total_input_tokens,
+                "output_tokens": token_tracker.total_output_tokens,
+            }
+
+    cpu_started = _cpu_seconds()
+    wall_started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, (
+        nullcontext() if config.verbose else redirect_stdout(devnull)
+    ):
+        samples = await asyncio.gather(
+            *(run_job(number, duration) for number, duration in enumerate(jobs))
+        )
+        # Finished pool processes are counted in RUSAGE_CHILDREN
+        shutdown_cpu_executor()
+    wall_seconds = time.perf_counter() - wall_started
+    cpu_seconds = _cpu_seconds() - cpu_started
+
+    completed = [sample for sample in samples if sample["status"] == "completed"]
+    latencies = [sample["latency_s"] for sample in completed]
+    unmatched = [prompt for llm in clients.llms.values() for prompt in llm.unmatched]
+    peak_rss_mb = _max_rss_mb(resource.RUSAGE_SELF)
+    return {
+        "persona": persona,
+        "jobs": len(samples),
+        "completed": len(completed),
+        "failed": len(samples) - len(completed),
+        "wall_seconds": wall_seconds,
+        "jobs_per_minute": len(completed) / wall_seconds * 60 if wall_seconds else 0.0,
+        "latency_p50_s": percentile(latencies, 50),
+        "latency_p95_s": percentile(latencies, 95),
+        "cpu_seconds": cpu_seconds,
+        "peak_rss_mb": peak_rss_mb,
+        "job_rss_mb": peak_rss_mb - startup_rss_mb,
+        "pool_peak_rss_mb": _max_rss_mb(resource.RUSAGE_CHILDREN),
+        "llm_calls": sum(llm.calls for llm in clients.llms.values()),
+        "search_calls": clients.tavily_client.calls,
+        "db_calls": sum(db.calls.values()),
+        "unmatched_prompts": len(unmatched),
+        "unmatched_prompt_samples": sorted(set(unmatched))[:5],
+        "samples": samples,
+    }
+
+
+def _run_persona_process(config: BenchmarkConfig, persona: str) -> Dict[str, Any]:
+    if not config.verbose:
+        # Also silences the CPU executor's pool, which inherits the descriptor
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+    if config.trace_path:
+        try:
+            from src import tracing
+        except ImportError:
+            import tracing
+        tracing.configure_tracing("analysis-benchmark", f"{config.trace_path}.{persona}")
+    return asyncio.run(run_persona(config, persona))
+
+
+def run_benchmark(config: BenchmarkConfig) -> List[Dict[str, Any]]:
+    """Run each persona in its own process and collect the results in order."""
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for persona in config.personas:
+        print(f"[cyan]Benchmarking '{persona}'...[/cyan]")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(_run_persona_process, config, persona).result())
+    return results
+
+
+def print_report(config: BenchmarkConfig, results: List[Dict[str, Any]]):
+    durations = ", ".join(format_duration(duration) for duration in config.durations)
+    table = Table(
+        title=(
+            f"Pipeline benchmark: {durations} x{config.repeat}, "
+            f"concurrency {config.concurrency}, {config.source} source"
+        )
+    )
+    for column in ("Persona", "Jobs", "Failed", "Jobs/min", "p50 s", "p95 s", "CPU s", "RSS MB", "LLM"):
+        table.add_column(column, justify="left" if column == "Persona" else "right")
+    for result in results:
+        table.add_row(
+            result["persona"],
+            str(result["jobs"]),
+            str(result["failed"]),
+            f"{result['jobs_per_minute']:.2f}",
+            f"{result['latency_p50_s']:.2f}",
+            f"{result['latency_p95_s']:.2f}",
+            f"{result['cpu_seconds']:.2f}",
+            f"{result['peak_rss_mb']:.0f}",
+            str(result["llm_calls"]),
+        )
+    print(table)
+    for result in results:
+        if result["unmatched_prompts"]:
+            print(
+                f"[yellow]{result['persona']}: {result['unmatched_prompts']} LLM calls "
+                f"had no scripted response and got an empty answer:[/yellow]"
+            )
+            for prompt in result["unmatched_prompt_samples"]:
+                print(f"[yellow]  {prompt[:120]!r}[/yellow]")
+
+
+def compare_with_baseline(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float
+) -> List[str]:
+    """Metrics that are more than tolerance (a fraction) worse than the baseline."""
+    regressions = []
+    previous = {result["persona"]: result for result in baseline}
+    for result in results:
+        before = previous.get(result["persona"])
+        if before is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(
+                    f"{result['persona']}: {metric} {old:.2f} -> {new:.2f} ({change:+.0%})"
+                )
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.pipeline_benchmark",
+        description="Offline end-to-end benchmark of the analysis pipeline.",
+    )
+    parser.add_argument("--personas", default=",".join(get_available_personas()),
+                        help="Comma-separated personas (default: all)")
+    parser.add_argument("--durations", default="5m,30m,1h,3h,10h",
+                        help="Comma-separated transcript lengths, e.g. 5m,1h30m")
+    parser.add_argument("--repeat", type=int, default=1, help="Jobs per duration")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Jobs in flight at once, per persona")
+    parser.add_argument("--source", choices=("audio", "youtube"), default="audio",
+                        help="Replay AssemblyAI transcripts or cached YouTube captions")
+    parser.add_argument("--speakers", type=int, default=1,
+                        help="Speakers in the synthetic transcripts")
+    parser.add_argument("--llm-latency", default="1.5:4", help="Per LLM call, p50:p95 seconds")
+    parser.add_argument("--search-latency", default="0.8:2", help="Per Tavily search")
+    parser.add_argument("--db-latency", default="0.02:0.08", help="Per Firestore call")
+    parser.add_argument("--transcription-latency", default="20:60",
+                        help="Per AssemblyAI transcription")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Multiply every latency; 0 measures CPU cost alone")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--recordings", default=str(RECORDINGS_DIR),
+                        help="Directory of AssemblyAI responses to build transcripts from")
+    parser.add_argument("--cpu-executor", choices=("process", "thread", "inline"),
+                        help="Override CPU_EXECUTOR_MODE")
+    parser.add_argument("--llm-cache", action="store_true",
+                        help="Install the LLM response cache, as the worker does")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="Write spans to PATH.<persona> as OTLP/JSON")
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--baseline", help="Results JSON of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed regression against the baseline, as a fraction")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's output")
+    return parser.parse_args(argv)
+
+
+def config_from_args(args: argparse.Namespace) -> BenchmarkConfig:
+    personas = [persona.strip() for persona in args.personas.split(",") if persona.strip()]
+    unknown = sorted(set(personas) - set(get_available_personas()))
+    if unknown:
+        raise ValueError(f"Unknown personas: {', '.join(unknown)}")
+    return BenchmarkConfig(
+        personas=personas,
+        durations=[parse_duration(spec) for spec in args.durations.split(",") if spec.strip()],
+        repeat=args.repeat,
+        concurrency=args.concurrency,
+        source=args.source,
+        speakers=args.speakers,
+        llm_latency=LatencyModel.parse(args.llm_latency).scaled(args.latency_scale),
+        search_latency=LatencyModel.parse(args.search_latency).scaled(args.latency_scale),
+        db_latency=LatencyModel.parse(args.db_latency).scaled(args.latency_scale),
+        transcription_latency=LatencyModel.parse(args.transcription_latency).scaled(args.latency_scale),
+        seed=args.seed,
+        recordings_dir=args.recordings,
+        llm_cache=args.llm_cache,
+        trace_path=args.trace,
+        verbose=args.verbose,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        config = config_from_args(args)
+    except ValueError as e:
+        print(f"[bold red]{e}[/bold red]")
+        return 2
+    if args.cpu_executor:
+        # Read by the persona processes when they load the settings
+        os.environ["CPU_EXECUTOR_MODE"] = args.cpu_executor
+
+    results = run_benchmark(config)
+    print_report(config, results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"config": asdict(config), "results": results}, f, indent=2, default=str
+            )
+        print(f"[green]Results written to {args.output}[/green]")
+
+    exit_code = 0 if all(result["failed"] == 0 for result in results) else 1
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"[bold red]Regressions beyond {args.tolerance:.0%}:[/bold red]")
+            for regression in regressions:
+                print(f"[red]  {regression}[/red]")
+            exit_code = 1
+        else:
+            print(f"[green]No regressions beyond {args.tolerance:.0%} of the baseline.[/green]")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
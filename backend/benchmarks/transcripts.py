@@ -0,0 +1,183 @@
+"""
+Synthetic transcripts of any length, built from recorded AssemblyAI responses.
+
+The responses saved in backend/debug_assemblyai are tiled end to end, with
+word and utterance times shifted, until the requested duration is reached.
+The result has the shape of a completed AssemblyAI transcript, so it goes
+through the same normalization, splitting and segmentation as a real one.
+"""
+
+import json
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+RECORDINGS_DIR = Path(__file__).resolve().parent.parent / "debug_assemblyai"
+
+# A caption line of a YouTube transcript holds about this many words
+YOUTUBE_CAPTION_WORDS = 10
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)([hms])")
+
+
+def parse_duration(spec: str) -> float:
+    """
+    Seconds in a duration such as "90", "90s", "5m", "1h" or "1h30m".
+    """
+    spec = spec.strip().lower()
+    try:
+        return float(spec)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(spec)
+    if not parts or "".join(value + unit for value, unit in parts) != spec:
+        raise ValueError(f"Invalid duration '{spec}'")
+    factors = {"h": 3600, "m": 60, "s": 1}
+    return sum(float(value) * factors[unit] for value, unit in parts)
+
+
+def format_duration(seconds: float) -> str:
+    """The short form parse_duration accepts, e.g. 5400 -> "1h30m"."""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    label = ""
+    if hours:
+        label += f"{hours}h"
+    if minutes:
+        label += f"{minutes}m"
+    if secs or not label:
+        label += f"{secs}s"
+    return label
+
+
+def load_recordings(directory: Path = RECORDINGS_DIR) -> List[Dict[str, Any]]:
+    """
+    Completed AssemblyAI responses with word timings from directory,
+    longest first. Files are either saved debug dumps
+    ({"metadata", "assemblyai_response"}) or bare responses.
+    """
+    recordings = []
+    for path in sorted(Path(directory).glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        response = data.get("assemblyai_response", data)
+        if response.get("status") != "completed":
+            continue
+        words = [
+            word
+            for utterance in response.get("utterances") or []
+            for word in utterance.get("words") or []
+        ]
+        if words:
+            recordings.append({"id": response.get("id", path.stem), "words": words})
+    if not recordings:
+        raise FileNotFoundError(f"No completed AssemblyAI responses in {directory}")
+    recordings.sort(key=lambda recording: len(recording["words"]), reverse=True)
+    return recordings
+
+
+def _tiled_words(recordings: List[Dict[str, Any]], duration_ms: int) -> Iterator[Dict[str, Any]]:
+    """
+    Words of the recordings played back to back until duration_ms. Each
+    word carries the number of the tile it belongs to under "tile".
+    """
+    offset = 0
+    tile = 0
+    while True:
+        for recording in recordings:
+            words = recording["words"]
+            first_start = words[0]["start"]
+            for word in words:
+                start = offset + word["start"] - first_start
+                if start >= duration_ms:
+                    return
+                yield {
+                    "text": word["text"],
+                    "start": start,
+                    "end": min(offset + word["end"] - first_start, duration_ms),
+                    "confidence": word.get("confidence", 0.9),
+                    "speaker": word.get("speaker", "A"),
+                    "tile": tile,
+                }
+            # A short pause between recordings
+            offset += words[-1]["end"] - first_start + 500
+            tile += 1
+
+
+def _utterance(words: List[Dict[str, Any]], speaker: str) -> Dict[str, Any]:
+    for word in words:
+        word["speaker"] = speaker
+    return {
+        "speaker": speaker,
+        "text": " ".join(word["text"] for word in words),
+        "confidence": sum(word["confidence"] for word in words) / len(words),
+        "start": words[0]["start"],
+        "end": words[-1]["end"],
+        "words": words,
+    }
+
+
+def synthesize_assemblyai_response(
+    duration_seconds: float,
+    recordings: Optional[List[Dict[str, Any]]] = None,
+    speakers: int = 1,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    A completed AssemblyAI response for audio of duration_seconds.
+
+    With one speaker every tiled recording is a single utterance, like the
+    monologues AssemblyAI returns for solo podcasts. With more, the words
+    are cut into turns of 40-200 words that rotate between speakers.
+    """
+    recordings = recordings or load_recordings()
+    words = list(_tiled_words(recordings, int(duration_seconds * 1000)))
+    if not words:
+        raise ValueError(f"Duration {duration_seconds}s is too short for a transcript")
+    tiles = [word.pop("tile") for word in words]
+
+    rng = random.Random(seed)
+    utterances = []
+    if speakers <= 1:
+        start = 0
+        for position in range(1, len(words) + 1):
+            if position == len(words) or tiles[position] != tiles[start]:
+                utterances.append(_utterance(words[start:position], "A"))
+                start = position
+    else:
+        labels = [chr(ord("A") + i) for i in range(speakers)]
+        position = 0
+        while position < len(words):
+            turn = words[position : position + rng.randint(40, 200)]
+            utterances.append(_utterance(turn, labels[len(utterances) % speakers]))
+            position += len(turn)
+
+    return {
+        "id": f"synthetic-{format_duration(duration_seconds)}-{speakers}spk-{seed}",
+        "status": "completed",
+        "speech_model": "universal",
+        "audio_duration": int(duration_seconds),
+        "text": " ".join(utterance["text"] for utterance in utterances),
+        "words": [dict(word) for word in words],
+        "utterances": utterances,
+        "confidence": sum(word["confidence"] for word in words) / len(words),
+    }
+
+
+def youtube_transcript(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The words of a response as YouTube caption lines ({text, start, duration})."""
+    captions = []
+    words = response["words"]
+    for position in range(0, len(words), YOUTUBE_CAPTION_WORDS):
+        line = words[position : position + YOUTUBE_CAPTION_WORDS]
+        start = line[0]["start"] / 1000
+        captions.append(
+            {
+                "text": " ".join(word["text"] for word in line),
+                "start": round(start, 3),
+                "duration": round(line[-1]["end"] / 1000 - start, 3),
+            }
+        )
+    return captions
@@ -1,11 +1,15 @@
+import asyncio
 import os
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from fastapi import APIRouter, Depends, HTTPException
+import requests
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api.proxies import GenericProxyConfig
 from src.models import (
@@ -22,8 +26,10 @@ from src.utils import (
     fetch_youtube_metadata,
 )
 from src import db_manager
+from src.config import settings
 from src.security import verify_api_key
 from src import task_manager
+from src.tracing import start_span, trace_context
 
 import uuid
 import datetime
@@ -44,8 +50,49 @@ except KeyError as e:
     )
 
 
+class _TimeoutSession(requests.Session):
+    """A requests.Session that applies a default timeout to every request."""
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, *args, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(*args, **kwargs)
+
+
+def _youtube_http_client() -> requests.Session:
+    """
+    HTTP client for youtube_transcript_api, which sets no timeouts itself;
+    without them a hung proxy connection would hold its thread forever.
+    """
+    return _TimeoutSession(
+        (
+            settings.YOUTUBE_FETCH_CONNECT_TIMEOUT_SECONDS,
+            settings.YOUTUBE_FETCH_READ_TIMEOUT_SECONDS,
+        )
+    )
+
+
+def _fetch_transcript_once(video_id: str, language: str = "en"):
+    """Makes one transcript request through the rotating proxies."""
+    # This proxy setup creates a new connection (and thus gets a new IP)
+    # for each attempt, which is exactly what we want.
+    proxy_url = f"http://{PROXY_USER}:{PROXY_PASS}@{PROXY_HOST}:{PROXY_PORT}"
+    api = YouTubeTranscriptApi(
+        proxy_config=GenericProxyConfig(
+            http_url=proxy_url,
+            https_url=proxy_url,
+        ),
+        http_client=_youtube_http_client(),
+    )
+    transcript_object = api.fetch(video_id, languages=[language])
+    return transcript_object.to_raw_data()
+
+
 def fetch_transcript_with_retry(
-    video_id: str, max_retries: int = 7, max_delay_seconds: int = 5
+    video_id: str, max_retries: int = 7, max_delay_seconds: int = 5, language: str = "en"
 ):
     """
     Attempts to fetch a YouTube transcript with a retry mechanism
@@ -54,22 +101,12 @@ def fetch_transcript_with_retry(
     delay = 1  # Initial delay of 1 seconds
     for attempt in range(max_retries):
         try:
-            # This proxy setup creates a new connection (and thus gets a new IP)
-            # for each attempt, which is exactly what we want.
-            proxy_url = f"http://{PROXY_USER}:{PROXY_PASS}@{PROXY_HOST}:{PROXY_PORT}"
-            api = YouTubeTranscriptApi(
-                proxy_config=GenericProxyConfig(
-                    http_url=proxy_url,
-                    https_url=proxy_url,
-                )
-            )
-
             print(
                 f"Attempt {attempt + 1}/{max_retries}: Fetching transcript for video {video_id}..."
             )
-            transcript_object = api.fetch(video_id)
+            raw_data = _fetch_transcript_once(video_id, language)
             print(f"Successfully fetched transcript on attempt {attempt + 1}.")
-            return transcript_object.to_raw_data()  # Success! Return the data.
+            return raw_data  # Success! Return the data.
 
         except Exception as e:
             print(f"Attempt {attempt + 1} failed: {e}")
@@ -87,6 +124,60 @@ def fetch_transcript_with_retry(
     raise Exception("Max retries reached without success.")
 
 
+# Transcript fetches in flight at once across all requests to this process.
+# Attempts run on their own threads, so a fetch still finishing after its
+# request's deadline never takes a thread from the loop's default executor.
+_transcript_fetch_slots = asyncio.Semaphore(settings.YOUTUBE_FETCH_MAX_CONCURRENCY)
+_transcript_fetch_executor = ThreadPoolExecutor(
+    max_workers=settings.YOUTUBE_FETCH_MAX_CONCURRENCY,
+    thread_name_prefix="youtube-fetch",
+)
+
+
+async def fetch_transcript_async(
+    video_id: str,
+    max_retries: int = 7,
+    max_delay_seconds: int = 5,
+    language: str = "en",
+    deadline_seconds: Optional[float] = None,
+):
+    """
+    Async version of fetch_transcript_with_retry for the API's event loop.
+    Each attempt runs on a transcript fetch thread and backoff waits with
+    asyncio.sleep, so a slow video never blocks other requests. Raises
+    TimeoutError if the fetch (including time spent waiting for a free slot)
+    exceeds the deadline.
+    """
+    if deadline_seconds is None:
+        deadline_seconds = settings.YOUTUBE_FETCH_DEADLINE_SECONDS
+
+    async with asyncio.timeout(deadline_seconds):
+        async with _transcript_fetch_slots:
+            delay = 1
+            for attempt in range(max_retries):
+                try:
+                    print(
+                        f"Attempt {attempt + 1}/{max_retries}: Fetching transcript for video {video_id}..."
+                    )
+                    raw_data = await asyncio.get_running_loop().run_in_executor(
+                        _transcript_fetch_executor, _fetch_transcript_once, video_id, language
+                    )
+                    print(f"Successfully fetched transcript on attempt {attempt + 1}.")
+                    return raw_data
+
+                except Exception as e:
+                    print(f"Attempt {attempt + 1} failed: {e}")
+                    if attempt + 1 == max_retries:
+                        raise
+
+                    wait_time = delay + random.uniform(0, 1)
+                    print(f"Retrying in {wait_time:.2f} seconds...")
+                    await asyncio.sleep(wait_time)
+                    delay = min(delay * 2, max_delay_seconds)
+
+    raise Exception("Max retries reached without success.")
+
+
 @router.post("/process", response_model=ProcessResponse, status_code=202)
 async def start_analysis_processing(
     request: AnalysisRequest,  # It now uses the updated, more flexible model
@@ -102,18 +193,23 @@ async def start_analysis_processing(
 
     user_id = request.user_id
 
-    # The request.dict() will correctly contain either 'transcript' or 'storagePath'
-    job_id = db_manager.create_job(user_id, request.dict())
+    # The job's trace starts here and continues in the worker
+    with trace_context() as trace_id, start_span("api.process") as span:
+        # The request.dict() will correctly contain either 'transcript' or 'storagePath'
+        job_id = db_manager.create_job(user_id, request.dict())
+        span.set_attribute("job_id", job_id)
 
-    try:
-        task_manager.create_analysis_task(user_id=user_id, job_id=job_id)
-    except Exception as e:
-        db_manager.update_job_status(
-            user_id, job_id, "FAILED", f"Failed to enqueue analysis task: {e}"
-        )
-        raise HTTPException(
-            status_code=500, detail="Failed to enqueue job for processing."
-        )
+        try:
+            task_manager.create_analysis_task(
+                user_id=user_id, job_id=job_id, trace_id=trace_id
+            )
+        except Exception as e:
+            db_manager.update_job_status(
+                user_id, job_id, "FAILED", f"Failed to enqueue analysis task: {e}"
+            )
+            raise HTTPException(
+                status_code=500, detail="Failed to enqueue job for processing."
+            )
 
     return ProcessResponse(
         job_id=job_id,
@@ -169,7 +265,10 @@ async def start_bulk_analysis_processing(
 
         try:
             # 4. Enqueue the analysis task (your existing function works perfectly)
-            task_manager.create_analysis_task(user_id=user_id, job_id=job_id)
+            with trace_context() as trace_id, start_span("api.process", job_id=job_id):
+                task_manager.create_analysis_task(
+                    user_id=user_id, job_id=job_id, trace_id=trace_id
+                )
 
             created_jobs.append(
                 BulkProcessResponseItem(
@@ -200,27 +299,91 @@ async def start_bulk_analysis_processing(
     )
 
 
+def _write_transcript_debug_dump(video_id: str, raw_transcript: list):
+    """Saves the original, unaltered transcript to TRANSCRIPT_DEBUG_DUMP_PATH."""
+    try:
+        with open(settings.TRANSCRIPT_DEBUG_DUMP_PATH, "w", encoding="utf-8") as f:
+            f.write(f"# YouTube Transcript - Video ID: {video_id}\n\n")
+            f.write("## Original Transcript Data\n\n")
+
+            # Save the raw transcript data as-is
+            if raw_transcript:
+                for item in raw_transcript:
+                    start_time = item.get("start", 0)
+                    text = item.get("text", "")
+
+                    # Format timestamp as MM:SS
+                    minutes = int(start_time // 60)
+                    seconds = int(start_time % 60)
+
+                    f.write(f"**[{minutes:02d}:{seconds:02d}]** {text}\n\n")
+            else:
+                f.write("No transcript data available.\n")
+
+        print(f"DEBUG: Original transcript saved to {settings.TRANSCRIPT_DEBUG_DUMP_PATH}")
+    except Exception as e:
+        print(f"WARNING: Failed to save transcript to file: {e}")
+
+
+def _store_youtube_transcript(
+    video_id: str, language: str, raw_transcript: list, character_count: int, metadata: dict
+):
+    """Adds a freshly fetched transcript to the shared store; runs after the response is sent."""
+    try:
+        db_manager.save_youtube_transcript(
+            video_id, language, raw_transcript, character_count, metadata
+        )
+    except Exception as e:
+        print(f"WARNING: Failed to store transcript for video {video_id}: {e}")
+
+
 @router.post("/get-transcript-details", response_model=TranscriptDetailResponse)
 async def get_transcript_and_cache(
     request: TranscriptDetailRequest,
+    background_tasks: BackgroundTasks,
     _=Depends(verify_api_key),
 ):
     """
     Fetches a YouTube transcript through rotating residential proxies,
     caches it in Firestore with a TTL, and returns its details for cost calculation.
 
-    This endpoint now uses a retry mechanism with exponential backoff.
+    Transcripts already fetched for the same video and language (by any user)
+    are served from the shared transcript store instead of the proxies.
+    Otherwise the transcript and the video metadata are fetched concurrently.
+    Fetches retry with exponential backoff off the event loop, with bounded
+    concurrency and a per-request deadline, so other requests keep being served.
     """
+    timings = {}
+    started = time.monotonic()
     try:
-        # --- MODIFIED LOGIC ---
-        # Call the new helper function that contains the retry loop.
-        raw_transcript = fetch_transcript_with_retry(request.video_id)
-        # --- END MODIFIED LOGIC ---
+        if not db_manager.db:
+            raise ConnectionError("Database client not initialized.")
+
+        try:
+            stored = await asyncio.to_thread(
+                db_manager.get_stored_youtube_transcript,
+                request.video_id,
+                request.language,
+            )
+        except Exception as e:
+            print(f"WARNING: Transcript store lookup failed for video {request.video_id}: {e}")
+            stored = None
+        timings["store_lookup"] = time.monotonic() - started
+
+        phase_started = time.monotonic()
+        if stored:
+            print(f"INFO: Transcript for video {request.video_id} served from the transcript store.")
+            raw_transcript = stored["structured_transcript"]
+            metadata = stored.get("metadata", {})
+        else:
+            # Retries run off the event loop, within the fetch deadline.
+            # fetch_youtube_metadata never raises, so it cannot cancel the transcript fetch.
+            raw_transcript, metadata = await asyncio.gather(
+                fetch_transcript_async(request.video_id, language=request.language),
+                fetch_youtube_metadata(request.video_id),
+            )
+        timings["fetch"] = time.monotonic() - phase_started
 
-        # Log the raw transcript structure for debugging
-        print(
-            f"DEBUG: Raw transcript structure (first 3 items): {raw_transcript[:3] if raw_transcript else 'Empty'}"
-        )
         print(
             f"DEBUG: Total transcript items: {len(raw_transcript) if raw_transcript else 0}"
         )
@@ -230,74 +393,78 @@ async def get_transcript_and_cache(
         character_count = len(full_text)
         print(f"DEBUG: Video ID {request.video_id} has {character_count} characters.")
 
-        # Save the original, unaltered transcript to fetched_transcript.md
-        try:
-            with open("fetched_transcript.md", "w", encoding="utf-8") as f:
-                f.write(f"# YouTube Transcript - Video ID: {request.video_id}\n\n")
-                f.write("## Original Transcript Data\n\n")
-
-                # Save the raw transcript data as-is
-                if raw_transcript:
-                    for item in raw_transcript:
-                        start_time = item.get("start", 0)
-                        duration = item.get("duration", 0)
-                        text = item.get("text", "")
-
-                        # Format timestamp as MM:SS
-                        minutes = int(start_time // 60)
-                        seconds = int(start_time % 60)
-
-                        f.write(f"**[{minutes:02d}:{seconds:02d}]** {text}\n\n")
-                else:
-                    f.write("No transcript data available.\n")
-
-            print(f"DEBUG: Original transcript saved to fetched_transcript.md")
-        except Exception as e:
-            print(f"WARNING: Failed to save transcript to file: {e}")
-
-        # Fetch YouTube metadata
-        metadata = await fetch_youtube_metadata(request.video_id)
         title = metadata.get("title", "YouTube Video Transcript")
 
         # Cache in Firestore
-        if db_manager.db:
-            transcript_id = str(uuid.uuid4())
-            cache_ref = db_manager.db.collection("pending_transcripts").document(
-                transcript_id
+        phase_started = time.monotonic()
+        transcript_id = str(uuid.uuid4())
+        cache_ref = db_manager.db.collection("pending_transcripts").document(
+            transcript_id
+        )
+        expiration_time = datetime.datetime.now(
+            datetime.timezone.utc
+        ) + datetime.timedelta(hours=1)
+
+        # Include metadata in cached data
+        cached_data = {
+            "structured_transcript": raw_transcript,
+            "character_count": character_count,
+            "createdAt": firestore.SERVER_TIMESTAMP,
+            "expiresAt": expiration_time,
+        }
+
+        # Add YouTube metadata if available
+        if metadata:
+            cached_data.update(
+                {
+                    "youtube_title": metadata.get("title", ""),
+                    "youtube_channel_name": metadata.get("channel_name", ""),
+                    "youtube_thumbnail_url": metadata.get("thumbnail_url", ""),
+                    "youtube_duration": metadata.get("duration", ""),
+                }
             )
-            expiration_time = datetime.datetime.now(
-                datetime.timezone.utc
-            ) + datetime.timedelta(hours=1)
-
-            # Include metadata in cached data
-            cached_data = {
-                "structured_transcript": raw_transcript,
-                "character_count": character_count,
-                "createdAt": firestore.SERVER_TIMESTAMP,
-                "expiresAt": expiration_time,
-            }
 
-            # Add YouTube metadata if available
-            if metadata:
-                cached_data.update(
-                    {
-                        "youtube_title": metadata.get("title", ""),
-                        "youtube_channel_name": metadata.get("channel_name", ""),
-                        "youtube_thumbnail_url": metadata.get("thumbnail_url", ""),
-                        "youtube_duration": metadata.get("duration", ""),
-                    }
-                )
+        # The client needs the pending transcript straight away; the shared
+        # store and the debug dump are written after the response is sent
+        await asyncio.to_thread(cache_ref.set, cached_data)
+        timings["pending_write"] = time.monotonic() - phase_started
+
+        if not stored:
+            background_tasks.add_task(
+                _store_youtube_transcript,
+                request.video_id,
+                request.language,
+                raw_transcript,
+                character_count,
+                metadata,
+            )
+        if settings.TRANSCRIPT_DEBUG_DUMP:
+            background_tasks.add_task(
+                _write_transcript_debug_dump, request.video_id, raw_transcript
+            )
 
-            cache_ref.set(cached_data)
+        timings["total"] = time.monotonic() - started
+        print(
+            f"TIMING: /get-transcript-details video={request.video_id} "
+            f"source={'store' if stored else 'proxies'} "
+            + " ".join(f"{name}={seconds:.2f}s" for name, seconds in timings.items())
+        )
 
-            return TranscriptDetailResponse(
-                transcript_id=transcript_id,
-                character_count=character_count,
-                title=title,
-            )
-        else:
-            raise ConnectionError("Database client not initialized.")
+        return TranscriptDetailResponse(
+            transcript_id=transcript_id,
+            character_count=character_count,
+            title=title,
+        )
 
+    except TimeoutError:
+        print(
+            f"ERROR: Fetching the transcript for video {request.video_id} exceeded "
+            f"{settings.YOUTUBE_FETCH_DEADLINE_SECONDS}s."
+        )
+        raise HTTPException(
+            status_code=504,
+            detail="Timed out retrieving the transcript. Please try again.",
+        )
     except Exception as e:
         # This will now catch the error only after all retries have failed.
         print(
@@ -24,6 +24,83 @@ class Settings(BaseSettings):
 
     TAVILY_API_KEY: Optional[str] = None
 
+    # CPU-bound pipeline work: "process", "thread" or "inline"
+    CPU_EXECUTOR_MODE: str = "process"
+    CPU_EXECUTOR_MAX_WORKERS: Optional[int] = None
+
+    # Threads available for concurrent Firestore calls from async code
+    DB_MAX_CONCURRENCY: int = 16
+
+    # Section result saves: "immediate" writes each section as soon as it is
+    # analysed; "batched" groups them into WriteBatch commits. A crash in
+    # batched mode can lose up to SECTION_RESULT_BATCH_MAX_LATENCY seconds of
+    # finished sections, which are then re-analysed when the task is retried.
+    SECTION_RESULT_PERSISTENCE: str = "immediate"
+    SECTION_RESULT_BATCH_MAX_RESULTS: int = 10
+    SECTION_RESULT_BATCH_MAX_BYTES: int = 4_000_000
+    SECTION_RESULT_BATCH_MAX_LATENCY: float = 5.0
+
+    # Most retries (across all providers) one analysis job may make
+    RETRY_BUDGET_PER_JOB: int = 40
+
+    # Where LLM rate limit buckets live: "memory" (this process) or
+    # "sqlite:///path/to/file.db" to share them between processes on a host
+    LLM_RATE_LIMIT_STORE: str = "memory"
+
+    # LLM response cache: "none", "memory" (per-process LRU only),
+    # "sqlite:///path/to/file.db" for local development or "firestore" to
+    # share cached responses between workers
+    LLM_CACHE_BACKEND: str = "memory"
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int = 512
+
+    # Fetched YouTube transcripts are shared by every request for the same
+    # video for this many days. Transcripts larger than
+    # YOUTUBE_TRANSCRIPT_COMPRESS_MIN_BYTES (as JSON) are stored compressed.
+    YOUTUBE_TRANSCRIPT_STORE_TTL_DAYS: int = 30
+    YOUTUBE_TRANSCRIPT_COMPRESS_MIN_BYTES: int = 32_000
+
+    # YouTube transcript fetches in flight at once per API process, and the
+    # longest one request may spend fetching (including retries). Each HTTP
+    # request of a fetch gives up after the connect and read timeouts.
+    YOUTUBE_FETCH_MAX_CONCURRENCY: int = 8
+    YOUTUBE_FETCH_DEADLINE_SECONDS: float = 60.0
+    YOUTUBE_FETCH_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    YOUTUBE_FETCH_READ_TIMEOUT_SECONDS: float = 20.0
+
+    # Write each fetched YouTube transcript to a local markdown file for
+    # debugging (written after the response is sent)
+    TRANSCRIPT_DEBUG_DUMP: bool = False
+    TRANSCRIPT_DEBUG_DUMP_PATH: str = "fetched_transcript.md"
+
+    # How audio jobs learn that AssemblyAI has finished: "poll" waits inside
+    # the worker task; "webhook" submits with a callback to the worker and
+    # ends the task, resuming the job when the callback arrives. If no
+    # callback arrives, a task scheduled ASSEMBLYAI_WEBHOOK_FALLBACK_SECONDS
+    # later resumes the job by polling. Webhook mode needs WORKER_SERVICE_URL
+    # and ASSEMBLYAI_WEBHOOK_SECRET.
+    ASSEMBLYAI_COMPLETION_MODE: str = "poll"
+    ASSEMBLYAI_WEBHOOK_SECRET: Optional[str] = None
+    ASSEMBLYAI_WEBHOOK_FALLBACK_SECONDS: int = 900
+
+    # Longest a worker waits for one AssemblyAI transcript while polling
+    ASSEMBLYAI_POLL_DEADLINE_SECONDS: int = 3600
+
+    # A task takes over a PROCESSING job whose document has not been updated
+    # for this long, resuming it from its last stage checkpoint. The worker
+    # acknowledges /run-analysis before the pipeline runs, so Cloud Tasks
+    # never redelivers a job whose worker died: every run queues a resume
+    # check task this many seconds later, which takes the job over if it is
+    # stale and otherwise queues the next check. A running job touches its
+    # document every JOB_HEARTBEAT_SECONDS (at most a third of this window),
+    # so long stages like transcription polling do not look stale.
+    JOB_RESUME_STALE_SECONDS: int = 1800
+    JOB_HEARTBEAT_SECONDS: int = 300
+
+    # Append OTLP/JSON trace spans to this file (see tracing.py); tracing
+    # is off when unset
+    TRACING_EXPORT_PATH: Optional[str] = None
+
     class Config:
         # 2. Reference the same constant here.
         env_file = APP_ROOT_DIR / ".env"
@@ -46,6 +123,17 @@ class AppConfig:
         "default": "gemini-1.5-flash",
     }
 
+    # --- LLM Rate Limits ---
+    # Requests and tokens per minute allowed per model, shared by all jobs
+    # on a worker (see pipeline/utils/rate_limiter.py)
+    LLM_RATE_LIMITS = {
+        "gemini-2.5-flash": {"rpm": 1000, "tpm": 1_000_000},
+        "gemini-2.5-flash-lite": {"rpm": 4000, "tpm": 4_000_000},
+        "gemini-2.0-flash-001": {"rpm": 2000, "tpm": 4_000_000},
+        "gemini-2.0-flash-lite": {"rpm": 4000, "tpm": 4_000_000},
+        "gemini-1.5-flash": {"rpm": 2000, "tpm": 4_000_000},
+    }
+
     # --- Sectioning Parameters ---
     # Central place to tune how your transcript is segmented
     SECTIONING_PARAMS = {"lines_per_chunk": 60, "overlap_lines": 10}
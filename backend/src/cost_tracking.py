@@ -19,6 +19,11 @@ class TokenCostCallbackHandler(BaseCallbackHandler):
         self.total_input_tokens = 0
         self.total_output_tokens = 0
         self.llm_calls_count = 0
+        # Responses served from the LLM cache (see llm_cache.py)
+        self.llm_cache_hits = 0
+        self.llm_cache_misses = 0
+        self.cached_input_tokens = 0
+        self.cached_output_tokens = 0
 
     def on_llm_start(
         self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any
@@ -41,11 +46,16 @@ class TokenCostCallbackHandler(BaseCallbackHandler):
 
         current_prompt_tokens = 0
         current_completion_tokens = 0
+        cache_status = None
 
         # The actual token usage is nested inside the generation objects
         for gen_list in response.generations:
             for gen in gen_list:
                 # This is the primary location for the latest langchain-google-genai
+                if hasattr(gen, "message"):
+                    cache_status = gen.message.response_metadata.get(
+                        "llm_cache", cache_status
+                    )
                 if hasattr(gen, "message") and hasattr(gen.message, "usage_metadata"):
                     usage_metadata = gen.message.usage_metadata
                     if usage_metadata:
@@ -71,6 +81,15 @@ class TokenCostCallbackHandler(BaseCallbackHandler):
                             "output_tokens", 0
                         )
 
+        # Cached responses cost nothing; their tokens are what the cache saved
+        if cache_status == "hit":
+            self.llm_cache_hits += 1
+            self.cached_input_tokens += current_prompt_tokens
+            self.cached_output_tokens += current_completion_tokens
+            return
+        if cache_status == "miss":
+            self.llm_cache_misses += 1
+
         # Update the total counts
         self.total_input_tokens += current_prompt_tokens
         self.total_output_tokens += current_completion_tokens
@@ -88,4 +107,8 @@ class TokenCostCallbackHandler(BaseCallbackHandler):
             "llm_input_tokens": self.total_input_tokens,
             "llm_output_tokens": self.total_output_tokens,
             "llm_calls": self.llm_calls_count,
+            "llm_cache_hits": self.llm_cache_hits,
+            "llm_cache_misses": self.llm_cache_misses,
+            "llm_cached_input_tokens": self.cached_input_tokens,
+            "llm_cached_output_tokens": self.cached_output_tokens,
         }
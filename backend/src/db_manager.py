@@ -1,4 +1,6 @@
 import datetime
+import json
+import zlib
 
 import firebase_admin
 from firebase_admin import credentials, firestore
@@ -167,6 +169,29 @@ def save_section_result(
     results_subcollection_ref.set(section_data)
 
 
+def save_section_results_batch(
+    user_id: str, job_id: str, results: Dict[int, Dict]
+):
+    """
+    Saves several analysis sections at once, keyed by section index.
+    Documents are written with batched commits and get the same IDs as
+    save_section_result would give them.
+    """
+    if db is None:
+        raise ConnectionError("Database client not initialized.")
+    if not results:
+        return
+
+    results_ref = db.collection(f"saas_users/{user_id}/jobs").document(job_id).collection("results")
+    items = sorted(results.items())
+    # Firestore allows at most 500 writes per batch
+    for chunk_start in range(0, len(items), 500):
+        batch = db.batch()
+        for section_index, section_data in items[chunk_start : chunk_start + 500]:
+            batch.set(results_ref.document(f"section_{section_index:03d}"), section_data)
+        batch.commit()
+
+
 def get_job_results_from_subcollection(
     user_id: str, job_id: str
 ) -> List[Dict[str, Any]]:
@@ -183,6 +208,24 @@ def get_job_results_from_subcollection(
     return results
 
 
+def list_section_results(user_id: str, job_id: str) -> List[Dict[str, Any]]:
+    """Retrieves all section results for a job in document ID (section index) order."""
+    if db is None:
+        raise ConnectionError("Database client not initialized.")
+
+    results_ref = db.collection(f"saas_users/{user_id}/jobs/{job_id}/results")
+    return [doc.to_dict() for doc in results_ref.get()]
+
+
+def get_section_results_by_id(user_id: str, job_id: str) -> Dict[str, Dict[str, Any]]:
+    """Retrieves all section results for a job in one query, keyed by document ID."""
+    if db is None:
+        raise ConnectionError("Database client not initialized.")
+
+    results_ref = db.collection(f"saas_users/{user_id}/jobs/{job_id}/results")
+    return {doc.id: doc.to_dict() for doc in results_ref.get()}
+
+
 def get_section_result(user_id: str, job_id: str, section_doc_id: str) -> Dict[str, Any]:
     """Retrieves a single section result from the subcollection for a given job."""
     if db is None:
@@ -237,6 +280,81 @@ def update_job_status(
     job_ref.update(update_data)
 
 
+def update_job_fields(
+    user_id: str, job_id: str, fields: Dict[str, Any], touch: bool = False
+):
+    """
+    Updates arbitrary top-level fields on a job document.
+    With touch=True the job's updatedAt is set as well, like update_job_status.
+    """
+    if db is None:
+        raise ConnectionError("Database client not initialized.")
+
+    if touch:
+        fields = {**fields, "updatedAt": firestore.SERVER_TIMESTAMP}
+
+    job_ref = db.collection(f"saas_users/{user_id}/jobs").document(job_id)
+    job_ref.update(fields)
+
+
+def claim_awaiting_transcription(user_id: str, job_id: str) -> bool:
+    """
+    Atomically clears a job's awaiting_transcription flag. Returns True for
+    the one caller that cleared it, so a job waiting on AssemblyAI is resumed
+    once even if its webhook and its fallback task both arrive.
+    """
+    if db is None:
+        raise ConnectionError("Database client not initialized.")
+
+    job_ref = db.collection(f"saas_users/{user_id}/jobs").document(job_id)
+
+    @firestore.transactional
+    def claim(transaction) -> bool:
+        snapshot = job_ref.get(transaction=transaction)
+        if not snapshot.exists or not snapshot.to_dict().get("awaiting_transcription"):
+            return False
+        transaction.update(
+            job_ref,
+            {"awaiting_transcription": False, "updatedAt": firestore.SERVER_TIMESTAMP},
+        )
+        return True
+
+    return claim(db.transaction())
+
+
+def claim_stale_job(user_id: str, job_id: str, stale_after_seconds: float) -> bool:
+    """
+    Atomically takes over a PROCESSING job that has not been updated for
+    stale_after_seconds, i.e. whose worker has died. Returns True for the one
+    caller that took it over; its updatedAt is refreshed so others back off.
+    """
+    if db is None:
+        raise ConnectionError("Database client not initialized.")
+
+    job_ref = db.collection(f"saas_users/{user_id}/jobs").document(job_id)
+    cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+        seconds=stale_after_seconds
+    )
+
+    @firestore.transactional
+    def claim(transaction) -> bool:
+        snapshot = job_ref.get(transaction=transaction)
+        if not snapshot.exists:
+            return False
+        data = snapshot.to_dict()
+        updated_at = data.get("updatedAt")
+        if (
+            data.get("status") != "PROCESSING"
+            or data.get("awaiting_transcription")
+            or (updated_at is not None and updated_at > cutoff)
+        ):
+            return False
+        transaction.update(job_ref, {"updatedAt": firestore.SERVER_TIMESTAMP})
+        return True
+
+    return claim(db.transaction())
+
+
 def save_job_results(user_id: str, job_id: str, results: List[Dict[str, Any]]):
     """Saves the final, completed analysis results to the job document."""
     if db is None:
@@ -299,6 +417,25 @@ def log_progress(user_id: str, job_id: str, message: str):
     db.collection(f"saas_users/{user_id}/jobs/{job_id}/logs").add(log_entry)
 
 
+def log_progress_batch(user_id: str, job_id: str, entries: List[Dict[str, Any]]):
+    """
+    Adds several log entries to the job's log subcollection in batched writes.
+
+    Entries carry their own 'timestamp' (and usually 'sequence'), set when the
+    message was produced rather than when it is written.
+    """
+    if db is None or not entries:
+        return  # Don't crash if db isn't available
+
+    logs_ref = db.collection(f"saas_users/{user_id}/jobs/{job_id}/logs")
+    # Firestore allows at most 500 writes per batch
+    for chunk_start in range(0, len(entries), 500):
+        batch = db.batch()
+        for entry in entries[chunk_start : chunk_start + 500]:
+            batch.set(logs_ref.document(), entry)
+        batch.commit()
+
+
 # get_user_plan function removed - no longer needed in credit-based system
 
 
@@ -373,6 +510,142 @@ def get_cached_transcript(transcript_id: str) -> Optional[Dict]:  # Return a Dic
     return None
 
 
+# --- YouTube transcript store (shared by all users, keyed by video) ---
+
+# Firestore documents are limited to 1 MiB
+MAX_STORED_TRANSCRIPT_BYTES = 900_000
+
+
+def _youtube_transcript_ref(video_id: str, language: str):
+    return db.collection("youtube_transcripts").document(f"{video_id}_{language}")
+
+
+def get_stored_youtube_transcript(video_id: str, language: str = "en") -> Optional[Dict]:
+    """
+    Returns a previously fetched YouTube transcript and its video metadata,
+    or None if the video has not been stored or its entry has expired.
+    """
+    if db is None:
+        return None
+
+    doc = _youtube_transcript_ref(video_id, language).get()
+    if not doc.exists:
+        return None
+
+    data = doc.to_dict()
+    expires_at = data.get("expiresAt")
+    if expires_at and expires_at < datetime.datetime.now(datetime.timezone.utc):
+        return None
+
+    if "transcript_zlib" in data:
+        data["structured_transcript"] = json.loads(
+            zlib.decompress(data.pop("transcript_zlib")).decode("utf-8")
+        )
+    return data
+
+
+def save_youtube_transcript(
+    video_id: str,
+    language: str,
+    transcript: List[Dict],
+    character_count: int,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """
+    Stores a fetched YouTube transcript for every later request for the same video.
+    Large transcripts are zlib-compressed; ones that still do not fit in a
+    Firestore document are not stored. Returns whether the transcript was stored.
+    """
+    if db is None:
+        return False
+
+    data = {
+        "video_id": video_id,
+        "language": language,
+        "character_count": character_count,
+        "metadata": metadata or {},
+        "createdAt": firestore.SERVER_TIMESTAMP,
+        "expiresAt": datetime.datetime.now(datetime.timezone.utc)
+        + datetime.timedelta(days=settings.YOUTUBE_TRANSCRIPT_STORE_TTL_DAYS),
+    }
+
+    encoded = json.dumps(transcript, separators=(",", ":")).encode("utf-8")
+    if len(encoded) < settings.YOUTUBE_TRANSCRIPT_COMPRESS_MIN_BYTES:
+        data["structured_transcript"] = transcript
+    else:
+        data["transcript_zlib"] = zlib.compress(encoded)
+        if len(data["transcript_zlib"]) > MAX_STORED_TRANSCRIPT_BYTES:
+            print(
+                f"[yellow]Transcript for video {video_id} is too large to store "
+                f"({len(data['transcript_zlib'])} bytes compressed).[/yellow]"
+            )
+            return False
+
+    _youtube_transcript_ref(video_id, language).set(data)
+    return True
+
+
+def _job_checkpoints_ref(user_id: str, job_id: str):
+    return (
+        db.collection(f"saas_users/{user_id}/jobs")
+        .document(job_id)
+        .collection("checkpoints")
+    )
+
+
+def save_job_checkpoint(user_id: str, job_id: str, stage: str, version: int, data: Any) -> bool:
+    """
+    Stores the output of a completed pipeline stage, zlib-compressed JSON.
+    Outputs that do not fit in a Firestore document are not stored.
+    Returns whether the checkpoint was stored.
+    """
+    if db is None:
+        raise ConnectionError("Database client not initialized.")
+
+    payload = zlib.compress(
+        json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+    )
+    if len(payload) > MAX_STORED_TRANSCRIPT_BYTES:
+        print(
+            f"[yellow]Checkpoint '{stage}' for job {job_id} is too large to store "
+            f"({len(payload)} bytes compressed).[/yellow]"
+        )
+        return False
+
+    _job_checkpoints_ref(user_id, job_id).document(stage).set(
+        {
+            "version": version,
+            "data_zlib": payload,
+            "createdAt": firestore.SERVER_TIMESTAMP,
+        }
+    )
+    return True
+
+
+def get_job_checkpoints(user_id: str, job_id: str) -> Dict[str, Dict[str, Any]]:
+    """Returns a job's stored checkpoints as {stage: {"version", "data"}}."""
+    if db is None:
+        raise ConnectionError("Database client not initialized.")
+
+    checkpoints = {}
+    for doc in _job_checkpoints_ref(user_id, job_id).stream():
+        entry = doc.to_dict()
+        checkpoints[doc.id] = {
+            "version": entry.get("version"),
+            "data": json.loads(zlib.decompress(entry["data_zlib"]).decode("utf-8")),
+        }
+    return checkpoints
+
+
+def delete_job_checkpoints(user_id: str, job_id: str):
+    """Removes a job's checkpoints once the job has finished."""
+    if db is None:
+        raise ConnectionError("Database client not initialized.")
+
+    for doc_ref in _job_checkpoints_ref(user_id, job_id).list_documents():
+        doc_ref.delete()
+
+
 # --- NEW: Open-Ended Quiz Functions (Jobs Subcollection) ---
 
 def create_open_ended_submission(
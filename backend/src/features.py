@@ -4,9 +4,6 @@ import os
 import json
 import asyncio
 from typing import List, Dict, Any
-from functools import wraps
-import time
-import random
 
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
@@ -18,40 +15,19 @@ from rich import print
 from src import clients
 
 
-def retry_with_exponential_backoff(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        max_retries = 5
-        delay = 2
-        for attempt in range(max_retries):
-            try:
-                return func(*args, **kwargs)
-            except (ResourceExhausted, json.JSONDecodeError) as e:
-                error_type = (
-                    "Rate limit hit"
-                    if isinstance(e, ResourceExhausted)
-                    else "JSON parsing error"
-                )
-                wait_time = delay + random.uniform(0, 1)
-                print(
-                    f"[yellow]{error_type}. Retrying in {wait_time:.2f} seconds... (Attempt {attempt + 1}/{max_retries})[/yellow]"
-                )
-                time.sleep(wait_time)
-                delay *= 2
-            except Exception as e:
-                print(
-                    f"[bold red]An unexpected error occurred in '{func.__name__}': {e}. Skipping retries for this call.[/bold red]"
-                )
-                break
-        print(
-            f"[bold red]Max retries reached or fatal error occurred for '{func.__name__}'. Returning a default empty dict.[/bold red]"
-        )
-        if "verify_claim" in func.__name__:
-            return {"summary": "Failed after multiple retries.", "perspectives": []}
-        else:
-            return {}
+try:
+    from src.resilience import (
+        retry_with_exponential_backoff as _retry_with_exponential_backoff,
+    )
+except ImportError:
+    from resilience import (
+        retry_with_exponential_backoff as _retry_with_exponential_backoff,
+    )
 
-    return wrapper
+# Gemini calls in this module retry on rate limits and malformed JSON only
+retry_with_exponential_backoff = _retry_with_exponential_backoff(
+    provider="gemini", retry_on=(ResourceExhausted, json.JSONDecodeError)
+)
 
 
 # Simplified Learning Accelerator Content Generator
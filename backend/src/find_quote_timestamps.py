@@ -3,8 +3,11 @@ Simple timestamp extraction for supporting quotes in actionable takeaways.
 """
 
 import re
-from typing import List, Dict, Any, Optional
-from thefuzz import fuzz
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from rapidfuzz import fuzz, process
 
 
 def convert_string_transcript_to_structured(transcript: str):
@@ -82,16 +85,301 @@ def format_timestamp(seconds: float) -> str:
     return str(seconds)
 
 
+def normalize_quote_words(text: str) -> List[str]:
+    """
+    Normalize text into the word tokens used for exact quote matching.
+
+    Lowercases, strips punctuation and splits on whitespace, so "Don't stop!"
+    becomes ["dont", "stop"].
+    """
+    if not text:
+        return []
+    return re.sub(r"[^\w\s]", "", text.lower()).split()
+
+
+class TranscriptQuoteIndex:
+    """
+    Token-level index over a structured transcript for fast quote lookups.
+
+    The index is built once per job and holds the normalized token stream of
+    the whole transcript, a token -> entry offset map and an n-gram index of
+    token positions. A quote lookup only verifies the positions that share the
+    quote's leading n-gram, so it costs roughly O(quote length) instead of
+    re-normalizing every concatenated block of entries for every probe.
+
+    Matching semantics follow the original block scan: a match may span at
+    most ``max_block_entries`` adjacent entries, the smallest span wins and
+    ties go to the earliest entry.
+    """
+
+    NGRAM_SIZE = 3
+    MAX_PROBE_WORDS = 6
+    # Slack around a section's time window, since section boundaries come
+    # from utterances and may not line up exactly with transcript entries
+    WINDOW_PADDING_SECONDS = 2.0
+
+    def __init__(
+        self,
+        structured_transcript: List[Dict[str, Any]],
+        max_block_entries: int = 5,
+    ):
+        self.entries = structured_transcript or []
+        self.max_block_entries = max_block_entries
+
+        # Flat token stream and, for each token, the index of its entry
+        self.tokens: List[str] = []
+        self.token_entries: List[int] = []
+        # Position of each entry's first token (plus a final sentinel)
+        self.entry_token_offsets: List[int] = []
+        # Start time of each entry, used to map time windows to entry ranges
+        self.entry_starts: List[float] = []
+
+        previous_start = 0.0
+        for entry_index, entry in enumerate(self.entries):
+            self.entry_token_offsets.append(len(self.tokens))
+
+            start = entry.get("start") if isinstance(entry, dict) else None
+            if isinstance(start, (int, float)):
+                previous_start = float(start)
+            self.entry_starts.append(previous_start)
+
+            if not isinstance(entry, dict) or "text" not in entry:
+                continue
+            for token in normalize_quote_words(entry.get("text", "")):
+                self.tokens.append(token)
+                self.token_entries.append(entry_index)
+        self.entry_token_offsets.append(len(self.tokens))
+
+        self._starts_sorted = all(
+            earlier <= later
+            for earlier, later in zip(self.entry_starts, self.entry_starts[1:])
+        )
+
+        # N-gram -> ascending list of token positions where it starts
+        self._ngram_positions: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        for position in range(len(self.tokens) - self.NGRAM_SIZE + 1):
+            ngram = tuple(self.tokens[position : position + self.NGRAM_SIZE])
+            self._ngram_positions[ngram].append(position)
+
+        self._fuzzy_matcher = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def fuzzy_matcher(self) -> "FuzzyTranscriptMatcher":
+        """Fuzzy matcher over the same transcript, built on first use."""
+        if self._fuzzy_matcher is None:
+            self._fuzzy_matcher = FuzzyTranscriptMatcher(self.entries)
+        return self._fuzzy_matcher
+
+    def entry_range_for_window(
+        self, start_seconds: Optional[float], end_seconds: Optional[float]
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Map a time window to the inclusive range of entries it covers.
+
+        The entry already running at ``start_seconds`` is included, so quotes
+        that begin just before a section boundary are still found.
+
+        Args:
+            start_seconds: Window start in seconds
+            end_seconds: Window end in seconds
+
+        Returns:
+            (first_entry, last_entry), or None when the window is unknown or
+            the transcript is not in time order (search everything instead)
+        """
+        if (
+            start_seconds is None
+            or end_seconds is None
+            or not self.entries
+            or not self._starts_sorted
+        ):
+            return None
+
+        start_seconds -= self.WINDOW_PADDING_SECONDS
+        end_seconds += self.WINDOW_PADDING_SECONDS
+
+        first = max(0, bisect_right(self.entry_starts, start_seconds) - 1)
+        last = bisect_left(self.entry_starts, end_seconds) - 1
+        if last < first:
+            return first, first
+        return first, last
+
+    def find_phrase_entry(
+        self, words: List[str], entry_range: Optional[Tuple[int, int]] = None
+    ) -> Optional[int]:
+        """
+        Find the entry where an exact word sequence starts.
+
+        Args:
+            words: Normalized words to look for (at least NGRAM_SIZE of them)
+            entry_range: Optional inclusive (first, last) entries the match
+                must start in
+
+        Returns:
+            Index of the first entry of the best match, or None
+        """
+        word_count = len(words)
+        if word_count < self.NGRAM_SIZE:
+            return None
+
+        candidates = self._ngram_positions.get(tuple(words[: self.NGRAM_SIZE]))
+        if not candidates:
+            return None
+
+        if entry_range is not None:
+            first_entry, last_entry = entry_range
+            low = bisect_left(candidates, self.entry_token_offsets[first_entry])
+            high = bisect_left(candidates, self.entry_token_offsets[last_entry + 1])
+            candidates = candidates[low:high]
+
+        tail = words[self.NGRAM_SIZE :]
+        best_span = None
+        best_entry = None
+
+        for position in candidates:
+            end = position + word_count
+            if end > len(self.tokens):
+                break
+            if tail and self.tokens[position + self.NGRAM_SIZE : end] != tail:
+                continue
+
+            first_entry = self.token_entries[position]
+            span = self.token_entries[end - 1] - first_entry + 1
+            if span > self.max_block_entries:
+                continue
+
+            if best_span is None or span < best_span:
+                best_span = span
+                best_entry = first_entry
+                # Candidates are in transcript order, so the first
+                # single-entry match cannot be beaten
+                if span == 1:
+                    break
+
+        return best_entry
+
+    def find_quote_timestamp(
+        self,
+        supporting_quote: str,
+        entry_range: Optional[Tuple[int, int]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the timestamp for a quote using the index.
+
+        Probes with the first 6, 5, 4 and finally 3 words of the quote.
+
+        Args:
+            supporting_quote: The quote text to find
+            entry_range: Optional inclusive (first, last) entries to search
+
+        Returns:
+            Dictionary with 'start' timestamp if found, None otherwise
+        """
+        if not supporting_quote or not self.tokens:
+            return None
+
+        quote_words = normalize_quote_words(supporting_quote)
+        if len(quote_words) < self.NGRAM_SIZE:
+            return None
+
+        for word_count in range(
+            min(self.MAX_PROBE_WORDS, len(quote_words)), self.NGRAM_SIZE - 1, -1
+        ):
+            entry_index = self.find_phrase_entry(quote_words[:word_count], entry_range)
+            if entry_index is not None:
+                start_seconds = self.entries[entry_index].get("start", 0)
+                return {"start": format_timestamp(start_seconds)}
+
+        return None
+
+
+# Indexes built in this process, keyed by caller-supplied transcript key.
+# Lets CPU executor worker processes build each job's index only once.
+_QUOTE_INDEX_CACHE: "OrderedDict[str, TranscriptQuoteIndex]" = OrderedDict()
+_QUOTE_INDEX_CACHE_SIZE = 4
+
+
+def get_cached_quote_index(
+    cache_key: str, structured_transcript: List[Dict[str, Any]]
+) -> TranscriptQuoteIndex:
+    """
+    Return this process's index for a transcript, building it on first use.
+
+    Args:
+        cache_key: Stable key for the transcript, e.g. the job ID
+        structured_transcript: The transcript the key refers to
+
+    Returns:
+        The cached or newly built TranscriptQuoteIndex
+    """
+    key = f"{cache_key}:{len(structured_transcript)}"
+    quote_index = _QUOTE_INDEX_CACHE.get(key)
+    if quote_index is None:
+        quote_index = TranscriptQuoteIndex(structured_transcript)
+        _QUOTE_INDEX_CACHE[key] = quote_index
+        if len(_QUOTE_INDEX_CACHE) > _QUOTE_INDEX_CACHE_SIZE:
+            _QUOTE_INDEX_CACHE.popitem(last=False)
+    else:
+        _QUOTE_INDEX_CACHE.move_to_end(key)
+    return quote_index
+
+
+def add_timestamps_with_cached_index(
+    add_timestamps: Callable[..., List[Dict[str, Any]]],
+    items: List[Dict[str, Any]],
+    index_cache_key: str,
+    entry_count: int,
+    time_window: Optional[Tuple[float, float]] = None,
+    structured_transcript: Optional[List[Dict[str, Any]]] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Run a timestamp helper with this process's cached index for a transcript.
+
+    Lets a CPU executor worker process receive a job's transcript once, on
+    its first call for the job, instead of with every section.
+
+    Args:
+        add_timestamps: add_timestamps_to_actionable_takeaways or
+            add_timestamps_to_notable_quotes
+        items: The takeaways or quotes to timestamp
+        index_cache_key: Key the transcript's index is cached under
+        entry_count: Number of entries in the transcript
+        time_window: Optional (start_seconds, end_seconds) passed to add_timestamps
+        structured_transcript: The transcript; only needed when this process
+            has no index cached for it yet
+
+    Returns:
+        The timestamped items, or None if no index is cached here and no
+        structured_transcript was passed
+    """
+    if structured_transcript is not None:
+        quote_index = get_cached_quote_index(index_cache_key, structured_transcript)
+    else:
+        key = f"{index_cache_key}:{entry_count}"
+        quote_index = _QUOTE_INDEX_CACHE.get(key)
+        if quote_index is None:
+            return None
+        _QUOTE_INDEX_CACHE.move_to_end(key)
+    return add_timestamps(items, quote_index.entries, quote_index, time_window)
+
+
 def find_quote_timestamp(
-    supporting_quote: str, structured_transcript: List[Dict[str, Any]]
+    supporting_quote: str,
+    structured_transcript: List[Dict[str, Any]],
+    quote_index: Optional[TranscriptQuoteIndex] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Find timestamp for a supporting quote by matching words in the transcript.
-    Now handles quotes that span multiple transcript entries.
+    Handles quotes that span multiple transcript entries.
 
     Args:
         supporting_quote: The quote text to find
         structured_transcript: List of transcript entries with 'text', 'start', 'duration' fields
+        quote_index: Prebuilt index for the transcript. Built on the fly if omitted;
+            pass one in when looking up several quotes against the same transcript.
 
     Returns:
         Dictionary with 'start' timestamp if found, None otherwise
@@ -99,51 +387,209 @@ def find_quote_timestamp(
     if not supporting_quote or not structured_transcript:
         return None
 
-    # Normalize the quote text
-    normalized_quote = re.sub(r"[^\w\s]", "", supporting_quote.lower())
-    normalized_quote = " ".join(normalized_quote.split())
-    quote_words = normalized_quote.split()
+    if quote_index is None:
+        quote_index = TranscriptQuoteIndex(structured_transcript)
 
-    if len(quote_words) < 3:
-        return None
+    return quote_index.find_quote_timestamp(supporting_quote)
 
-    # Create concatenated blocks from transcript entries
-    concatenated_blocks = create_concatenated_blocks(structured_transcript)
 
-    # Try matching with decreasing word counts (6, 5, 4, 3)
-    for word_count in range(min(6, len(quote_words)), 2, -1):
-        search_words = quote_words[:word_count]
-        search_text = " ".join(search_words)
-
-        # Search through concatenated blocks (prioritize smaller blocks first for accuracy)
-        for block in sorted(concatenated_blocks, key=lambda x: x["block_size"]):
-            block_text = re.sub(r"[^\w\s]", "", block.get("text", "").lower())
-            block_text = " ".join(block_text.split())
-
-            # Check if search text is found in this block
-            if search_text in block_text:
-                # Get start time from first segment
-                start_seconds = block.get("start", 0)
-                start_time = format_timestamp(start_seconds)
-
-                return {"start": start_time}
-
-    return None
+class FuzzyTranscriptMatcher:
+    """
+    Fuzzy quote aligner over a structured transcript.
 
+    The transcript is cleaned and tokenized once. For each query, an inverted
+    index of the query's rarest tokens picks the few regions of the transcript
+    worth looking at, and only the windows around those regions are scored,
+    in one batch, with rapidfuzz's partial_ratio. Short transcripts are scored
+    exhaustively since prefiltering would not save anything there.
 
+    The matcher never modifies the transcript entries it was built from.
+    """
 
+    START_WORDS = 4
+    WINDOW_EXTRA_WORDS = 3
+    RARE_TOKEN_LIMIT = 5
+    MAX_CANDIDATE_REGIONS = 8
+    EXHAUSTIVE_ENTRY_LIMIT = 60
+
+    def __init__(self, structured_transcript: List[Dict[str, Any]]):
+        self.entries = structured_transcript or []
+        self.clean_texts: List[str] = []
+        self.word_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+        for entry_index, entry in enumerate(self.entries):
+            text = entry.get("text", "") if isinstance(entry, dict) else ""
+            clean_text = re.sub(r"\s+", " ", text or "").strip().lower()
+            self.clean_texts.append(clean_text)
+            self.word_counts.append(len(clean_text.split()))
+
+            for token in set(normalize_quote_words(clean_text)):
+                self._postings[token].append(entry_index)
+
+    def match(
+        self,
+        query: str,
+        score_cutoff: int = 85,
+        entry_range: Optional[Tuple[int, int]] = None,
+    ) -> Optional[Tuple[int, int, int]]:
+        """
+        Find the best fuzzy match for a query.
+
+        Args:
+            query: The search query
+            score_cutoff: Minimum total score (similarity plus bonuses) to accept
+            entry_range: Optional inclusive (first, last) entries a match may
+                start in; defaults to the whole transcript
+
+        Returns:
+            (start_index, end_index, score) of the matching entries, inclusive,
+            or None if no window reaches the cutoff
+        """
+        if not self.entries or not query:
+            return None
+
+        clean_query = re.sub(r"\s+", " ", query).strip().lower()
+        query_words = clean_query.split()
+        if not query_words:
+            return None
+
+        max_window_words = len(query_words) + self.WINDOW_EXTRA_WORDS
+        first, last = entry_range if entry_range is not None else (0, len(self.entries) - 1)
+
+        if last - first + 1 <= self.EXHAUSTIVE_ENTRY_LIMIT:
+            windows = self._windows_from_starts(range(first, last + 1), max_window_words)
+        else:
+            starts = set()
+            for anchor in self._candidate_anchors(clean_query, first, last):
+                starts.update(
+                    start
+                    for start in self._region_starts(anchor, max_window_words)
+                    if first <= start <= last
+                )
+            windows = self._windows_from_starts(sorted(starts), max_window_words)
+
+        if not windows:
+            return None
+
+        window_texts = [
+            " ".join(self.clean_texts[start : end + 1]) for start, end in windows
+        ]
+        scored = process.extract(
+            clean_query, window_texts, scorer=fuzz.partial_ratio, limit=None
+        )
+
+        start_words = query_words[: self.START_WORDS]
+        best = None
+        for _, similarity, window_position in scored:
+            start, end = windows[window_position]
+            total_score = (
+                int(round(similarity))
+                + self._start_bonus(start_words, window_texts[window_position])
+                # Prefer earlier matches when scores are close
+                + max(0, 5 - start)
+            )
+            # Ties go to the earliest window, like a left-to-right scan
+            if (
+                best is None
+                or total_score > best[2]
+                or (total_score == best[2] and (start, end) < best[:2])
+            ):
+                best = (start, end, total_score)
+
+        if best and best[2] > 0 and best[2] >= score_cutoff:
+            return best
+        return None
 
-def find_fuzzy_transcript_match(transcript, query, score_cutoff=85):
+    def _candidate_anchors(self, clean_query: str, first: int, last: int) -> List[int]:
+        """Pick the entries in [first, last] sharing the most rare tokens with the query."""
+        query_tokens = [
+            token for token in set(normalize_quote_words(clean_query))
+            if token in self._postings
+        ]
+        if not query_tokens:
+            return []
+
+        rare_tokens = sorted(
+            query_tokens, key=lambda token: (len(self._postings[token]), token)
+        )[: self.RARE_TOKEN_LIMIT]
+
+        votes = Counter()
+        for token in rare_tokens:
+            postings = self._postings[token]
+            low = bisect_left(postings, first)
+            high = bisect_right(postings, last)
+            for entry_index in postings[low:high]:
+                votes[entry_index] += 1
+
+        ranked = sorted(votes.items(), key=lambda item: (-item[1], item[0]))
+        return [entry_index for entry_index, _ in ranked[: self.MAX_CANDIDATE_REGIONS]]
+
+    def _windows_from_starts(self, starts, max_window_words: int) -> List[Tuple[int, int]]:
+        """All windows beginning at the given starts that fit the word budget."""
+        windows = []
+        for start in starts:
+            words = 0
+            for end in range(start, len(self.entries)):
+                words += self.word_counts[end]
+                if words > max_window_words:
+                    break
+                windows.append((start, end))
+        return windows
+
+    def _region_starts(self, anchor: int, max_window_words: int) -> range:
+        """Window starts close enough to the anchor to overlap its neighbourhood."""
+        first = anchor
+        words = self.word_counts[anchor]
+        while first > 0 and words + self.word_counts[first - 1] <= max_window_words:
+            first -= 1
+            words += self.word_counts[first]
+
+        last = anchor
+        words = self.word_counts[anchor]
+        while last + 1 < len(self.entries) and words + self.word_counts[last + 1] <= max_window_words:
+            last += 1
+            words += self.word_counts[last]
+
+        return range(first, last + 1)
+
+    @staticmethod
+    def _start_bonus(start_words: List[str], window_text: str) -> int:
+        """Bonus for windows containing the query's opening words in order."""
+        found = 0
+        last_found_index = -1
+        for word in start_words:
+            word_index = window_text.find(word, last_found_index + 1)
+            if word_index == -1:
+                break  # Must be in order
+            found += 1
+            last_found_index = word_index
+
+        if found >= 3:
+            return 15
+        if found >= 2:
+            return 10
+        return 0
+
+
+def find_fuzzy_transcript_match(
+    transcript,
+    query,
+    score_cutoff=85,
+    matcher: Optional[FuzzyTranscriptMatcher] = None,
+):
     """
     Finds the best fuzzy match for a query within a transcript.
 
     This function is resilient to minor errors (like missing or wrong words)
-    in the transcript by using a sliding window and fuzzy matching.
+    in the transcript by using a sliding window and fuzzy matching. The
+    transcript entries are left untouched.
 
     Args:
         transcript (list[dict]): A list of utterance dictionaries.
         query (str): The search query from the user.
         score_cutoff (int): The minimum similarity score (0-100) to consider a match.
+        matcher (FuzzyTranscriptMatcher): Optional prebuilt matcher for the transcript.
 
     Returns:
         list[dict] or None: A list of the matching utterance dictionaries,
@@ -152,97 +598,21 @@ def find_fuzzy_transcript_match(transcript, query, score_cutoff=85):
     if not transcript or not query:
         return None
 
-    # --- Pre-processing for better matching ---
-    # Normalize whitespace and clean both the query and transcript text.
-    clean_query = re.sub(r'\s+', ' ', query).strip().lower()
-
-    # Create a clean version of the transcript text for searching
-    # while keeping the original data intact.
-    for utterance in transcript:
-        utterance['clean_text'] = re.sub(r'\s+', ' ', utterance['text']).strip().lower()
-
-    # --- Sliding Window Search ---
-    best_match = {
-        "score": 0,
-        "start_index": -1,
-        "end_index": -1
-    }
-
-    query_len = len(clean_query.split())
-
-    # First, try to find matches that start at the beginning of the query
-    # Look for where the query begins in the transcript
-    query_start_words = clean_query.split()[:4]  # First 4 words of query
-    query_start_text = " ".join(query_start_words)
-
-    # Iterate through all possible starting points of a match
-    for i in range(len(transcript)):
-        # Create a "window" of utterances to test against the query
-        # We test windows that are roughly the same word-length as the query
-        # to find the most relevant segment. We add a small buffer (+3 words).
-        for j in range(i, len(transcript)):
-            window_utterances = transcript[i : j + 1]
-            combined_text = " ".join([u['clean_text'] for u in window_utterances])
-
-            # Stop expanding the window if it's much longer than the query
-            if len(combined_text.split()) > query_len + 3:
-                break
+    if matcher is None:
+        matcher = FuzzyTranscriptMatcher(transcript)
 
-            # Use partial_ratio for better results with substring-like matches
-            score = fuzz.partial_ratio(clean_query, combined_text)
-
-            # Bonus for matches that contain the beginning of the query
-            start_bonus = 0
-            # Check if the start words appear in order (more flexible matching)
-            query_start_words_found = 0
-            last_found_index = -1
-            for word in query_start_words:
-                word_index = combined_text.find(word, last_found_index + 1)
-                if word_index != -1:
-                    query_start_words_found += 1
-                    last_found_index = word_index
-                else:
-                    break  # Must be in order
-
-            # Give bonus based on how many start words are found in order
-            if query_start_words_found >= 3:  # At least 3 out of 4 start words
-                start_bonus = 15
-            elif query_start_words_found >= 2:  # At least 2 start words
-                start_bonus = 10
-
-            # Bonus for earlier positions (prefer earlier matches when scores are close)
-            position_bonus = max(0, 5 - i)  # Earlier positions get small bonus
-
-            total_score = score + start_bonus + position_bonus
-
-            if total_score > best_match["score"]:
-                best_match["score"] = total_score
-                best_match["start_index"] = i
-                best_match["end_index"] = j
-
-    # --- Return the result ---
-    # Adjust cutoff to account for potential bonuses (max bonus is ~15 points)
-    adjusted_cutoff = score_cutoff
-    if best_match["score"] >= adjusted_cutoff:
-        start = best_match["start_index"]
-        end = best_match["end_index"] + 1
-
-        # Return the original utterance objects, removing the temporary clean_text
-        result_utterances = transcript[start:end]
-        for u in result_utterances:
-            del u['clean_text']
-
-        return result_utterances
-    else:
-        # Clean up all utterances if no match is found
-        for u in transcript:
-             if 'clean_text' in u:
-                del u['clean_text']
+    best_match = matcher.match(query, score_cutoff)
+    if best_match is None:
         return None
 
+    start, end, _ = best_match
+    return transcript[start : end + 1]
+
 
 def find_quote_timestamp_with_fuzzy_fallback(
-    supporting_quote: str, structured_transcript: List[Dict[str, Any]]
+    supporting_quote: str,
+    structured_transcript: List[Dict[str, Any]],
+    quote_index: Optional[TranscriptQuoteIndex] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Enhanced version of find_quote_timestamp that uses fuzzy matching as a fallback.
@@ -250,17 +620,22 @@ def find_quote_timestamp_with_fuzzy_fallback(
     Args:
         supporting_quote: The quote text to find
         structured_transcript: List of transcript entries with 'text', 'start', 'duration' fields
+        quote_index: Optional prebuilt index for the transcript
 
     Returns:
         Dictionary with 'start' timestamp if found, None otherwise
     """
     # First try the exact matching approach
-    result = find_quote_timestamp(supporting_quote, structured_transcript)
+    result = find_quote_timestamp(supporting_quote, structured_transcript, quote_index)
     if result:
         return result
 
     # If exact matching fails, try fuzzy matching
-    fuzzy_matches = find_fuzzy_transcript_match(structured_transcript, supporting_quote)
+    fuzzy_matches = find_fuzzy_transcript_match(
+        structured_transcript,
+        supporting_quote,
+        matcher=quote_index.fuzzy_matcher if quote_index is not None else None,
+    )
     if fuzzy_matches:
         # Return the start time of the first matching utterance
         start_seconds = fuzzy_matches[0].get("start", 0)
@@ -270,9 +645,97 @@ def find_quote_timestamp_with_fuzzy_fallback(
     return None
 
 
+@dataclass
+class QuoteLookup:
+    """A quote to locate, optionally tied to the time window it came from."""
+
+    text: str
+    start_seconds: Optional[float] = None
+    end_seconds: Optional[float] = None
+
+
+def resolve_quote_timestamps(
+    lookups: List[QuoteLookup],
+    structured_transcript: List[Dict[str, Any]],
+    quote_index: Optional[TranscriptQuoteIndex] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Resolve timestamps for a batch of quotes, e.g. every quote of a job.
+
+    Each quote is first searched (exact, then fuzzy) only within the entries
+    covered by its time window, usually the section it was extracted from.
+    Only the misses fall back to the global exact/fuzzy search. Repeated
+    (text, window) pairs are resolved once.
+
+    Args:
+        lookups: Quotes to resolve, with optional start/end seconds
+        structured_transcript: List of transcript entries with timing data
+        quote_index: Optional prebuilt index, shared across calls for the same job
+
+    Returns:
+        One {'start': 'MM:SS'} dict or None per lookup, in input order
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(lookups)
+    if not lookups or not structured_transcript:
+        return results
+
+    if quote_index is None:
+        quote_index = TranscriptQuoteIndex(structured_transcript)
+
+    entry_ranges: Dict[Tuple[Any, Any], Optional[Tuple[int, int]]] = {}
+    resolved: Dict[Tuple[str, Any, Any], Optional[Dict[str, Any]]] = {}
+    global_misses: Dict[str, List[int]] = defaultdict(list)
+
+    # Pass 1: search each quote inside its own window
+    for position, lookup in enumerate(lookups):
+        if not lookup.text:
+            continue
+
+        key = (lookup.text, lookup.start_seconds, lookup.end_seconds)
+        if key in resolved:
+            results[position] = resolved[key]
+            if resolved[key] is None:
+                global_misses[lookup.text].append(position)
+            continue
+
+        window = (lookup.start_seconds, lookup.end_seconds)
+        if window not in entry_ranges:
+            entry_ranges[window] = quote_index.entry_range_for_window(*window)
+        entry_range = entry_ranges[window]
+
+        timestamp_info = None
+        if entry_range is not None:
+            timestamp_info = quote_index.find_quote_timestamp(lookup.text, entry_range)
+            if timestamp_info is None:
+                best_match = quote_index.fuzzy_matcher.match(
+                    lookup.text, entry_range=entry_range
+                )
+                if best_match is not None:
+                    start_seconds = quote_index.entries[best_match[0]].get("start", 0)
+                    timestamp_info = {"start": format_timestamp(start_seconds)}
+
+        resolved[key] = timestamp_info
+        results[position] = timestamp_info
+        if timestamp_info is None:
+            global_misses[lookup.text].append(position)
+
+    # Pass 2: global search for whatever the windows did not contain
+    for text, positions in global_misses.items():
+        timestamp_info = find_quote_timestamp_with_fuzzy_fallback(
+            text, structured_transcript, quote_index
+        )
+        for position in positions:
+            results[position] = timestamp_info
+
+    return results
+
+
 def add_timestamps_to_actionable_takeaways(
     actionable_takeaways: List[Dict[str, Any]],
     structured_transcript: List[Dict[str, Any]],
+    quote_index: Optional[TranscriptQuoteIndex] = None,
+    time_window: Optional[Tuple[float, float]] = None,
+    index_cache_key: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
     Add timestamps to actionable takeaways by matching supporting quotes with transcript.
@@ -280,6 +743,11 @@ def add_timestamps_to_actionable_takeaways(
     Args:
         actionable_takeaways: List of takeaway dictionaries with 'supporting_quote' field
         structured_transcript: List of transcript entries with timing data
+        quote_index: Optional prebuilt index, shared across calls for the same job
+        time_window: Optional (start_seconds, end_seconds) of the section the
+            takeaways came from; searched first before the whole transcript
+        index_cache_key: Optional key to reuse this process's index for the
+            transcript when no quote_index is passed (see get_cached_quote_index)
 
     Returns:
         Enhanced takeaways with 'quote_timestamp' field added where matches found
@@ -287,26 +755,31 @@ def add_timestamps_to_actionable_takeaways(
     if not actionable_takeaways or not structured_transcript:
         return actionable_takeaways
 
+    if quote_index is None and index_cache_key:
+        quote_index = get_cached_quote_index(index_cache_key, structured_transcript)
+
+    start_seconds, end_seconds = time_window or (None, None)
+    lookups = [
+        QuoteLookup(takeaway.get("supporting_quote", ""), start_seconds, end_seconds)
+        if isinstance(takeaway, dict)
+        else QuoteLookup("")
+        for takeaway in actionable_takeaways
+    ]
+    timestamps = resolve_quote_timestamps(lookups, structured_transcript, quote_index)
+
     enhanced_takeaways = []
     matches_found = 0
 
-    for takeaway in actionable_takeaways:
+    for takeaway, timestamp_info in zip(actionable_takeaways, timestamps):
         if not isinstance(takeaway, dict):
             enhanced_takeaways.append(takeaway)
             continue
 
         # Copy the takeaway
         enhanced_takeaway = takeaway.copy()
-
-        # Try to find timestamp for the supporting quote
-        supporting_quote = takeaway.get("supporting_quote", "")
-        if supporting_quote:
-            timestamp_info = find_quote_timestamp_with_fuzzy_fallback(
-                supporting_quote, structured_transcript
-            )
-            if timestamp_info:
-                enhanced_takeaway["quote_timestamp"] = timestamp_info
-                matches_found += 1
+        if timestamp_info:
+            enhanced_takeaway["quote_timestamp"] = timestamp_info
+            matches_found += 1
 
         enhanced_takeaways.append(enhanced_takeaway)
 
@@ -320,6 +793,9 @@ def add_timestamps_to_actionable_takeaways(
 def add_timestamps_to_notable_quotes(
     notable_quotes: List[Dict[str, Any]],
     structured_transcript: List[Dict[str, Any]],
+    quote_index: Optional[TranscriptQuoteIndex] = None,
+    time_window: Optional[Tuple[float, float]] = None,
+    index_cache_key: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
     Add precise timestamps to notable quotes by matching quote text with transcript.
@@ -329,6 +805,11 @@ def add_timestamps_to_notable_quotes(
     Args:
         notable_quotes: List of quote dictionaries with 'quote' and 'context' fields
         structured_transcript: List of transcript entries with timing data
+        quote_index: Optional prebuilt index, shared across calls for the same job
+        time_window: Optional (start_seconds, end_seconds) of the section the
+            quotes came from; searched first before the whole transcript
+        index_cache_key: Optional key to reuse this process's index for the
+            transcript when no quote_index is passed (see get_cached_quote_index)
 
     Returns:
         Enhanced quotes with 'timestamp' field updated to exact match location
@@ -336,27 +817,32 @@ def add_timestamps_to_notable_quotes(
     if not notable_quotes or not structured_transcript:
         return notable_quotes
 
+    if quote_index is None and index_cache_key:
+        quote_index = get_cached_quote_index(index_cache_key, structured_transcript)
+
+    start_seconds, end_seconds = time_window or (None, None)
+    lookups = [
+        QuoteLookup(quote_obj.get("quote", ""), start_seconds, end_seconds)
+        if isinstance(quote_obj, dict)
+        else QuoteLookup("")
+        for quote_obj in notable_quotes
+    ]
+    timestamps = resolve_quote_timestamps(lookups, structured_transcript, quote_index)
+
     enhanced_quotes = []
     matches_found = 0
 
-    for quote_obj in notable_quotes:
+    for quote_obj, timestamp_info in zip(notable_quotes, timestamps):
         if not isinstance(quote_obj, dict):
             enhanced_quotes.append(quote_obj)
             continue
 
         # Copy the quote object
         enhanced_quote = quote_obj.copy()
-
-        # Try to find timestamp for the quote text
-        quote_text = quote_obj.get("quote", "")
-        if quote_text:
-            timestamp_info = find_quote_timestamp_with_fuzzy_fallback(
-                quote_text, structured_transcript
-            )
-            if timestamp_info:
-                # Update the timestamp field with the exact match
-                enhanced_quote["timestamp"] = timestamp_info.get("start", enhanced_quote.get("timestamp", "00:00"))
-                matches_found += 1
+        if timestamp_info:
+            # Update the timestamp field with the exact match
+            enhanced_quote["timestamp"] = timestamp_info.get("start", enhanced_quote.get("timestamp", "00:00"))
+            matches_found += 1
 
         enhanced_quotes.append(enhanced_quote)
 
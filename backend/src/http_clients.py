@@ -0,0 +1,128 @@
+"""
+Shared HTTP clients for calls to external providers.
+
+Creating an httpx.AsyncClient per request pays for a new TCP and TLS
+handshake every time. get_http_client returns one long-lived client per
+provider profile instead, each with its own connection pool, keep-alive
+settings and timeouts. HTTP/2 is used when the `h2` package is installed
+(it is listed in the requirements).
+"""
+
+import asyncio
+from typing import Any, Dict, Optional, Set, Tuple
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (needed by httpx for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Pool and timeout settings per provider profile
+HTTP_CLIENT_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {
+        "timeout": 30.0,
+        "connect_timeout": 10.0,
+        "max_connections": 100,
+        "max_keepalive_connections": 20,
+        "keepalive_expiry": 30.0,
+    },
+    # Small JSON responses from the YouTube Data API
+    "youtube": {
+        "timeout": 10.0,
+        "connect_timeout": 5.0,
+        "max_connections": 20,
+        "max_keepalive_connections": 10,
+        "keepalive_expiry": 60.0,
+    },
+    # Audio uploads and transcription polling; uploads can take minutes
+    "assemblyai": {
+        "timeout": 600.0,
+        "connect_timeout": 10.0,
+        "max_connections": 20,
+        "max_keepalive_connections": 10,
+        "keepalive_expiry": 60.0,
+    },
+}
+
+# name -> (client, event loop it was created on)
+_clients: Dict[str, Tuple[httpx.AsyncClient, Optional[asyncio.AbstractEventLoop]]] = {}
+# Closes of replaced clients still in progress
+_closing: Set[asyncio.Task] = set()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def create_http_client(name: str = "default") -> httpx.AsyncClient:
+    """A new client configured with the named profile."""
+    profile = HTTP_CLIENT_PROFILES.get(name, HTTP_CLIENT_PROFILES["default"])
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        timeout=httpx.Timeout(profile["timeout"], connect=profile["connect_timeout"]),
+        limits=httpx.Limits(
+            max_connections=profile["max_connections"],
+            max_keepalive_connections=profile["max_keepalive_connections"],
+            keepalive_expiry=profile["keepalive_expiry"],
+        ),
+    )
+
+
+def get_http_client(name: str = "default") -> httpx.AsyncClient:
+    """
+    The shared client for a provider profile. Pooled connections belong to
+    the event loop that opened them, so a client is replaced if it is used
+    from a different loop.
+    """
+    loop = _running_loop()
+    entry = _clients.get(name)
+    if entry is not None:
+        client, client_loop = entry
+        if not client.is_closed and (client_loop is None or client_loop is loop):
+            return client
+        _close_replaced_client(client, client_loop)
+    client = create_http_client(name)
+    _clients[name] = (client, loop)
+    return client
+
+
+def _close_replaced_client(
+    client: httpx.AsyncClient, client_loop: Optional[asyncio.AbstractEventLoop]
+):
+    """
+    Close a client replaced because it belongs to another event loop. It is
+    closed on that loop while the loop still runs; otherwise its pool is shut
+    down from the current loop, which releases the pooled connections.
+    """
+    if client.is_closed:
+        return
+    if client_loop is not None and client_loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), client_loop)
+        return
+    loop = _running_loop()
+    if loop is not None:
+        task = loop.create_task(_aclose_quietly(client))
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+
+async def _aclose_quietly(client: httpx.AsyncClient):
+    try:
+        await client.aclose()
+    except Exception:
+        # Connections opened on a closed loop cannot be shut down cleanly;
+        # the client has still dropped them
+        pass
+
+
+async def close_http_clients():
+    """Close every shared client; call on application shutdown."""
+    entries = list(_clients.values())
+    _clients.clear()
+    for client, _ in entries:
+        await client.aclose()
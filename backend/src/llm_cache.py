@@ -0,0 +1,363 @@
+"""
+Content-addressed cache for LLM responses.
+
+The same transcript is often analysed more than once (task retries, re-runs,
+the same video submitted by several users), and every chain call would pay
+for the same prompt again. TieredLLMCache plugs into LangChain's cache hook
+(set_llm_cache), so every chat model call is looked up before it is sent.
+
+Entries are keyed on a SHA-256 of the model's llm_string (model name,
+temperature and other call parameters) and the fully rendered prompt
+messages, which covers both the prompt template and its inputs. Lookups go
+to an in-memory LRU first and then to an optional persistent store: SQLite
+for local development or Firestore in production. Every entry has a TTL.
+
+Cached and fresh generations are tagged in response_metadata["llm_cache"]
+("hit" or "miss") so TokenCostCallbackHandler can count hits and misses
+without charging tokens for cached responses.
+"""
+
+import asyncio
+import copy
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.globals import set_llm_cache
+from langchain_core.load import dumps, loads
+from rich import print
+
+CACHE_MARKER = "llm_cache"
+
+# Firestore documents are limited to 1 MiB; larger responses are not persisted
+MAX_FIRESTORE_VALUE_BYTES = 900_000
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """Content address of one model call."""
+    digest = hashlib.sha256()
+    digest.update(llm_string.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _mark(generations: Sequence[Any], value: str):
+    for gen in generations:
+        message = getattr(gen, "message", None)
+        if message is not None:
+            message.response_metadata[CACHE_MARKER] = value
+
+
+class SQLiteLLMCacheStore:
+    """Persistent cache entries in a local SQLite file, for development."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache "
+            "(key TEXT PRIMARY KEY, value BLOB, expires_at REAL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key: str, value: bytes, ttl: float, model: str = ""):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl),
+        )
+
+    def clear(self):
+        self._connect().execute("DELETE FROM llm_cache")
+
+
+class FirestoreLLMCacheStore:
+    """
+    Persistent cache entries in a Firestore collection, shared by all workers.
+    A Firestore TTL policy on `expires_at` removes expired documents.
+    """
+
+    def __init__(self, db, collection: str = "llm_cache"):
+        self.collection = db.collection(collection)
+
+    def get(self, key: str) -> Optional[bytes]:
+        doc = self.collection.document(key).get()
+        if not doc.exists:
+            return None
+        data = doc.to_dict()
+        if data["expires_at"] < datetime.now(timezone.utc):
+            return None
+        return data["value"]
+
+    def set(self, key: str, value: bytes, ttl: float, model: str = ""):
+        if len(value) > MAX_FIRESTORE_VALUE_BYTES:
+            return
+        self.collection.document(key).set(
+            {
+                "value": value,
+                "model": model,
+                "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl),
+            }
+        )
+
+    def clear(self):
+        for doc in self.collection.list_documents():
+            doc.delete()
+
+
+class TieredLLMCache(BaseCache):
+    """LangChain cache with an in-memory LRU in front of an optional persistent store."""
+
+    def __init__(self, store=None, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 512):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (generations, expiry time)
+        self._memory: "OrderedDict[str, Tuple[RETURN_VAL_TYPE, float]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.store_errors = 0
+
+    def _memory_get(self, key: str) -> Optional[RETURN_VAL_TYPE]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.monotonic():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return entry[0]
+
+    def _memory_set(self, key: str, generations: RETURN_VAL_TYPE, ttl: Optional[float] = None):
+        expires = time.monotonic() + (self.ttl_seconds if ttl is None else ttl)
+        with self._lock:
+            self._memory[key] = (generations, expires)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _store_get(self, key: str) -> Optional[RETURN_VAL_TYPE]:
+        if self.store is None:
+            return None
+        try:
+            value = self.store.get(key)
+            if value is None:
+                return None
+            generations = loads(
+                zlib.decompress(value).decode("utf-8"), allowed_objects="core"
+            )
+        except Exception as e:
+            self.store_errors += 1
+            print(f"[yellow]LLM cache store lookup failed: {e}[/yellow]")
+            return None
+        # Keep a copy in memory so the next lookup does not leave the process
+        self._memory_set(key, generations)
+        return generations
+
+    def _find(self, key: str) -> Tuple[Optional[RETURN_VAL_TYPE], str]:
+        generations = self._memory_get(key)
+        if generations is not None:
+            return generations, "memory"
+        generations = self._store_get(key)
+        if generations is not None:
+            return generations, "store"
+        return None, ""
+
+    def _record(self, tier: str):
+        with self._lock:
+            if tier == "memory":
+                self.hits += 1
+                self.memory_hits += 1
+            elif tier == "store":
+                self.hits += 1
+                self.store_hits += 1
+            else:
+                self.misses += 1
+
+    def _copy(self, generations: RETURN_VAL_TYPE) -> RETURN_VAL_TYPE:
+        # Callers may mutate what they get back, so hand out fresh objects
+        return copy.deepcopy(generations)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        generations, tier = self._find(cache_key(prompt, llm_string))
+        self._record(tier)
+        if generations is None:
+            return None
+        generations = self._copy(generations)
+        _mark(generations, "hit")
+        return generations
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = cache_key(prompt, llm_string)
+        generations, tier = self._memory_get(key), "memory"
+        if generations is None:
+            generations, tier = await asyncio.to_thread(self._find, key)
+        self._record(tier)
+        if generations is None:
+            return None
+        generations = self._copy(generations)
+        _mark(generations, "hit")
+        return generations
+
+    def contains(self, prompt: str, llm_string: str) -> bool:
+        """Whether a call is cached, without counting a hit or a miss."""
+        return self._find(cache_key(prompt, llm_string))[0] is not None
+
+    async def acontains(self, prompt: str, llm_string: str) -> bool:
+        key = cache_key(prompt, llm_string)
+        if self._memory_get(key) is not None:
+            return True
+        return (await asyncio.to_thread(self._find, key))[0] is not None
+
+    def _prepare(self, llm_string: str, return_val: RETURN_VAL_TYPE) -> Optional[RETURN_VAL_TYPE]:
+        # Empty responses (blocked or failed generations) are not worth repeating
+        if not return_val or not any(getattr(gen, "text", "") for gen in return_val):
+            return None
+        generations = self._copy(return_val)
+        for gen in generations:
+            message = getattr(gen, "message", None)
+            if message is not None:
+                message.response_metadata.pop(CACHE_MARKER, None)
+        # The response handed back to the caller was not served from the cache
+        _mark(return_val, "miss")
+        return generations
+
+    def _store_set(self, key: str, llm_string: str, generations: RETURN_VAL_TYPE):
+        if self.store is None:
+            return
+        try:
+            value = zlib.compress(dumps(generations).encode("utf-8"))
+            self.store.set(key, value, self.ttl_seconds, model=_model_name(llm_string))
+        except Exception as e:
+            self.store_errors += 1
+            print(f"[yellow]LLM cache store update failed: {e}[/yellow]")
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        generations = self._prepare(llm_string, return_val)
+        if generations is None:
+            return
+        key = cache_key(prompt, llm_string)
+        self._memory_set(key, generations)
+        self._store_set(key, llm_string, generations)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        generations = self._prepare(llm_string, return_val)
+        if generations is None:
+            return
+        key = cache_key(prompt, llm_string)
+        self._memory_set(key, generations)
+        if self.store is not None:
+            await asyncio.to_thread(self._store_set, key, llm_string, generations)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.store).__name__ if self.store else "memory",
+                "entries_in_memory": len(self._memory),
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "store_hits": self.store_hits,
+                "store_errors": self.store_errors,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+def _model_name(llm_string: str) -> str:
+    # Only used to label persisted entries, so a best-effort guess is fine
+    marker = '"model": "'
+    start = llm_string.find(marker)
+    if start == -1:
+        return ""
+    start += len(marker)
+    return llm_string[start : llm_string.find('"', start)]
+
+
+_llm_cache: Optional[TieredLLMCache] = None
+
+
+def _get_cache_settings() -> Tuple[str, float, int]:
+    try:
+        from .config import settings
+        return (
+            settings.LLM_CACHE_BACKEND,
+            settings.LLM_CACHE_TTL_SECONDS,
+            settings.LLM_CACHE_MAX_ENTRIES,
+        )
+    except (ImportError, AttributeError):
+        return (
+            os.getenv("LLM_CACHE_BACKEND", "memory"),
+            float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+            int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512")),
+        )
+
+
+def install_llm_cache(db=None) -> Optional[TieredLLMCache]:
+    """
+    Create the cache selected by the LLM_CACHE_BACKEND setting and make it
+    LangChain's global cache. `db` is the Firestore client for the
+    "firestore" backend.
+    """
+    global _llm_cache
+    backend, ttl, max_entries = _get_cache_settings()
+
+    if backend == "none":
+        set_llm_cache(None)
+        _llm_cache = None
+        print("INFO:     LLM response cache disabled.")
+        return None
+
+    store = None
+    if backend.startswith("sqlite:///"):
+        store = SQLiteLLMCacheStore(backend[len("sqlite:///"):])
+    elif backend == "firestore":
+        if db is None:
+            print("[yellow]LLM cache: no Firestore client, using the in-memory tier only.[/yellow]")
+        else:
+            store = FirestoreLLMCacheStore(db)
+    elif backend != "memory":
+        print(f"[yellow]Unknown LLM_CACHE_BACKEND '{backend}', using the in-memory tier only.[/yellow]")
+
+    _llm_cache = TieredLLMCache(store=store, ttl_seconds=ttl, max_entries=max_entries)
+    set_llm_cache(_llm_cache)
+    print(f"INFO:     LLM response cache enabled ({backend}, TTL {int(ttl)}s).")
+    return _llm_cache
+
+
+def get_llm_cache_metrics() -> Dict[str, Any]:
+    if _llm_cache is None:
+        return {}
+    return _llm_cache.get_metrics()
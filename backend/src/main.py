@@ -8,11 +8,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.api_routes import router as analysis_router
 from src.worker_routes import router as task_router
-from src import db_manager
+from src import db_manager, llm_cache, tracing
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from tavily import TavilyClient
-import httpx
+from src.http_clients import close_http_clients, get_http_client
 from google.cloud import storage as gcs_storage
 
 
@@ -25,6 +25,8 @@ async def lifespan(app: FastAPI):
 
     # 1. Initialize Database
     db_manager.initialize_db()
+    llm_cache.install_llm_cache(db_manager.db)
+    tracing.configure_tracing("analysis-api")
 
     # 2. Initialize LLM and Tavily Clients
     print("--- Pre-loading LLM and Tavily clients for local dev ---")
@@ -44,7 +46,8 @@ async def lifespan(app: FastAPI):
         # GCS and HTTPX
         print("--- Pre-loading GCS and HTTPX clients ---")
         clients.gcs_client = gcs_storage.Client()
-        clients.httpx_client = httpx.AsyncClient(timeout=600.0)
+        # Pooled client shared by AssemblyAI calls (see http_clients.py)
+        clients.httpx_client = get_http_client("assemblyai")
     except Exception as e:
         print(f"FATAL: Failed to pre-load clients during startup: {e}")
         # Optionally re-raise to stop the server from starting in a broken state
@@ -53,6 +56,8 @@ async def lifespan(app: FastAPI):
     yield
 
     print("--- Application shutting down ---")
+    await close_http_clients()
+    tracing.shutdown_tracing()
 
 
 app = FastAPI(
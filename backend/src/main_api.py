@@ -3,7 +3,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src import config
 from src.api_routes import router as analysis_router
-from src import db_manager
+from src import db_manager, tracing
+from src.http_clients import close_http_clients
 
 
 # This context manager will run startup and shutdown logic
@@ -13,8 +14,11 @@ async def lifespan(app: FastAPI):
     Initializes shared resources like the database connection on startup.
     """
     db_manager.initialize_db()
+    tracing.configure_tracing("analysis-api")
     yield
     print("INFO:     API Service shutdown...")
+    await close_http_clients()
+    tracing.shutdown_tracing()
 
 
 # Initialize the FastAPI app
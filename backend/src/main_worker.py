@@ -1,13 +1,14 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from src import config, db_manager
+from src import config, db_manager, llm_cache, tracing
 from src.worker_routes import router as task_router
 import os
 
 from src import clients
+from src.pipeline.utils import get_cpu_executor, shutdown_cpu_executor
 from langchain_google_genai import ChatGoogleGenerativeAI
 from tavily import TavilyClient
-import httpx
+from src.http_clients import close_http_clients, get_http_client
 from google.cloud import storage as gcs_storage
 
 
@@ -18,6 +19,8 @@ async def lifespan(app: FastAPI):
     """
     print("INFO:     Worker Service startup initiated...")
     db_manager.initialize_db()
+    llm_cache.install_llm_cache(db_manager.db)
+    tracing.configure_tracing("analysis-worker")
 
     print("INFO:     Pre-loading LLM and Tavily clients...")
     try:
@@ -36,16 +39,23 @@ async def lifespan(app: FastAPI):
         # GCS and HTTPX
         print("--- Pre-loading GCS and HTTPX clients ---")
         clients.gcs_client = gcs_storage.Client()
-        clients.httpx_client = httpx.AsyncClient(timeout=600.0)
+        # Pooled client shared by AssemblyAI calls (see http_clients.py)
+        clients.httpx_client = get_http_client("assemblyai")
 
         print("INFO:     LLM and Tavily clients pre-loaded successfully.")
     except Exception as e:
         print(f"ERROR:    Failed to pre-load clients: {e}")
         raise
 
+    # Start the CPU executor's worker processes before the first job arrives
+    get_cpu_executor().warm_up()
+
     yield
 
     print("INFO:     Worker Service shutdown initiated...")
+    shutdown_cpu_executor()
+    await close_http_clients()
+    tracing.shutdown_tracing()
     print("INFO:     Worker Service shutdown complete.")
 
 
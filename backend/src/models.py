@@ -212,6 +212,7 @@ class BulkProcessResponse(BaseModel):
 
 class TranscriptDetailRequest(BaseModel):
     video_id: str
+    language: str = "en"
 
 
 class TranscriptDetailResponse(BaseModel):
@@ -5,13 +5,22 @@ This module provides the new, refactored pipeline implementation
 while maintaining compatibility with the existing interface.
 """
 
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, Optional
 from src import clients, db_manager, cost_tracking
+from src.config import settings
 from src.pipeline.factories import PipelineFactory
-from src.pipeline.orchestrators import AnalysisRequest
+from src.pipeline.orchestrators import AnalysisRequest, JobContext
+from src.tracing import current_trace_id, start_span, trace_context
 
 
-async def run_full_analysis(user_id: str, job_id: str, persona: str):
+async def run_full_analysis(
+    user_id: str,
+    job_id: str,
+    persona: str,
+    job_doc: Optional[Dict[str, Any]] = None,
+    trace_id: Optional[str] = None,
+):
     """
     Main entry point for the refactored analysis pipeline.
 
@@ -22,7 +31,19 @@ async def run_full_analysis(user_id: str, job_id: str, persona: str):
         user_id: The ID of the user requesting analysis
         job_id: The unique job identifier
         persona: The analysis persona ('deep_dive')
+        job_doc: The job document, if the caller already read it. It seeds the
+            pipeline's job context so the document is not fetched again.
+        trace_id: Trace started by the API for this job; the worker's spans
+            join it. A new trace is started if it is missing.
     """
+    with trace_context(trace_id):
+        with start_span("job.run_analysis", job_id=job_id, persona=persona):
+            return await _run_full_analysis(user_id, job_id, persona, job_doc)
+
+
+async def _run_full_analysis(
+    user_id: str, job_id: str, persona: str, job_doc: Optional[Dict[str, Any]]
+):
 
     # Create token tracker for cost tracking
     token_tracker = cost_tracking.TokenCostCallbackHandler(user_id, job_id)
@@ -35,8 +56,9 @@ async def run_full_analysis(user_id: str, job_id: str, persona: str):
         persona=persona,
     )
 
-    # Get job configuration from database
-    job_doc = db_manager.get_job_status(user_id, job_id)
+    # Get job configuration from database (read once, shared with the pipeline)
+    job_context = JobContext(db_manager, user_id, job_id, snapshot=job_doc)
+    job_doc = await job_context.load()
     if not job_doc:
         raise ValueError(f"Job {job_id} not found for user {user_id}")
 
@@ -61,14 +83,65 @@ async def run_full_analysis(user_id: str, job_id: str, persona: str):
         raw_transcript=transcript_value,
         config=request_data.get("config", {}),
         model_choice=request_data.get("model_choice", "universal"),
+        audio_duration_seconds=request_data.get("duration_seconds"),
     )
 
+    # The worker acknowledged this task before running it, so Cloud Tasks
+    # will not redeliver it if the worker dies; a later check resumes it
+    if job_doc.get("status") in ("QUEUED", "PROCESSING"):
+        await _schedule_resume_check(user_id, job_id)
+
     # Run the analysis
-    result = await pipeline.run_analysis(request)
+    result = await pipeline.run_analysis(request, job_context=job_context)
+
+    if result.status == "awaiting_transcription":
+        await _schedule_transcription_fallback(user_id, job_id)
 
     return result
 
 
+async def _schedule_transcription_fallback(user_id: str, job_id: str):
+    """
+    Queue a delayed analysis task for a job waiting on an AssemblyAI webhook,
+    so the job is still resumed (by polling) if the webhook never arrives.
+    """
+    # Imported here: creating the Cloud Tasks client needs GCP credentials
+    from src import task_manager
+
+    try:
+        await asyncio.to_thread(
+            task_manager.create_analysis_task,
+            user_id,
+            job_id,
+            delay_seconds=settings.ASSEMBLYAI_WEBHOOK_FALLBACK_SECONDS,
+            trace_id=current_trace_id(),
+        )
+    except Exception as e:
+        print(f"WARNING: Could not schedule transcription fallback for job {job_id}: {e}")
+
+
+async def _schedule_resume_check(user_id: str, job_id: str):
+    """
+    Queue an analysis task for JOB_RESUME_STALE_SECONDS from now. If the job
+    has stopped updating by then its worker died and the task resumes it
+    from its last checkpoint; if it is still running, the task only queues
+    the next check; once the job has finished the task is skipped.
+    """
+    # Imported here: creating the Cloud Tasks client needs GCP credentials
+    from src import task_manager
+
+    try:
+        await asyncio.to_thread(
+            task_manager.create_analysis_task,
+            user_id,
+            job_id,
+            delay_seconds=settings.JOB_RESUME_STALE_SECONDS,
+            trace_id=current_trace_id(),
+        )
+    except Exception as e:
+        print(f"WARNING: Could not schedule resume check for job {job_id}: {e}")
+
+
 # For backward compatibility, expose the old function name as well
 async def run_full_analysis_legacy(user_id: str, job_id: str, persona: str):
     """Legacy function name for backward compatibility."""
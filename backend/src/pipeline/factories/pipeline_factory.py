@@ -40,6 +40,7 @@ from ..implementations.title_generator import DefaultTitleGenerator
 from ..implementations.segmenter_strategy import SegmenterStrategy
 
 from ..config import get_persona_config
+from ..utils import get_cpu_executor, get_section_persistence_mode, rate_limited
 
 
 class PipelineFactory:
@@ -88,6 +89,8 @@ class PipelineFactory:
             entity_enricher=entity_enricher,
             db_manager=self.db_manager,
             persona=persona,
+            cpu_executor=get_cpu_executor(),
+            result_persistence=get_section_persistence_mode(),
         )
         
         title_generator = DefaultTitleGenerator(self._get_llm_client("best-lite"))
@@ -105,6 +108,7 @@ class PipelineFactory:
             briefing_generator=briefing_generator,
             db_manager=self.db_manager,
             token_tracker=self.token_tracker,
+            cpu_executor=get_cpu_executor(),
         )
     
     def _create_content_analyzer(self, persona: str) -> PersonaBasedAnalyzer:
@@ -173,9 +177,9 @@ class PipelineFactory:
         return self._audio_processor
     
     def _get_llm_client(self, model_type: str = "best-lite"):
-        """Get LLM client from clients module."""
+        """Get LLM client from clients module, behind the model's shared rate limiter."""
         llm, _ = self.clients.get_llm(model_type, temperature=0.2)
-        return llm
+        return rate_limited(llm, model_type)
     
     @classmethod
     def create_default_pipeline(
@@ -61,7 +61,8 @@ class AudioProcessor(ABC):
     async def transcribe(
         self, 
         storage_path: str, 
-        model_name: str = "universal"
+        model_name: str = "universal",
+        audio_duration: Optional[float] = None,
     ) -> Dict[str, Any]:
         """Transcribe audio file and return structured result."""
         pass
\ No newline at end of file
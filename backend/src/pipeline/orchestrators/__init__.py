@@ -1,12 +1,25 @@
 """Pipeline orchestrators."""
 
-from .analysis_pipeline import AnalysisPipeline, AnalysisRequest, AnalysisResult
+from .analysis_pipeline import (
+    AnalysisPipeline,
+    AnalysisRequest,
+    AnalysisResult,
+    TranscriptionPending,
+)
 from .section_processor import SectionProcessor, SectionProcessingResult
+from .job_context import JobContext
+from .stage_checkpoints import StageCheckpoints
+from .stage_graph import Stage, StageGraph
 
 __all__ = [
     "AnalysisPipeline",
     "AnalysisRequest", 
     "AnalysisResult",
+    "TranscriptionPending",
     "SectionProcessor",
     "SectionProcessingResult",
+    "JobContext",
+    "StageCheckpoints",
+    "Stage",
+    "StageGraph",
 ]
\ No newline at end of file
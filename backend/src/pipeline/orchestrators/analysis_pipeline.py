@@ -2,9 +2,12 @@
 Main analysis pipeline orchestrator.
 """
 
+import asyncio
+import os
 import time
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlencode
 from dataclasses import dataclass
 from langchain_core.runnables import RunnableConfig
 from langchain_core.prompts import ChatPromptTemplate
@@ -23,7 +26,26 @@ from ..interfaces import (
 )
 from ..services.enrichment import ClaimProcessor, ContextualBriefingGenerator
 from ..config import get_persona_config, is_valid_persona
+from ..utils import (
+    AsyncDBManager,
+    CPUExecutor,
+    JobLogBuffer,
+    current_trace_id,
+    job_retry_budget,
+    set_retry_budget,
+    reset_retry_budget,
+    start_span,
+)
 from .section_processor import SectionProcessor
+from .job_context import JobContext
+from .stage_graph import Stage, StageGraph
+from .stage_checkpoints import (
+    StageCheckpoints,
+    sections_from_checkpoint,
+    sections_to_checkpoint,
+    utterances_from_checkpoint,
+    utterances_to_checkpoint,
+)
 
 
 def split_large_utterance(text: str, start_seconds: float, duration: float, speaker: str = None, max_chars: int = 500, min_duration: float = 1.0) -> List[Dict[str, Any]]:
@@ -199,6 +221,47 @@ def convert_structured_to_simple_transcript(structured_transcript: List[Dict[str
     return simple_transcript
 
 
+class TranscriptionPending(Exception):
+    """
+    Raised once an audio job has been handed to AssemblyAI in webhook mode.
+    The job is resumed by its webhook (or the fallback task) instead.
+    """
+
+
+def _transcription_webhook_settings() -> Tuple[Optional[str], Optional[str]]:
+    """(worker URL, webhook secret) when webhook completion is enabled, else (None, None)."""
+    try:
+        from ...config import settings
+        mode = settings.ASSEMBLYAI_COMPLETION_MODE
+        worker_url = settings.WORKER_SERVICE_URL
+        secret = settings.ASSEMBLYAI_WEBHOOK_SECRET
+    except (ImportError, AttributeError):
+        mode = os.getenv("ASSEMBLYAI_COMPLETION_MODE", "poll")
+        worker_url = os.getenv("WORKER_SERVICE_URL")
+        secret = os.getenv("ASSEMBLYAI_WEBHOOK_SECRET")
+    if mode != "webhook" or not worker_url or not secret:
+        return None, None
+    return worker_url, secret
+
+
+def _get_resume_stale_seconds() -> float:
+    try:
+        from ...config import settings
+        return float(settings.JOB_RESUME_STALE_SECONDS)
+    except (ImportError, AttributeError):
+        return float(os.getenv("JOB_RESUME_STALE_SECONDS", "1800"))
+
+
+def _get_heartbeat_seconds() -> float:
+    """Seconds between touches of a running job, well inside the stale window."""
+    try:
+        from ...config import settings
+        heartbeat = float(settings.JOB_HEARTBEAT_SECONDS)
+    except (ImportError, AttributeError):
+        heartbeat = float(os.getenv("JOB_HEARTBEAT_SECONDS", "300"))
+    return min(heartbeat, _get_resume_stale_seconds() / 3)
+
+
 @dataclass
 class AnalysisRequest:
     """Request for pipeline analysis."""
@@ -211,6 +274,7 @@ class AnalysisRequest:
     raw_transcript: Optional[str] = None
     config: Optional[Dict[str, Any]] = None
     model_choice: str = "universal"
+    audio_duration_seconds: Optional[float] = None
 
     def __post_init__(self):
         if self.config is None:
@@ -247,6 +311,7 @@ class AnalysisPipeline:
         briefing_generator: ContextualBriefingGenerator,
         db_manager,
         token_tracker,
+        cpu_executor: Optional[CPUExecutor] = None,
     ):
         self.transcript_normalizer = transcript_normalizer
         self.youtube_normalizer = youtube_normalizer
@@ -258,12 +323,39 @@ class AnalysisPipeline:
         self.claim_processor = claim_processor
         self.briefing_generator = briefing_generator
         self.db_manager = db_manager
+        self.async_db = AsyncDBManager.wrap(db_manager)
         self.token_tracker = token_tracker
+        self.cpu_executor = cpu_executor or CPUExecutor(mode="inline")
+        self.progress_log: Optional[JobLogBuffer] = None
+        self.job_context: Optional[JobContext] = None
+        self.checkpoints: Optional[StageCheckpoints] = None
         self._cached_youtube_metadata = {}
 
-    async def run_analysis(self, request: AnalysisRequest) -> AnalysisResult:
+    async def _log_progress(self, user_id: str, job_id: str, message: str):
+        """Log a progress message, through the job's log buffer when one is active."""
+        if self.progress_log is not None and self.progress_log.job_id == job_id:
+            await self.progress_log.log(message)
+        else:
+            await self.async_db.log_progress(user_id, job_id, message)
+
+    async def _run_cpu_bound(self, timing_metrics: Dict[str, float], func, *args, **kwargs):
+        """Run CPU-heavy work on the CPU executor and record the time spent in it."""
+        started = time.monotonic()
+        try:
+            return await self.cpu_executor.run(func, *args, **kwargs)
+        finally:
+            timing_metrics["cpu_work_s"] = (
+                timing_metrics.get("cpu_work_s", 0.0) + time.monotonic() - started
+            )
+
+    async def run_analysis(
+        self, request: AnalysisRequest, job_context: Optional[JobContext] = None
+    ) -> AnalysisResult:
         """
         Execute the complete analysis pipeline.
+
+        job_context may carry the job document the caller already read; the
+        pipeline otherwise loads it once and serves every later read from it.
         """
         total_start_time = time.monotonic()
         timing_metrics = {}
@@ -285,21 +377,51 @@ class AnalysisPipeline:
             )
         )
 
-        self.db_manager.log_progress(
+        self.job_context = job_context or JobContext(
+            self.async_db, request.user_id, request.job_id
+        )
+        self.checkpoints = StageCheckpoints(self.async_db, request.user_id, request.job_id)
+
+        # Progress messages are batched per job and flushed when the job ends
+        self.progress_log = JobLogBuffer(self.async_db, request.user_id, request.job_id)
+
+        # Every retry made for this job, in any task it starts, draws on one budget
+        retry_budget = job_retry_budget()
+        retry_budget_token = set_retry_budget(retry_budget)
+        self.section_processor.set_progress_log(self.progress_log)
+
+        await self._log_progress(
             request.user_id,
             request.job_id,
             f"Analysis initiated with '{request.persona}' persona...",
         )
 
+        heartbeat = None
         try:
             # Step 1: Verify job status and setup
-            job_doc = self.db_manager.get_job_status(request.user_id, request.job_id)
+            job_doc = await self.job_context.load()
             if not job_doc:
                 raise ValueError(
                     f"Job {request.job_id} not found for user {request.user_id}"
                 )
 
-            if job_doc.get("status") != "QUEUED":
+            # A job waiting on AssemblyAI is resumed by whichever of its
+            # webhook task or fallback task claims it first
+            resuming = False
+            if job_doc.get("status") == "PROCESSING" and job_doc.get("awaiting_transcription"):
+                resuming = await self.async_db.claim_awaiting_transcription(
+                    request.user_id, request.job_id
+                )
+                if resuming:
+                    self.job_context.apply_local({"awaiting_transcription": False})
+                    print("[cyan]Resuming job after AssemblyAI transcription.[/cyan]")
+            elif job_doc.get("status") == "PROCESSING":
+                # A redelivered task for a job whose worker died takes it over
+                resuming = await self.async_db.claim_stale_job(
+                    request.user_id, request.job_id, _get_resume_stale_seconds()
+                )
+
+            if job_doc.get("status") != "QUEUED" and not resuming:
                 print(
                     f"[bold yellow]Job has status '{job_doc.get('status')}'. Skipping.[/bold yellow]"
                 )
@@ -313,31 +435,54 @@ class AnalysisPipeline:
                     synthesis_results={},
                 )
 
-            self.db_manager.update_job_status(
-                request.user_id,
-                request.job_id,
+            if resuming:
+                completed_stages = await self.checkpoints.load()
+                if completed_stages:
+                    await self._log_progress(
+                        request.user_id,
+                        request.job_id,
+                        f"Resuming analysis after stage '{completed_stages[-1]}'...",
+                    )
+
+            await self.job_context.update_status(
                 "PROCESSING",
                 "Step 2/7: Preparing transcript...",
             )
+            await self.job_context.flush()
+            heartbeat = asyncio.create_task(self._heartbeat(_get_heartbeat_seconds()))
 
             # Step 2: Input acquisition and normalization
-            canonical_transcript, assembly_words = await self._process_input(
-                request, final_cost_metrics, timing_metrics, total_start_time
-            )
-
-            if not canonical_transcript:
-                raise ValueError("Failed to produce a usable transcript")
+            checkpoint = self.checkpoints.get("sections")
+            if checkpoint is not None:
+                self._restore_input_details(checkpoint, final_cost_metrics)
+                sections = sections_from_checkpoint(checkpoint["sections"])
+            else:
+                with start_span("stage.transcript"):
+                    canonical_transcript, assembly_words = await self._acquire_transcript(
+                        request, final_cost_metrics, timing_metrics, total_start_time
+                    )
 
-            # Step 3: Segmentation
-            sections = await self._segment_transcript(
-                canonical_transcript, request, timing_metrics, assembly_words=assembly_words
-            )
+                # Step 3: Segmentation
+                with start_span("stage.segmentation"):
+                    sections = await self._segment_transcript(
+                        canonical_transcript, request, timing_metrics, assembly_words=assembly_words
+                    )
+                # Carries the input details too, so it does not depend on the
+                # transcript checkpoint (which may be too large to store)
+                await self.checkpoints.save(
+                    "sections",
+                    {
+                        "sections": sections_to_checkpoint(sections),
+                        **self._input_details(final_cost_metrics),
+                    },
+                )
 
             # Step 4: Section analysis
             runnable_config = RunnableConfig(callbacks=[self.token_tracker])
-            section_results = await self._analyze_sections(
-                sections, request, runnable_config, final_cost_metrics
-            )
+            with start_span("stage.sections", sections=len(sections)):
+                section_results = await self._analyze_sections(
+                    sections, request, runnable_config, final_cost_metrics
+                )
 
             all_section_analyses = [
                 result.full_analysis
@@ -345,43 +490,21 @@ class AnalysisPipeline:
                 if result.full_analysis
             ]
 
-            # Step 5: Meta-analysis
-            pass_2_data = await self._perform_meta_analysis(
-                all_section_analyses, request, runnable_config, timing_metrics
-            )
-
-            # Step 7: Generate final title and update with metadata
-            final_title = await self.title_generator.generate_title(
-                pass_2_data, runnable_config
-            )
-            
-            # Update job with title and metadata (including YouTube metadata if available)
-            if self._cached_youtube_metadata and any(self._cached_youtube_metadata.values()):
-                # Ensure analysis_persona is set
-                self._cached_youtube_metadata['analysis_persona'] = request.persona
-                self.db_manager.update_job_with_metadata(
-                    request.user_id, request.job_id, final_title, self._cached_youtube_metadata
-                )
-            else:
-                self.db_manager.update_job_title(request.user_id, request.job_id, final_title)
-
-            # Step 8: Generate content assets
-            await self._generate_content_assets(
-                all_section_analyses,
-                pass_2_data,
+            # Steps 5-7: meta-analysis, title, content assets, library
+            # metadata and finalization, each as soon as its inputs are ready
+            stages = self._post_section_stages(
                 request,
                 runnable_config,
-                timing_metrics,
-            )
-
-            # Step 9: Finalize metrics and complete job
-            await self._finalize_job(
-                request,
                 final_cost_metrics,
                 timing_metrics,
                 len(sections),
                 total_start_time,
             )
+            outputs = await stages.run(
+                {"section_analyses": all_section_analyses}, timing_metrics
+            )
+            pass_2_data = outputs["synthesis"]
+            final_title = outputs["title"]
 
             return AnalysisResult(
                 job_id=request.job_id,
@@ -393,10 +516,223 @@ class AnalysisPipeline:
                 synthesis_results=pass_2_data,
             )
 
+        except TranscriptionPending:
+            print("[cyan]Transcription submitted; the job resumes when AssemblyAI calls back.[/cyan]")
+            return AnalysisResult(
+                job_id=request.job_id,
+                status="awaiting_transcription",
+                final_title="",
+                sections_processed=0,
+                cost_metrics=final_cost_metrics,
+                timing_metrics=timing_metrics,
+                synthesis_results={},
+            )
+
         except Exception as e:
             return await self._handle_pipeline_error(
                 e, request, final_cost_metrics, timing_metrics
             )
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            try:
+                await self.job_context.flush(wait=True)
+            except Exception as e:
+                print(f"[yellow]Warning: Could not write pending job updates: {e}[/yellow]")
+            if self.checkpoints is not None:
+                await self.checkpoints.wait_saved()
+            print(
+                f"INFO: Job document: {self.job_context.updates_staged} updates "
+                f"in {self.job_context.writes} writes, {self.job_context.reads} reads"
+            )
+            print(f"INFO: Retries used: {retry_budget.used}/{retry_budget.max_retries}")
+            reset_retry_budget(retry_budget_token)
+            await self.progress_log.close()
+
+    async def _heartbeat(self, interval: float):
+        """
+        Touch the job document every interval seconds while the job runs,
+        so claim_stale_job does not take a job over during a long stage
+        such as transcription polling or section analysis.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.job_context.touch()
+            except Exception as e:
+                print(f"[yellow]Warning: Job heartbeat failed: {e}[/yellow]")
+
+    def _post_section_stages(
+        self,
+        request: AnalysisRequest,
+        runnable_config: RunnableConfig,
+        cost_metrics: Dict[str, int],
+        timing_metrics: Dict[str, float],
+        sections_count: int,
+        start_time: float,
+    ) -> StageGraph:
+        """
+        The stages after section analysis and what each one needs. Library
+        metadata only needs the section analyses, so it runs alongside
+        meta-analysis and title generation. Finalization waits for every
+        other stage, so the usage record counts all LLM calls.
+        """
+
+        async def synthesis(section_analyses):
+            return await self._synthesis_stage(
+                section_analyses, request, runnable_config, timing_metrics
+            )
+
+        async def title(synthesis):
+            return await self._title_stage(synthesis, request, runnable_config)
+
+        async def content_assets(section_analyses, synthesis):
+            await self._generate_content_assets(
+                section_analyses, synthesis, request, runnable_config, timing_metrics
+            )
+
+        async def library_metadata(section_analyses):
+            return await self._library_metadata_stage(
+                section_analyses, request, runnable_config, timing_metrics
+            )
+
+        async def finalize(title, content_assets, library_metadata):
+            await self._finalize_job(
+                request, cost_metrics, timing_metrics, sections_count, start_time
+            )
+
+        return StageGraph(
+            [
+                Stage("synthesis", synthesis, inputs=("section_analyses",)),
+                Stage("title", title, inputs=("synthesis",)),
+                Stage("content_assets", content_assets, inputs=("section_analyses", "synthesis")),
+                Stage("library_metadata", library_metadata, inputs=("section_analyses",)),
+                Stage("finalize", finalize, inputs=("title", "content_assets", "library_metadata")),
+            ]
+        )
+
+    async def _synthesis_stage(
+        self,
+        all_sections: List[SectionAnalysis],
+        request: AnalysisRequest,
+        runnable_config: RunnableConfig,
+        timing_metrics: Dict[str, float],
+    ) -> Dict[str, Any]:
+        """Meta-analysis, unless a previous run of the job completed it."""
+        pass_2_data = self.checkpoints.get("synthesis")
+        if pass_2_data is None:
+            pass_2_data = await self._perform_meta_analysis(
+                all_sections, request, runnable_config, timing_metrics
+            )
+            # The job fields written by meta-analysis must be stored
+            # before the stage counts as done
+            self.checkpoints.save_after(
+                "synthesis", pass_2_data, self.job_context.flush(wait=True)
+            )
+        return pass_2_data
+
+    async def _title_stage(
+        self,
+        pass_2_data: Dict[str, Any],
+        request: AnalysisRequest,
+        runnable_config: RunnableConfig,
+    ) -> str:
+        """Generate the final title and update the job with it and its metadata."""
+        final_title = self.checkpoints.get("title")
+        if final_title is not None:
+            return final_title
+
+        final_title = await self.title_generator.generate_title(
+            pass_2_data, runnable_config
+        )
+
+        # Update job with title and metadata (including YouTube metadata if available)
+        if self._cached_youtube_metadata and any(self._cached_youtube_metadata.values()):
+            # Ensure analysis_persona is set
+            self._cached_youtube_metadata['analysis_persona'] = request.persona
+            await self.job_context.update_title(final_title, self._cached_youtube_metadata)
+        else:
+            await self.job_context.update_title(final_title)
+        self.checkpoints.save_after("title", final_title, self.job_context.flush(wait=True))
+        return final_title
+
+    async def _library_metadata_stage(
+        self,
+        section_analyses: List[SectionAnalysis],
+        request: AnalysisRequest,
+        runnable_config: RunnableConfig,
+        timing_metrics: Dict[str, float],
+    ) -> Dict[str, Any]:
+        """Generate library metadata suggestions and stage them on the job."""
+        try:
+            library_metadata = await self._generate_library_metadata(
+                request, runnable_config, timing_metrics, section_analyses
+            )
+
+            if library_metadata:
+                # Save library metadata suggestions to the job document
+                await self.job_context.update_fields({
+                    "libraryDescriptionSuggestion": library_metadata.get("description", ""),
+                    "libraryTagsSuggestion": library_metadata.get("tags", [])
+                })
+                print(f"[green]Saved library metadata suggestions to job document[/green]")
+            return library_metadata
+        except Exception as e:
+            print(f"[yellow]Warning: Could not generate library metadata: {e}[/yellow]")
+            return {}
+
+    async def _acquire_transcript(
+        self,
+        request: AnalysisRequest,
+        cost_metrics: Dict[str, int],
+        timing_metrics: Dict[str, float],
+        start_time: float,
+    ) -> tuple[List[TranscriptUtterance], Optional[List[Dict[str, Any]]]]:
+        """
+        The normalized transcript, from the job's checkpoint when a previous
+        run produced it, otherwise from _process_input.
+        """
+        checkpoint = self.checkpoints.get("transcript")
+        if checkpoint is not None:
+            self._restore_input_details(checkpoint, cost_metrics)
+            return (
+                utterances_from_checkpoint(checkpoint["utterances"]),
+                checkpoint.get("assembly_words"),
+            )
+
+        canonical_transcript, assembly_words = await self._process_input(
+            request, cost_metrics, timing_metrics, start_time
+        )
+        # Saves the transcript together with the latest step status
+        await self.job_context.flush()
+
+        if not canonical_transcript:
+            raise ValueError("Failed to produce a usable transcript")
+
+        self.checkpoints.save_after(
+            "transcript",
+            {
+                "utterances": utterances_to_checkpoint(canonical_transcript),
+                "assembly_words": assembly_words,
+                **self._input_details(cost_metrics),
+            },
+            self.job_context.flush(wait=True),
+        )
+        return canonical_transcript, assembly_words
+
+    def _input_details(self, cost_metrics: Dict[str, int]) -> Dict[str, Any]:
+        """What input processing recorded besides the transcript, for checkpoints."""
+        return {
+            "cost_metrics": {
+                "assemblyai_audio_seconds": cost_metrics.get("assemblyai_audio_seconds", 0)
+            },
+            "youtube_metadata": self._cached_youtube_metadata,
+        }
+
+    def _restore_input_details(self, checkpoint: Dict[str, Any], cost_metrics: Dict[str, int]):
+        """Bring back what input processing recorded besides the transcript."""
+        cost_metrics.update(checkpoint.get("cost_metrics", {}))
+        self._cached_youtube_metadata = checkpoint.get("youtube_metadata", {})
 
     async def _process_input(
         self,
@@ -413,11 +749,11 @@ class AnalysisPipeline:
         if request.transcript_id:
             # YouTube transcript processing
             print(f"INFO: Processing YouTube transcript (ID: {request.transcript_id})")
-            self.db_manager.log_progress(
+            await self._log_progress(
                 request.user_id, request.job_id, "Fetching cached YouTube transcript..."
             )
 
-            cached_data = self.db_manager.get_cached_transcript(request.transcript_id)
+            cached_data = await self.async_db.get_cached_transcript(request.transcript_id)
             if not cached_data:
                 raise ValueError(
                     f"Cached transcript for ID {request.transcript_id} not found"
@@ -436,9 +772,7 @@ class AnalysisPipeline:
             
             # Save the original YouTube transcript to the job
             if request.transcript_id or request.storage_path:
-                self.db_manager.update_job_status(
-                    request.user_id,
-                    request.job_id,
+                await self.job_context.update_status(
                     "PROCESSING",
                     "Step 2/7: Preparing transcript...",
                     transcript=raw_youtube_transcript
@@ -455,16 +789,16 @@ class AnalysisPipeline:
 
         elif request.storage_path:
             # Audio file processing
-            self.db_manager.update_job_status(
-                request.user_id,
-                request.job_id,
+            await self.job_context.update_status(
                 "PROCESSING",
                 "Step 2/7: Transcribing audio file...",
             )
+            await self.job_context.flush()
 
-            transcription_result = await self.audio_processor.transcribe(
-                request.storage_path, request.model_choice
-            )
+            transcription_result = await self._transcribe_audio(request)
+            poll_metrics = getattr(self.audio_processor, "last_poll_metrics", None)
+            if isinstance(poll_metrics, dict):
+                timing_metrics.update(poll_metrics)
 
             if transcription_result:
                 audio_duration = transcription_result.get("audio_duration", 0)
@@ -473,12 +807,12 @@ class AnalysisPipeline:
 
             # Convert AssemblyAI utterances to simple transcript format
             utterances = transcription_result.get("utterances", [])
-            simple_transcript = convert_structured_to_simple_transcript(utterances)
+            simple_transcript = await self._run_cpu_bound(
+                timing_metrics, convert_structured_to_simple_transcript, utterances
+            )
 
             # Save the converted transcript in simple format
-            self.db_manager.update_job_status(
-                request.user_id,
-                request.job_id,
+            await self.job_context.update_status(
                 "PROCESSING",
                 "Step 2/7: Transcribing audio file...",
                 transcript=simple_transcript
@@ -503,9 +837,7 @@ class AnalysisPipeline:
 
         else:
             # Text input processing
-            self.db_manager.update_job_status(
-                request.user_id,
-                request.job_id,
+            await self.job_context.update_status(
                 "PROCESSING",
                 "Step 2/7: Processing text input...",
             )
@@ -527,9 +859,7 @@ class AnalysisPipeline:
                 raise ValueError("Empty transcript list provided")
 
             # Save the original text transcript to the job at root level for consistency
-            self.db_manager.update_job_status(
-                request.user_id,
-                request.job_id,
+            await self.job_context.update_status(
                 "PROCESSING",
                 "Step 2/7: Processing text input...",
                 transcript=request.raw_transcript
@@ -576,6 +906,60 @@ class AnalysisPipeline:
 
             return await self.transcript_normalizer.normalize(corrected_text), None
 
+    async def _transcribe_audio(self, request: AnalysisRequest) -> Dict[str, Any]:
+        """
+        Transcribe the job's audio. The AssemblyAI transcript ID is stored on
+        the job once submitted, and a resumed job collects that transcript.
+        In webhook mode TranscriptionPending is raised after submitting; in
+        poll mode this waits for the transcript.
+        """
+        transcript_id = self.job_context.get("assemblyai_transcript_id")
+        if transcript_id:
+            print(f"INFO: Collecting AssemblyAI transcript {transcript_id}")
+            return await self.audio_processor.wait_for_transcript(
+                transcript_id,
+                request.storage_path,
+                request.model_choice,
+                initial_delay=0,
+                audio_duration=request.audio_duration_seconds,
+            )
+
+        if not hasattr(self.audio_processor, "submit"):
+            return await self.audio_processor.transcribe(
+                request.storage_path,
+                request.model_choice,
+                audio_duration=request.audio_duration_seconds,
+            )
+
+        worker_url, secret = _transcription_webhook_settings()
+        webhook = {}
+        if worker_url:
+            query = urlencode({"user_id": request.user_id, "job_id": request.job_id})
+            webhook = {
+                "webhook_url": f"{worker_url}/api/tasks/assemblyai-webhook?{query}",
+                "webhook_secret": secret,
+            }
+        transcript_id = await self.audio_processor.submit(
+            request.storage_path, request.model_choice, **webhook
+        )
+        # Stored before waiting, so a resumed job collects this transcript
+        # instead of paying for another one
+        fields = {"assemblyai_transcript_id": transcript_id}
+        if worker_url:
+            # The resumed job continues this trace
+            fields.update({"awaiting_transcription": True, "trace_id": current_trace_id()})
+        await self.job_context.update_fields(fields)
+        await self.job_context.flush(wait=True)
+        if worker_url:
+            raise TranscriptionPending(transcript_id)
+
+        return await self.audio_processor.wait_for_transcript(
+            transcript_id,
+            request.storage_path,
+            request.model_choice,
+            audio_duration=request.audio_duration_seconds,
+        )
+
     async def _segment_transcript(
         self,
         transcript: List[TranscriptUtterance],
@@ -586,15 +970,20 @@ class AnalysisPipeline:
         """Segment the normalized transcript."""
         start_time = time.monotonic()
 
-        self.db_manager.log_progress(
+        await self._log_progress(
             request.user_id, request.job_id, "Step 4/7: Segmenting transcript..."
         )
 
         # Determine segmentation strategy
-        sections = self.segmenter.segment(transcript, assembly_words=assembly_words)
+        sections = await self._run_cpu_bound(
+            timing_metrics,
+            self.segmenter.segment,
+            transcript,
+            assembly_words=assembly_words,
+        )
 
         timing_metrics["segmentation_s"] = time.monotonic() - start_time
-        self.db_manager.log_progress(
+        await self._log_progress(
             request.user_id,
             request.job_id,
             f"✓ Transcript segmented into {len(sections)} sections.",
@@ -612,9 +1001,10 @@ class AnalysisPipeline:
         """Analyze all sections in parallel."""
         log_msg = f"Step 5/7: Analyzing {len(sections)} sections in parallel..."
         print(f"[magenta]\n{log_msg}[/magenta]")
-        self.db_manager.update_job_status(
-            request.user_id, request.job_id, "PROCESSING", log_msg
+        await self.job_context.update_status(
+            "PROCESSING", log_msg
         )
+        await self.job_context.flush()
 
         start_time = time.monotonic()
 
@@ -622,7 +1012,7 @@ class AnalysisPipeline:
         if hasattr(self.section_processor, 'persona') and self.section_processor.persona in ["deep_dive", "podcaster"]:
             try:
                 # Get the job document to retrieve transcript data and source type
-                job_doc = self.db_manager.get_job_status(request.user_id, request.job_id)
+                job_doc = await self.job_context.load()
                 source_type = job_doc.get("request_data", {}).get("source_type", "unknown")
                 
                 print(f"[blue]Setting structured transcript for timestamp extraction (source_type: {source_type})...[/blue]")
@@ -638,7 +1028,9 @@ class AnalysisPipeline:
                 
                 if structured_transcript and isinstance(structured_transcript, list):
                     print(f"[blue]Setting structured transcript from '{transcript_source}' field ({len(structured_transcript)} entries)[/blue]")
-                    self.section_processor.set_structured_transcript(structured_transcript)
+                    self.section_processor.set_structured_transcript(
+                        structured_transcript, transcript_key=request.job_id
+                    )
                 else:
                     print(f"[yellow]No structured transcript found for {source_type} source[/yellow]")
                 
@@ -681,7 +1073,7 @@ class AnalysisPipeline:
         # Fetch original transcript for timestamp matching
         original_transcript = None
         try:
-            job_doc = self.db_manager.get_job_status(request.user_id, request.job_id)
+            job_doc = await self.job_context.load()
             if job_doc:
                 # Try multiple locations for transcript data
                 # 1. First try request_data (for some job types)
@@ -715,21 +1107,21 @@ class AnalysisPipeline:
                 
                 if not synthesis_results:
                     print("[bold yellow]Warning: Empty synthesis results for consultant persona[/bold yellow]")
-                    self.db_manager.log_progress(
+                    await self._log_progress(
                         request.user_id, request.job_id, 
                         "Warning: Empty synthesis results from meta-analyzer"
                     )
 
-                self.db_manager.db.collection(
-                    f"saas_users/{request.user_id}/jobs"
-                ).document(request.job_id).update({"synthesis_results": synthesis_results})
+                await self.job_context.update_fields(
+                    {"synthesis_results": synthesis_results}
+                )
                 
                 print(f"[green]✓ Saved consultant synthesis results with {len(synthesis_results)} keys[/green]")
                 timing_metrics["synthesis_pass_s"] = time.monotonic() - start_time
                 return synthesis_results
             except Exception as e:
                 print(f"[bold red]Error in consultant synthesis: {e}[/bold red]")
-                self.db_manager.log_progress(
+                await self._log_progress(
                     request.user_id, request.job_id, 
                     f"Error in consultant synthesis: {e}"
                 )
@@ -745,7 +1137,7 @@ class AnalysisPipeline:
                 
                 if not deep_dive_synthesis:
                     print("[bold yellow]Warning: Empty synthesis results for deep_dive persona[/bold yellow]")
-                    self.db_manager.log_progress(
+                    await self._log_progress(
                         request.user_id, request.job_id, 
                         "Warning: Empty synthesis results from deep dive analyzer"
                     )
@@ -770,9 +1162,7 @@ class AnalysisPipeline:
                     "generation_method": generation_method
                 }
 
-                self.db_manager.db.collection(
-                    f"saas_users/{request.user_id}/jobs"
-                ).document(request.job_id).update(
+                await self.job_context.update_fields(
                     {"generated_quiz_questions": quiz_data}
                 )
                 
@@ -781,7 +1171,7 @@ class AnalysisPipeline:
                 return deep_dive_synthesis
             except Exception as e:
                 print(f"[bold red]Error in deep dive synthesis: {e}[/bold red]")
-                self.db_manager.log_progress(
+                await self._log_progress(
                     request.user_id, request.job_id, 
                     f"Error in deep dive synthesis: {e}"
                 )
@@ -796,21 +1186,21 @@ class AnalysisPipeline:
 
                 if not show_notes_results or show_notes_results.get("error"):
                     print("[bold yellow]Warning: Empty or error in show notes results for podcaster persona[/bold yellow]")
-                    self.db_manager.log_progress(
+                    await self._log_progress(
                         request.user_id, request.job_id,
                         "Warning: Show notes generation had issues"
                     )
 
-                self.db_manager.db.collection(
-                    f"saas_users/{request.user_id}/jobs"
-                ).document(request.job_id).update({"show_notes": show_notes_results})
+                await self.job_context.update_fields(
+                    {"show_notes": show_notes_results}
+                )
 
                 print(f"[green]✓ Saved podcaster show notes with {len(show_notes_results.get('chapters', []))} chapters[/green]")
                 timing_metrics["show_notes_generation_s"] = time.monotonic() - start_time
                 return show_notes_results
             except Exception as e:
                 print(f"[bold red]Error in podcaster show notes generation: {e}[/bold red]")
-                self.db_manager.log_progress(
+                await self._log_progress(
                     request.user_id, request.job_id,
                     f"Error in podcaster show notes generation: {e}"
                 )
@@ -824,21 +1214,21 @@ class AnalysisPipeline:
 
                 if not argument_results:
                     print("[bold yellow]Warning: Empty argument structure results for general persona[/bold yellow]")
-                    self.db_manager.log_progress(
+                    await self._log_progress(
                         request.user_id, request.job_id,
                         "Warning: Empty argument structure results"
                     )
 
-                self.db_manager.db.collection(
-                    f"saas_users/{request.user_id}/jobs"
-                ).document(request.job_id).update({"argument_structure": argument_results})
+                await self.job_context.update_fields(
+                    {"argument_structure": argument_results}
+                )
 
                 print(f"[green]✓ Saved general persona argument structure with {len(argument_results)} keys[/green]")
                 timing_metrics["argument_analysis_s"] = time.monotonic() - start_time
                 return argument_results
             except Exception as e:
                 print(f"[bold red]Error in general persona argument analysis: {e}[/bold red]")
-                self.db_manager.log_progress(
+                await self._log_progress(
                     request.user_id, request.job_id,
                     f"Error in general persona argument analysis: {e}"
                 )
@@ -858,7 +1248,7 @@ class AnalysisPipeline:
         """Generate global contextual briefing."""
         log_msg = "Step 5b: Generating Global Contextual Briefing..."
         print(f"[magenta]\n{log_msg}[/magenta]")
-        self.db_manager.log_progress(request.user_id, request.job_id, log_msg)
+        await self._log_progress(request.user_id, request.job_id, log_msg)
 
         start_time = time.monotonic()
 
@@ -881,8 +1271,8 @@ class AnalysisPipeline:
         """Generate final content assets."""
         log_msg = "Step 6/7: Generating final content assets..."
         print(f"[magenta]\n{log_msg}[/magenta]")
-        self.db_manager.update_job_status(
-            request.user_id, request.job_id, "PROCESSING", log_msg
+        await self.job_context.update_status(
+            "PROCESSING", log_msg
         )
 
         start_time = time.monotonic()
@@ -891,11 +1281,41 @@ class AnalysisPipeline:
 
         timing_metrics["content_generation_s"] = time.monotonic() - start_time
 
+    async def _library_section_results(
+        self,
+        request: AnalysisRequest,
+        section_analyses: Optional[List[SectionAnalysis]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Section summaries and takeaways for library metadata, taken from the
+        analyses the pipeline holds. The job's results subcollection is only
+        read when no analyses were passed in.
+        """
+        if section_analyses:
+            return [
+                {
+                    "1_sentence_summary": analysis.summary,
+                    "actionable_takeaways": analysis.additional_data.get(
+                        "actionable_takeaways", []
+                    ),
+                }
+                for analysis in section_analyses
+            ]
+
+        try:
+            return await self.async_db.list_section_results(
+                request.user_id, request.job_id
+            )
+        except Exception as e:
+            print(f"[yellow]Could not retrieve section results: {e}[/yellow]")
+            return []
+
     async def _generate_library_metadata(
         self,
         request: AnalysisRequest,
         runnable_config: RunnableConfig,
         timing_metrics: Dict[str, float],
+        section_analyses: Optional[List[SectionAnalysis]] = None,
     ) -> Dict[str, Any]:
         """
         Generate suggested description and tags for library sharing.
@@ -910,29 +1330,24 @@ class AnalysisPipeline:
             print("[cyan]Generating library metadata suggestions...[/cyan]")
 
             # Get job data to extract section results and metadata
-            job_doc = self.db_manager.get_job_status(request.user_id, request.job_id)
+            job_doc = await self.job_context.load()
             if not job_doc:
                 print("[yellow]Could not retrieve job data for library metadata generation[/yellow]")
                 return {}
 
-            # Extract section results from subcollections
-            try:
-                results_collection = self.db_manager.db.collection(
-                    f"saas_users/{request.user_id}/jobs/{request.job_id}/results"
-                )
-                results_docs = results_collection.get()
-                section_results = [doc.to_dict() for doc in results_docs]
-            except Exception as e:
-                print(f"[yellow]Could not retrieve section results: {e}[/yellow]")
-                section_results = []
+            section_results = await self._library_section_results(
+                request, section_analyses
+            )
 
             # Extract key information for metadata generation
-            job_title = job_doc.get("job_title", "")
             youtube_metadata = {
                 "youtube_title": job_doc.get("request_data", {}).get("youtube_video_title", ""),
                 "youtube_channel": job_doc.get("request_data", {}).get("youtube_channel_name", ""),
                 "source_type": job_doc.get("request_data", {}).get("source_type", "unknown")
             }
+            # This runs alongside title generation, so the source title
+            # stands in for the generated one
+            job_title = youtube_metadata["youtube_title"]
 
             # Collect section summaries and takeaways
             section_summaries = []
@@ -1027,9 +1442,11 @@ Guidelines:
         """Finalize job with metrics and status updates."""
         log_msg = "Step 7/7: Finalizing results and logging analytics..."
         print(f"[magenta]\n{log_msg}[/magenta]")
-        self.db_manager.update_job_status(
-            request.user_id, request.job_id, "PROCESSING", log_msg
+        await self.job_context.update_status(
+            "PROCESSING", log_msg
         )
+        # One write for synthesis results, title and the step 6/7 statuses
+        await self.job_context.flush()
 
         finalization_start = time.monotonic()
         timing_metrics["finalization_s"] = time.monotonic() - finalization_start
@@ -1062,7 +1479,7 @@ Guidelines:
             "internalCostUSD": round(internal_cost_usd, 6),
             "totalCompletionSeconds": round(timing_metrics["total_job_s"], 2),
             "timingBreakdownSeconds": {
-                key.replace("_s", ""): round(value, 2)
+                key.removesuffix("_s"): round(value, 2)
                 for key, value in timing_metrics.items()
                 if key != "total_job_s"
             },
@@ -1072,37 +1489,17 @@ Guidelines:
             },
         }
 
-        self.db_manager.create_usage_record(
+        await self.async_db.create_usage_record(
             request.user_id, request.job_id, usage_record
         )
 
-        # Generate library metadata suggestions for deep_dive persona
-        try:
-            runnable_config = RunnableConfig(callbacks=[self.token_tracker])
-            library_metadata = await self._generate_library_metadata(
-                request, runnable_config, timing_metrics
-            )
-
-            if library_metadata:
-                # Save library metadata suggestions to the job document
-                self.db_manager.db.collection(
-                    f"saas_users/{request.user_id}/jobs"
-                ).document(request.job_id).update({
-                    "libraryDescriptionSuggestion": library_metadata.get("description", ""),
-                    "libraryTagsSuggestion": library_metadata.get("tags", [])
-                })
-                print(f"[green]Saved library metadata suggestions to job document[/green]")
-        except Exception as e:
-            print(f"[yellow]Warning: Could not generate library metadata: {e}[/yellow]")
-
         # Update final status
-        self.db_manager.update_job_status(
-            request.user_id,
-            request.job_id,
+        await self.job_context.update_status(
             "COMPLETED",
             f"Analysis of {sections_count} sections complete.",
         )
-        self.db_manager.log_progress(
+        await self.checkpoints.clear()
+        await self._log_progress(
             request.user_id, request.job_id, "✅ Analysis Complete."
         )
 
@@ -1131,21 +1528,23 @@ Guidelines:
             )
         )
 
-        self.db_manager.update_job_status(
-            request.user_id, request.job_id, "FAILED", error_message
+        await self.job_context.update_status(
+            "FAILED", error_message
         )
-        self.db_manager.log_progress(
+        if self.checkpoints is not None:
+            await self.checkpoints.clear()
+        await self._log_progress(
             request.user_id, request.job_id, f"❌ Analysis Failed: {error_message}"
         )
 
         # Issue refund
         print(f"[yellow]Issuing refund for job {request.job_id}...[/yellow]")
-        self.db_manager.refund_analysis_credit(request.user_id)
+        await self.async_db.refund_analysis_credit(request.user_id)
 
         # Cleanup storage if needed
         if request.storage_path:
             print("[cyan]Cleaning up source file...[/cyan]")
-            self.db_manager.delete_gcs_file(request.storage_path)
+            await self.async_db.delete_gcs_file(request.storage_path)
 
         return AnalysisResult(
             job_id=request.job_id,
@@ -1207,6 +1606,7 @@ Guidelines:
             f"  - {'LLM Input Tokens':<30}: {llm_metrics.get('llm_input_tokens', 0):,}",
             f"  - {'LLM Output Tokens':<30}: {llm_metrics.get('llm_output_tokens', 0):,}",
             f"  - {'Total LLM Requests':<30}: {llm_metrics.get('llm_calls', 0)}",
+            f"  - {'LLM Cache Hits / Misses':<30}: {llm_metrics.get('llm_cache_hits', 0)} / {llm_metrics.get('llm_cache_misses', 0)}",
             f"  - {'Tavily Searches':<30}: {cost_metrics.get('tavily_searches', 0)}",
             f"  - {'AssemblyAI Audio':<30}: {cost_metrics.get('assemblyai_audio_seconds', 0):.2f}s",
             "-" * 40,
@@ -0,0 +1,239 @@
+"""
+Per-run view of a job document.
+"""
+
+import asyncio
+import copy
+import time
+from typing import Any, Dict, Optional
+
+from rich import print
+
+from ..utils import AsyncDBManager
+
+# Statuses that end a job; these are written as soon as they are set
+TERMINAL_STATUSES = ("COMPLETED", "FAILED")
+
+
+class JobContext:
+    """
+    Holds one job document for the duration of a pipeline run.
+
+    The document (which can carry a multi-megabyte transcript) is read once,
+    or seeded from a snapshot the caller already has. Writes made through the
+    context are mirrored into the local copy, so later steps read what the
+    pipeline itself wrote without going back to Firestore. Call refresh()
+    where a step needs changes made by someone else.
+
+    Writes are write-behind: updates are merged into one pending change set
+    and written with a single update when the pipeline calls flush() at a
+    step boundary. Consecutive writes to the document are spaced at least
+    min_write_interval seconds apart, keeping the job under Firestore's
+    sustained per-document write rate. A flush that falls inside the
+    interval does not wait: it schedules one background write for when the
+    interval ends, and updates staged until then go out with it. A terminal
+    status is written at once; flush(wait=True) returns only when everything
+    staged has been written.
+    """
+
+    DEFAULT_MIN_WRITE_INTERVAL_SECONDS = 1.0
+
+    def __init__(
+        self,
+        db_manager,
+        user_id: str,
+        job_id: str,
+        snapshot: Optional[Dict[str, Any]] = None,
+        min_write_interval: float = DEFAULT_MIN_WRITE_INTERVAL_SECONDS,
+    ):
+        """
+        Args:
+            db_manager: db_manager module or AsyncDBManager
+            user_id: Owner of the job
+            job_id: The job document ID
+            snapshot: Job document already read by the caller, if any
+            min_write_interval: Minimum seconds between writes to the document
+        """
+        self.async_db = AsyncDBManager.wrap(db_manager)
+        self.user_id = user_id
+        self.job_id = job_id
+        self._data: Optional[Dict[str, Any]] = (
+            copy.copy(snapshot) if snapshot is not None else None
+        )
+        self.min_write_interval = min_write_interval
+
+        self._pending: Dict[str, Any] = {}
+        self._flush_lock = asyncio.Lock()
+        self._last_write: Optional[float] = None
+        self._scheduled: Optional[asyncio.Task] = None
+        self._scheduled_waiting = False
+
+        self.reads = 0
+        self.writes = 0
+        self.updates_staged = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    @property
+    def exists(self) -> bool:
+        """True once loaded and the job document was found."""
+        return bool(self._data)
+
+    async def load(self) -> Optional[Dict[str, Any]]:
+        """Return the job document, reading it from Firestore only the first time."""
+        if self._data is None:
+            await self.refresh()
+        return self._data or None
+
+    async def refresh(self) -> Optional[Dict[str, Any]]:
+        """Write pending updates, then re-read the job document."""
+        await self.flush(wait=True)
+        document = await self.async_db.get_job_status(self.user_id, self.job_id)
+        self.reads += 1
+        # An empty dict marks "read, but not found" so it is not re-read
+        self._data = document if document is not None else {}
+        return self._data or None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Read a top-level field from the loaded document."""
+        if self._data is None:
+            raise RuntimeError("JobContext.load() must be awaited before reading fields")
+        return self._data.get(key, default)
+
+    @property
+    def request_data(self) -> Dict[str, Any]:
+        return self.get("request_data", {}) or {}
+
+    def apply_local(self, fields: Dict[str, Any]):
+        """Mirror fields written elsewhere into the local copy."""
+        # Before the first read there is nothing to mirror into; the read
+        # itself flushes pending fields first and so will include them
+        if self._data is not None:
+            self._data.update(fields)
+
+    @property
+    def pending(self) -> Dict[str, Any]:
+        """Fields staged but not yet written."""
+        return dict(self._pending)
+
+    # --- Writes (staged, mirrored locally, written by flush) ---
+
+    async def update_status(
+        self,
+        status: str,
+        progress: Optional[str] = None,
+        transcript: Optional[list] = None,
+    ):
+        """
+        Stage a status change, as db_manager.update_job_status would write it.
+        Terminal statuses are flushed immediately together with anything pending.
+        """
+        fields = {"status": status}
+        if progress:
+            fields["progress"] = progress
+        if transcript:
+            fields["transcript"] = transcript
+        self._stage(fields)
+
+        if status in TERMINAL_STATUSES:
+            await self._write_now()
+
+    async def update_title(self, title: str, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Stage a title change. metadata is accepted for parity with
+        db_manager.update_job_with_metadata, which likewise stores only the title.
+        """
+        self._stage({"job_title": title})
+
+    async def update_fields(self, fields: Dict[str, Any]):
+        """Stage arbitrary top-level fields."""
+        self._stage(fields)
+
+    async def flush(self, wait: bool = False):
+        """
+        Write all staged fields to the job document in one update: now if
+        min_write_interval has passed since the last write, otherwise in a
+        background write scheduled for when it has. With wait=True, return
+        once every staged field is written (after the interval if needed);
+        use it where the fields must be stored before the next step.
+        """
+        if self._pending and self._scheduled is None:
+            delay = self._write_delay()
+            if delay <= 0:
+                await self._write()
+                return
+            self._scheduled = asyncio.create_task(self._deferred_write(delay))
+        # Otherwise a scheduled write picks up everything staged before it runs
+        if wait and self._scheduled is not None:
+            await asyncio.gather(self._scheduled, return_exceptions=True)
+            if self._pending:
+                # The deferred write failed; retry it and raise its error
+                await self._write()
+
+    async def touch(self):
+        """Refresh the job's updatedAt without changing any other field."""
+        async with self._flush_lock:
+            await self.async_db.update_job_fields(self.user_id, self.job_id, {}, touch=True)
+            self._last_write = time.monotonic()
+            self.writes += 1
+
+    async def _write_now(self):
+        """Write everything staged immediately, replacing any scheduled write."""
+        scheduled = self._scheduled
+        # A scheduled write still waiting out the interval is superseded; one
+        # already in flight finishes first (the lock orders the writes)
+        if scheduled is not None and self._scheduled_waiting:
+            scheduled.cancel()
+            await asyncio.gather(scheduled, return_exceptions=True)
+        await self._write()
+
+    def _write_delay(self) -> float:
+        if self._last_write is None:
+            return 0.0
+        return self.min_write_interval - (time.monotonic() - self._last_write)
+
+    async def _deferred_write(self, delay: float):
+        try:
+            # Updates staged while a write was in flight go out in the next one
+            while self._pending:
+                self._scheduled_waiting = True
+                try:
+                    await asyncio.sleep(max(delay, 0))
+                finally:
+                    self._scheduled_waiting = False
+                await self._write()
+                delay = self._write_delay()
+        except Exception as e:
+            # The fields stay pending for the next flush
+            print(f"[yellow]Warning: Deferred job update failed: {e}[/yellow]")
+        finally:
+            self._scheduled = None
+
+    async def _write(self):
+        async with self._flush_lock:
+            if not self._pending:
+                return
+
+            fields, self._pending = self._pending, {}
+            if fields.get("transcript"):
+                print(
+                    f"[bold green]LOG:[/bold green] Saving transcript with {len(fields['transcript'])} entries to job {self.job_id}."
+                )
+            try:
+                await self.async_db.update_job_fields(
+                    self.user_id, self.job_id, fields, touch="status" in fields
+                )
+            except Exception:
+                # Keep the fields for the next flush; anything staged since wins
+                self._pending = {**fields, **self._pending}
+                raise
+            finally:
+                self._last_write = time.monotonic()
+            self.writes += 1
+
+    def _stage(self, fields: Dict[str, Any]):
+        self._pending.update(fields)
+        self.updates_staged += 1
+        self.apply_local(fields)
@@ -3,7 +3,7 @@ Section processing orchestrator.
 """
 
 import asyncio
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from langchain_core.runnables import RunnableConfig
 from rich import print
 
@@ -14,17 +14,31 @@ from ..interfaces import (
     EntityExplanation,
 )
 from ..services.enrichment import EntityEnricher
-from ..utils import format_seconds_to_timestamp
+from ..utils import (
+    format_seconds_to_timestamp,
+    AsyncDBManager,
+    CPUExecutor,
+    JobLogBuffer,
+    SectionResultWriter,
+    start_span,
+)
 from ..config import get_persona_config
 
 # Import timestamp extraction functions
 try:
-    from ...find_quote_timestamps import add_timestamps_to_actionable_takeaways, add_timestamps_to_notable_quotes
+    from ...find_quote_timestamps import (
+        add_timestamps_to_actionable_takeaways,
+        add_timestamps_to_notable_quotes,
+        add_timestamps_with_cached_index,
+        TranscriptQuoteIndex,
+    )
     print("[green]Successfully imported timestamp extraction functions[/green]")
 except ImportError as e:
     # Fallback if import fails
     add_timestamps_to_actionable_takeaways = None
     add_timestamps_to_notable_quotes = None
+    add_timestamps_with_cached_index = None
+    TranscriptQuoteIndex = None
     print(f"[yellow]Failed to import timestamp extraction functions: {e}[/yellow]")
 
 
@@ -53,17 +67,100 @@ class SectionProcessor:
         entity_enricher: EntityEnricher,
         db_manager,
         persona: str = "general",
+        cpu_executor: Optional[CPUExecutor] = None,
+        result_persistence: str = "immediate",
     ):
         self.analyzer = content_analyzer
         self.enricher = entity_enricher
         self.db_manager = db_manager
+        self.async_db = AsyncDBManager.wrap(db_manager)
         self.persona = persona
         self.persona_config = get_persona_config(persona)
+        self.cpu_executor = cpu_executor or CPUExecutor(mode="inline")
         self.structured_transcript = None
-        
-    def set_structured_transcript(self, structured_transcript: Optional[List[Dict]]):
-        """Set the structured transcript for timestamp extraction."""
+        self.quote_index = None
+        self.transcript_key = None
+        self.progress_log: Optional[JobLogBuffer] = None
+        self.existing_results: Optional[Dict[str, Dict]] = None
+        # "immediate" saves each section as it finishes, "batched" groups saves
+        self.result_persistence = result_persistence
+        self.result_writer: Optional[SectionResultWriter] = None
+        self._existing_results_job: Optional[str] = None
+
+    def set_progress_log(self, progress_log: Optional[JobLogBuffer]):
+        """Route this job's progress messages through a shared log buffer."""
+        self.progress_log = progress_log
+
+    async def _log_progress(self, user_id: str, job_id: str, message: str):
+        """Log a progress message, through the job's log buffer when one is active."""
+        if self.progress_log is not None and self.progress_log.job_id == job_id:
+            await self.progress_log.log(message)
+        else:
+            await self.async_db.log_progress(user_id, job_id, message)
+
+    async def load_existing_results(self, user_id: str, job_id: str):
+        """
+        Read every saved section result for the job in one query.
+
+        Skip/resume decisions in process_section are then answered from this
+        map instead of two reads per section. If the query fails, sections
+        fall back to checking Firestore individually.
+        """
+        try:
+            self.existing_results = await self.async_db.get_section_results_by_id(
+                user_id, job_id
+            )
+            self._existing_results_job = job_id
+            if self.existing_results:
+                print(
+                    f"[green]Found {len(self.existing_results)} saved section results; "
+                    f"they will be reused.[/green]"
+                )
+        except Exception as e:
+            print(f"[yellow]Warning: Could not load saved section results: {e}[/yellow]")
+            self.existing_results = None
+            self._existing_results_job = None
+
+    async def _get_existing_result(
+        self, user_id: str, job_id: str, section_doc_id: str
+    ) -> Optional[Dict]:
+        """Return a previously saved section result, or None if there is none."""
+        if self.existing_results is not None and self._existing_results_job == job_id:
+            return self.existing_results.get(section_doc_id)
+        if await self.async_db.does_section_result_exist(user_id, job_id, section_doc_id):
+            return await self.async_db.get_section_result(user_id, job_id, section_doc_id)
+        return None
+
+    async def _save_section_result(
+        self, user_id: str, job_id: str, section_index: int, section_data: Dict
+    ):
+        """Save a section now, or queue it on the job's batch writer."""
+        if self.result_writer is not None and self.result_writer.job_id == job_id:
+            await self.result_writer.save(section_index, section_data)
+        else:
+            await self.async_db.save_section_result(
+                user_id, job_id, section_index, section_data
+            )
+
+    def set_structured_transcript(
+        self, structured_transcript: Optional[List[Dict]], transcript_key: Optional[str] = None
+    ):
+        """
+        Set the structured transcript for timestamp extraction.
+
+        The quote index is built here once per job and shared by every section.
+        With a process-based CPU executor the index lives in the worker
+        processes instead, cached there under transcript_key (e.g. the job ID).
+        """
         self.structured_transcript = structured_transcript
+        self.transcript_key = transcript_key
+        self.quote_index = None
+        if (
+            structured_transcript
+            and TranscriptQuoteIndex is not None
+            and not (self.cpu_executor.uses_processes and transcript_key)
+        ):
+            self.quote_index = TranscriptQuoteIndex(structured_transcript)
 
     async def process_section(
         self,
@@ -84,18 +181,16 @@ class SectionProcessor:
 
         progress_msg = f"{log_prefix} Analysis initiated. (Time: {start_time_str} - {end_time_str})"
         print(f"      [cyan]L {progress_msg}[/cyan]")
-        self.db_manager.log_progress(
+        await self._log_progress(
             user_id, job_id, f"Section {section_index + 1} analysis initiated."
         )
 
         # Check if results already exist
         section_doc_id = f"section_{section_index:03d}"
-        if self.db_manager.does_section_result_exist(user_id, job_id, section_doc_id):
+        existing_data = await self._get_existing_result(user_id, job_id, section_doc_id)
+        if existing_data is not None:
             log_msg = f"{log_prefix} Result already exists. Skipping."
             print(f"      [green]L {log_msg}[/green]")
-            existing_data = self.db_manager.get_section_result(
-                user_id, job_id, section_doc_id
-            )
 
             # Convert existing data to SectionAnalysis if needed
             section_analysis = self._convert_to_section_analysis(
@@ -125,7 +220,7 @@ class SectionProcessor:
             if not analysis_result:
                 log_msg = f"{log_prefix} No analysis result returned from content analyzer"
                 print(f"      [red]L {log_msg}[/red]")
-                self.db_manager.log_progress(user_id, job_id, log_msg)
+                await self._log_progress(user_id, job_id, log_msg)
                 return SectionProcessingResult(
                     status="skipped_no_data", index=section_index, cost_metrics={}
                 )
@@ -177,11 +272,14 @@ class SectionProcessor:
             )
 
             # Step 5: Save results
+            await self._add_quote_timestamps(
+                section_analysis, (section.start_time, section.end_time)
+            )
             section_result_dict = self._convert_to_dict(section_analysis)
-            self.db_manager.save_section_result(
+            await self._save_section_result(
                 user_id, job_id, section_index, section_result_dict
             )
-            self.db_manager.log_progress(
+            await self._log_progress(
                 user_id,
                 job_id,
                 f"✓ Section {section_index + 1}: Analysis complete and saved.",
@@ -196,13 +294,13 @@ class SectionProcessor:
         except Exception as e:
             log_msg = f"{log_prefix} Error during analysis: {e}"
             print(f"      [bold red]L {log_msg}[/bold red]")
-            self.db_manager.log_progress(user_id, job_id, log_msg)
+            await self._log_progress(user_id, job_id, log_msg)
             
             # Log the full exception for debugging
             import traceback
             traceback_msg = f"{log_prefix} Full traceback: {traceback.format_exc()}"
             print(f"      [red]{traceback_msg}[/red]")
-            self.db_manager.log_progress(user_id, job_id, traceback_msg)
+            await self._log_progress(user_id, job_id, traceback_msg)
 
             return SectionProcessingResult(
                 status="failed",
@@ -221,19 +319,39 @@ class SectionProcessor:
         """
         Process multiple sections in parallel with concurrency control.
         """
+        # One query for all saved results instead of two reads per section
+        await self.load_existing_results(user_id, job_id)
+
         semaphore = asyncio.Semaphore(max_concurrent)
 
         async def process_with_semaphore(section: TranscriptSection, index: int):
             async with semaphore:
-                return await self.process_section(
-                    section, index, user_id, job_id, runnable_config
-                )
+                with start_span("section.analyze", section_index=index):
+                    return await self.process_section(
+                        section, index, user_id, job_id, runnable_config
+                    )
 
         tasks = [
             process_with_semaphore(section, i) for i, section in enumerate(sections)
         ]
 
-        return await asyncio.gather(*tasks)
+        if self.result_persistence != "batched":
+            return await asyncio.gather(*tasks)
+
+        self.result_writer = SectionResultWriter.from_settings(
+            self.async_db, user_id, job_id
+        )
+        try:
+            return await asyncio.gather(*tasks)
+        finally:
+            # Later steps read the results subcollection, so everything
+            # queued is committed before the section step returns
+            writer, self.result_writer = self.result_writer, None
+            await writer.close()
+            print(
+                f"[green]Saved {writer.results_saved} section results in "
+                f"{writer.batches_written} batched writes[/green]"
+            )
 
     def _convert_to_section_analysis(
         self, data: Dict, start_time: str, end_time: str
@@ -285,10 +403,46 @@ class SectionProcessor:
             },
         )
 
-    def _convert_to_dict(self, analysis: SectionAnalysis) -> Dict:
-        """Convert SectionAnalysis to dictionary for database storage."""
-        
-        # --- Timestamp Enrichment Logic ---
+    async def _run_timestamp_matching(self, add_timestamps, items, time_window):
+        """Run a timestamp helper on the CPU executor, off the event loop."""
+        if self.cpu_executor.uses_processes and self.transcript_key:
+            # Index objects are not shipped to worker processes; each worker
+            # builds and caches its own under the transcript key. The
+            # transcript is only sent to a worker that has not cached it yet.
+            args = (
+                add_timestamps,
+                items,
+                self.transcript_key,
+                len(self.structured_transcript),
+                time_window,
+            )
+            result = await self.cpu_executor.run(add_timestamps_with_cached_index, *args)
+            if result is None:
+                result = await self.cpu_executor.run(
+                    add_timestamps_with_cached_index,
+                    *args,
+                    structured_transcript=self.structured_transcript,
+                )
+            return result
+        return await self.cpu_executor.run(
+            add_timestamps,
+            items,
+            self.structured_transcript,
+            self.quote_index,
+            time_window,
+        )
+
+    async def _add_quote_timestamps(
+        self,
+        analysis: SectionAnalysis,
+        time_window: Optional[Tuple[float, float]] = None,
+    ):
+        """
+        Add transcript timestamps to the section's quotes or takeaways.
+
+        time_window is the section's (start, end) in seconds; quote timestamps
+        are looked up there first and only misses search the whole transcript.
+        """
         # We update the analysis object directly so that the returned SectionProcessingResult
         # contains the enriched data (timestamps) for downstream processing (e.g. synthesis).
         
@@ -304,9 +458,10 @@ class SectionProcessor:
                     # Show debug info
                     print(f"[blue]  - Actionable takeaways count: {len(analysis.additional_data['actionable_takeaways'])}[/blue]")
                     
-                    enhanced_takeaways = add_timestamps_to_actionable_takeaways(
-                        analysis.additional_data["actionable_takeaways"], 
-                        self.structured_transcript
+                    enhanced_takeaways = await self._run_timestamp_matching(
+                        add_timestamps_to_actionable_takeaways,
+                        analysis.additional_data["actionable_takeaways"],
+                        time_window,
                     )
                     
                     # Update the analysis object in place
@@ -334,9 +489,10 @@ class SectionProcessor:
                 try:
                     print(f"[blue]Adding precise timestamps to {len(analysis.quotes)} notable quotes...[/blue]")
                     
-                    enhanced_quotes = add_timestamps_to_notable_quotes(
+                    enhanced_quotes = await self._run_timestamp_matching(
+                        add_timestamps_to_notable_quotes,
                         analysis.quotes,
-                        self.structured_transcript
+                        time_window,
                     )
                     
                     # Update the analysis object in place
@@ -354,6 +510,9 @@ class SectionProcessor:
             elif not self.structured_transcript:
                 print(f"[yellow]Skipping notable quote timestamp extraction - no structured transcript available[/yellow]")
 
+    def _convert_to_dict(self, analysis: SectionAnalysis) -> Dict:
+        """Convert SectionAnalysis to dictionary for database storage."""
+
         # --- Dictionary Construction ---
         base_dict = {
             "start_time": analysis.start_time,
@@ -0,0 +1,170 @@
+"""
+Durable per-stage checkpoints for a job.
+"""
+
+import asyncio
+from dataclasses import asdict
+from typing import Any, Awaitable, Dict, List, Optional
+
+from rich import print
+
+from ..interfaces import TranscriptSection, TranscriptUtterance
+from ..utils import AsyncDBManager
+
+# Pipeline stages with a checkpoint, in the order they run. Bump a stage's
+# version when the shape of its output changes; stored checkpoints with
+# another version are ignored.
+STAGE_VERSIONS: Dict[str, int] = {
+    "transcript": 1,
+    "sections": 2,
+    "synthesis": 1,
+    "title": 1,
+}
+STAGE_ORDER = tuple(STAGE_VERSIONS)
+# Stages whose checkpoint carries everything later stages need from the
+# stages before them, so it can be used without those checkpoints
+SELF_CONTAINED_STAGES = ("sections",)
+
+
+class StageCheckpoints:
+    """
+    Outputs of completed pipeline stages, stored with the job.
+
+    When a job is retried after its worker died, load() reads what the
+    previous run finished and the pipeline skips those stages: a crash
+    during meta-analysis does not cost another transcription. Section
+    analyses are not checkpointed here; they are already saved one by one
+    in the job's results subcollection.
+
+    A stage is only skipped if every stage before it was completed too, so
+    a resumed run never mixes outputs of different runs. Self-contained
+    stages are the exception: the "sections" checkpoint holds what the
+    later stages need from the transcript stage, whose checkpoint (with
+    every AssemblyAI word) may be too large to store for long audio.
+    """
+
+    def __init__(self, db_manager, user_id: str, job_id: str):
+        """
+        Args:
+            db_manager: db_manager module or AsyncDBManager
+            user_id: Owner of the job
+            job_id: The job document ID
+        """
+        self.async_db = AsyncDBManager.wrap(db_manager)
+        self.user_id = user_id
+        self.job_id = job_id
+        self._data: Dict[str, Any] = {}
+        self._saving: List[asyncio.Task] = []
+
+        self.saved = 0
+
+    async def load(self) -> List[str]:
+        """Read stored checkpoints; returns the stages that can be skipped."""
+        stored = await self.async_db.get_job_checkpoints(self.user_id, self.job_id)
+        self._data = {
+            stage: entry["data"]
+            for stage, entry in (stored or {}).items()
+            if entry.get("version") == STAGE_VERSIONS.get(stage)
+        }
+        return self.completed_stages()
+
+    def completed_stages(self) -> List[str]:
+        """
+        Leading stages, in pipeline order, that have a checkpoint. A
+        self-contained stage with a checkpoint counts, and lets the stages
+        after it count, even if a stage before it has none.
+        """
+        first = max(
+            (
+                STAGE_ORDER.index(stage)
+                for stage in SELF_CONTAINED_STAGES
+                if stage in self._data
+            ),
+            default=0,
+        )
+        return self._leading(STAGE_ORDER[:first]) + self._leading(STAGE_ORDER[first:])
+
+    def _leading(self, stages) -> List[str]:
+        completed = []
+        for stage in stages:
+            if stage not in self._data:
+                break
+            completed.append(stage)
+        return completed
+
+    def get(self, stage: str) -> Optional[Any]:
+        """Output of a stage that can be skipped, or None if it must run."""
+        if stage not in self.completed_stages():
+            return None
+        return self._data[stage]
+
+    async def save(self, stage: str, data: Any):
+        """
+        Record a stage's output. A checkpoint that cannot be written only
+        costs redoing the stage on a retry, so failures are logged, not raised.
+        """
+        self._data[stage] = data
+        try:
+            stored = await self.async_db.save_job_checkpoint(
+                self.user_id, self.job_id, stage, STAGE_VERSIONS[stage], data
+            )
+        except Exception as e:
+            print(f"[yellow]Warning: Could not save '{stage}' checkpoint: {e}[/yellow]")
+            return
+        if stored:
+            self.saved += 1
+
+    def save_after(self, stage: str, data: Any, written: Awaitable):
+        """
+        Record a stage's output once written, the write of the job fields
+        the stage produced, has completed. Does not wait for either; the
+        stage is available to get() at once.
+        """
+        self._data[stage] = data
+        self._saving.append(asyncio.create_task(self._save_after(stage, data, written)))
+
+    async def _save_after(self, stage: str, data: Any, written: Awaitable):
+        try:
+            await written
+        except Exception as e:
+            # Without its job fields the stage must run again on a retry
+            print(f"[yellow]Warning: Not saving '{stage}' checkpoint: {e}[/yellow]")
+            return
+        await self.save(stage, data)
+
+    async def wait_saved(self):
+        """Wait for checkpoints scheduled by save_after()."""
+        saving, self._saving = self._saving, []
+        await asyncio.gather(*saving)
+
+    async def clear(self):
+        """Remove the job's checkpoints once it has finished."""
+        await self.wait_saved()
+        self._data = {}
+        try:
+            await self.async_db.delete_job_checkpoints(self.user_id, self.job_id)
+        except Exception as e:
+            print(f"[yellow]Warning: Could not delete checkpoints: {e}[/yellow]")
+
+
+def utterances_to_checkpoint(utterances: List[TranscriptUtterance]) -> List[Dict[str, Any]]:
+    return [asdict(utterance) for utterance in utterances]
+
+
+def utterances_from_checkpoint(data: List[Dict[str, Any]]) -> List[TranscriptUtterance]:
+    return [TranscriptUtterance(**utterance) for utterance in data]
+
+
+def sections_to_checkpoint(sections: List[TranscriptSection]) -> List[Dict[str, Any]]:
+    return [asdict(section) for section in sections]
+
+
+def sections_from_checkpoint(data: List[Dict[str, Any]]) -> List[TranscriptSection]:
+    return [
+        TranscriptSection(
+            utterances=utterances_from_checkpoint(section["utterances"]),
+            start_time=section["start_time"],
+            end_time=section["end_time"],
+        )
+        for section in data
+    ]
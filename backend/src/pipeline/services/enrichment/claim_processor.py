@@ -77,7 +77,7 @@ class ContextualBriefingGenerator:
         self.llm = llm_client
         self.search = search_provider
     
-    @retry_with_exponential_backoff()
+    @retry_with_exponential_backoff(provider="gemini")
     async def generate_briefing(
         self,
         claim_text: str,
@@ -12,7 +12,7 @@ from firebase_admin import firestore
 from rich import print
 
 from ...interfaces import CacheProvider, SearchProvider, EntityExplanation
-from ...utils import get_normalized_cache_key, retry_with_exponential_backoff
+from ...utils import get_normalized_cache_key, retry_with_exponential_backoff, call_with_retry
 from ...config.constants import ENTITY_CACHE_COLLECTION
 
 
@@ -56,13 +56,16 @@ class TavilySearchProvider(SearchProvider):
     
     async def search(self, query: str, **kwargs) -> List[Dict[str, Any]]:
         """Perform web search using Tavily."""
-        try:
+        async def run_search():
             # Run Tavily search in thread pool to avoid blocking
-            result = await asyncio.to_thread(
+            return await asyncio.to_thread(
                 self.client.search,
                 query=query.strip().split("\n")[0][:390],
                 search_depth=kwargs.get("search_depth", "basic"),
             )
+
+        try:
+            result = await call_with_retry("tavily", run_search)
             return result.get("results", [])
         except Exception as e:
             print(f"[red]Search failed for query '{query[:50]}...': {e}[/red]")
@@ -82,7 +85,7 @@ class EntityEnricher:
         self.cache = cache_provider
         self.search = search_provider
     
-    @retry_with_exponential_backoff()
+    @retry_with_exponential_backoff(provider="gemini")
     async def enrich_entities(
         self,
         entities: List[str],
@@ -7,7 +7,7 @@ from .segmenter import (
     TimeBasedSegmenter,
     MonologueSegmenter,
 )
-from .audio_processor import AssemblyAIProcessor
+from .audio_processor import AssemblyAIProcessor, WEBHOOK_SECRET_HEADER
 
 __all__ = [
     # Normalizers
@@ -22,4 +22,5 @@ __all__ = [
     
     # Audio processors
     "AssemblyAIProcessor",
+    "WEBHOOK_SECRET_HEADER",
 ]
\ No newline at end of file
@@ -7,12 +7,106 @@ import asyncio
 import time
 import json
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import httpx
 from rich import print
 from rich.panel import Panel
 
 from ...interfaces import AudioProcessor
+from ...utils import call_with_retry
+
+# Audio is streamed from GCS to AssemblyAI in chunks of this size; at most
+# UPLOAD_PREFETCH_CHUNKS chunks are buffered while the upload catches up
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_PREFETCH_CHUNKS = 2
+
+# Rough AssemblyAI processing time per second of audio, by speech model
+MODEL_PROCESSING_RATIOS = {"universal": 0.15, "slam-1": 0.3, "nano": 0.1}
+DEFAULT_PROCESSING_RATIO = 0.2
+# Queueing and start-up time added to every estimate
+PROCESSING_OVERHEAD_SECONDS = 10.0
+# Expected processing time when the audio duration is not known
+UNKNOWN_DURATION_EXPECTED_SECONDS = 60.0
+
+# Bounds on the time between two transcript status checks
+MIN_POLL_INTERVAL_SECONDS = 1.0
+MAX_POLL_INTERVAL_SECONDS = 30.0
+# Growth of the interval once the expected finish has passed
+POLL_BACKOFF_FACTOR = 1.5
+# Header carrying the shared secret on AssemblyAI webhook calls
+WEBHOOK_SECRET_HEADER = "X-Webhook-Secret"
+
+
+def _get_poll_deadline() -> float:
+    try:
+        from ....config import settings
+        return float(settings.ASSEMBLYAI_POLL_DEADLINE_SECONDS)
+    except (ImportError, AttributeError):
+        return float(os.getenv("ASSEMBLYAI_POLL_DEADLINE_SECONDS", "3600"))
+
+
+class TranscriptPollSchedule:
+    """
+    Decides when to check a submitted transcript again. Checks are sparse
+    while the transcript is far from its expected finish, frequent around
+    it, and back off exponentially once the estimate has been overrun.
+    """
+
+    def __init__(
+        self,
+        audio_duration: Optional[float] = None,
+        model_name: str = "universal",
+        deadline_seconds: Optional[float] = None,
+        min_interval: float = MIN_POLL_INTERVAL_SECONDS,
+        max_interval: float = MAX_POLL_INTERVAL_SECONDS,
+        clock=time.monotonic,
+    ):
+        ratio = MODEL_PROCESSING_RATIOS.get(model_name, DEFAULT_PROCESSING_RATIO)
+        if audio_duration:
+            self.expected_seconds = PROCESSING_OVERHEAD_SECONDS + audio_duration * ratio
+        else:
+            self.expected_seconds = UNKNOWN_DURATION_EXPECTED_SECONDS
+        self.deadline_seconds = deadline_seconds
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._clock = clock
+        self._started = clock()
+        self._overdue_interval = min_interval
+
+        self.polls = 0
+        self.wait_seconds = 0.0
+
+    def elapsed(self) -> float:
+        return self._clock() - self._started
+
+    def next_delay(self) -> float:
+        """Seconds to wait before the next check; TimeoutError past the deadline."""
+        elapsed = self.elapsed()
+        if self.deadline_seconds is not None and elapsed >= self.deadline_seconds:
+            raise TimeoutError(
+                f"AssemblyAI transcript not ready after {elapsed:.0f}s "
+                f"({self.polls} status checks)"
+            )
+
+        remaining = self.expected_seconds - elapsed
+        if remaining > 2 * self.min_interval:
+            # Before the expected finish: halve the remaining time each check
+            delay = min(self.max_interval, remaining / 2)
+        else:
+            delay = self._overdue_interval
+            self._overdue_interval = min(
+                self.max_interval, self._overdue_interval * POLL_BACKOFF_FACTOR
+            )
+
+        if self.deadline_seconds is not None:
+            delay = min(delay, self.deadline_seconds - elapsed)
+        return delay
+
+    def get_metrics(self) -> Dict[str, float]:
+        return {
+            "transcription_polls": self.polls,
+            "transcription_poll_wait_s": self.wait_seconds,
+        }
 
 
 class AssemblyAIProcessor(AudioProcessor):
@@ -27,163 +121,265 @@ class AssemblyAIProcessor(AudioProcessor):
         if not self.bucket_name:
             raise ValueError("GCP_STORAGE_BUCKET_NAME environment variable is required")
 
-    async def transcribe(
-        self, storage_path: str, model_name: str = "universal"
-    ) -> Dict[str, Any]:
+        # Status checks made by the last wait_for_transcript call
+        self.last_poll_metrics: Dict[str, float] = {}
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send an AssemblyAI request, retrying rate limits and transient errors."""
+        async def send():
+            response = await getattr(self.httpx_client, method)(url, **kwargs)
+            response.raise_for_status()
+            return response
+
+        return await call_with_retry("assemblyai", send)
+
+    async def _stream_blob(self, blob, chunk_size: int = UPLOAD_CHUNK_SIZE):
         """
-        Transcribes audio from GCS path using AssemblyAI,
-        requesting speaker labels and returning structured result.
+        Yields a GCS object in chunks. The next chunk is downloaded on a worker
+        thread while the current one is being uploaded, and only a few chunks
+        are held in memory at any time.
         """
-        print(
-            Panel(
-                f"[bold cyan]🎤 Transcription & Diarization Initiated[/bold cyan]\n"
-                f"   - [bold]Storage Path:[/bold] {storage_path}\n"
-                f"   - [bold]Model:[/bold] [yellow]{model_name}[/yellow]",
-                title="[bold]AssemblyAI Transcription[/bold]",
-                border_style="cyan",
-                expand=False,
-            )
-        )
-
-        try:
-            start_time = time.time()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=UPLOAD_PREFETCH_CHUNKS)
+        done = object()
 
-            # Download audio from GCS
-            download_start = time.time()
-            bucket = self.gcs_client.bucket(self.bucket_name)
-            blob = bucket.blob(storage_path)
-            audio_bytes = await asyncio.to_thread(blob.download_as_bytes)
-            download_time = time.time() - download_start
-            print(f"   [dim]⏱️  Downloaded from GCS: {download_time:.2f}s[/dim]")
+        async def download():
+            try:
+                reader = await asyncio.to_thread(blob.open, "rb", chunk_size=chunk_size)
+                try:
+                    while True:
+                        chunk = await asyncio.to_thread(reader.read, chunk_size)
+                        if not chunk:
+                            break
+                        await queue.put(chunk)
+                finally:
+                    await asyncio.to_thread(reader.close)
+                await queue.put(done)
+            except Exception as e:
+                await queue.put(e)
 
-            headers = {"authorization": self.api_key}
+        downloader = asyncio.create_task(download())
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            downloader.cancel()
 
-            # Upload audio to AssemblyAI
-            upload_start = time.time()
-            upload_response = await self.httpx_client.post(
+    async def _upload_from_gcs(self, blob, headers: Dict[str, str]) -> str:
+        """Streams a GCS object into AssemblyAI's upload endpoint and returns its upload URL."""
+        async def send():
+            # A retry needs a fresh stream from the start of the object
+            response = await self.httpx_client.post(
                 "https://api.assemblyai.com/v2/upload",
                 headers=headers,
-                content=audio_bytes,
+                content=self._stream_blob(blob),
             )
-            upload_response.raise_for_status()
-            audio_url = upload_response.json()["upload_url"]
-            upload_time = time.time() - upload_start
-            print(f"   [dim]⏱️  Uploaded to AssemblyAI: {upload_time:.2f}s[/dim]")
-
-            # Submit transcription request
-            submit_start = time.time()
-            payload = {
-                "audio_url": audio_url,
-                "speech_model": model_name,
-                "speaker_labels": True,
-            }
-            submit_response = await self.httpx_client.post(
-                "https://api.assemblyai.com/v2/transcript",
-                json=payload,
-                headers=headers,
-            )
-            submit_response.raise_for_status()
-            transcript_id = submit_response.json()["id"]
-            submit_time = time.time() - submit_start
-            print(f"   [dim]⏱️  Job submission: {submit_time:.2f}s[/dim]")
-
-            # Poll for completion
-            poll_start = time.time()
-            poll_count = 0
+            response.raise_for_status()
+            return response
+
+        upload_response = await call_with_retry("assemblyai", send)
+        return upload_response.json()["upload_url"]
+
+    async def submit(
+        self,
+        storage_path: str,
+        model_name: str = "universal",
+        webhook_url: Optional[str] = None,
+        webhook_secret: Optional[str] = None,
+    ) -> str:
+        """
+        Uploads the audio and starts a transcription, returning AssemblyAI's
+        transcript ID. With webhook_url, AssemblyAI calls it when the
+        transcript is ready, sending webhook_secret in WEBHOOK_SECRET_HEADER.
+        """
+        bucket = self.gcs_client.bucket(self.bucket_name)
+        blob = bucket.blob(storage_path)
+
+        headers = {"authorization": self.api_key}
+
+        # Stream audio from GCS to AssemblyAI without holding the whole file
+        upload_start = time.time()
+        audio_url = await self._upload_from_gcs(blob, headers)
+        upload_time = time.time() - upload_start
+        print(f"   [dim]⏱️  Streamed from GCS to AssemblyAI: {upload_time:.2f}s[/dim]")
+
+        # Submit transcription request
+        submit_start = time.time()
+        payload = {
+            "audio_url": audio_url,
+            "speech_model": model_name,
+            "speaker_labels": True,
+        }
+        if webhook_url:
+            payload["webhook_url"] = webhook_url
+            if webhook_secret:
+                payload["webhook_auth_header_name"] = WEBHOOK_SECRET_HEADER
+                payload["webhook_auth_header_value"] = webhook_secret
+        submit_response = await self._request(
+            "post",
+            "https://api.assemblyai.com/v2/transcript",
+            json=payload,
+            headers=headers,
+        )
+        transcript_id = submit_response.json()["id"]
+        submit_time = time.time() - submit_start
+        print(f"   [dim]⏱️  Job submission: {submit_time:.2f}s[/dim]")
+        return transcript_id
+
+    async def wait_for_transcript(
+        self,
+        transcript_id: str,
+        storage_path: str = "",
+        model_name: str = "universal",
+        initial_delay: Optional[float] = None,
+        audio_duration: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Polls a submitted transcription until it completes and returns the
+        structured result. Checks follow a TranscriptPollSchedule built from
+        the audio duration, when known, and the speech model. Pass
+        initial_delay=0 when the transcript is expected to be ready already
+        (e.g. after its webhook arrived).
+        """
+        headers = {"authorization": self.api_key}
+        poll_endpoint = f"https://api.assemblyai.com/v2/transcript/{transcript_id}"
+
+        schedule = TranscriptPollSchedule(
+            audio_duration, model_name, deadline_seconds=_get_poll_deadline()
+        )
+        delay = schedule.next_delay() if initial_delay is None else initial_delay
+        try:
             while True:
-                poll_count += 1
-                await asyncio.sleep(5)
-                poll_endpoint = (
-                    f"https://api.assemblyai.com/v2/transcript/{transcript_id}"
-                )
-                poll_response = await self.httpx_client.get(
-                    poll_endpoint, headers=headers
-                )
-                poll_response.raise_for_status()
+                if delay:
+                    await asyncio.sleep(delay)
+                    schedule.wait_seconds += delay
+                schedule.polls += 1
+                poll_response = await self._request("get", poll_endpoint, headers=headers)
                 result = poll_response.json()
 
                 if result["status"] == "completed":
-                    poll_time = time.time() - poll_start
-                    total_time = time.time() - start_time
                     print(
-                        f"   [dim]⏱️  Polling: {poll_time:.2f}s ({poll_count} requests)[/dim]"
-                    )
-                    print(
-                        f"   [bold yellow]⏱️  TOTAL TIME: {total_time:.2f}s[/bold yellow]"
+                        f"   [dim]⏱️  Polling: {schedule.elapsed():.2f}s ({schedule.polls} requests, "
+                        f"expected ~{schedule.expected_seconds:.0f}s)[/dim]"
                     )
                     print("   [green]✓[/green] [dim]Polling complete.[/dim]")
-                    audio_duration = result.get("audio_duration", 0)
+                    return self._completed_result(result, transcript_id, storage_path, model_name)
 
-                    if audio_duration is None:
-                        audio_duration = 0
-
-                    print(
-                        Panel(
-                            f"[bold green]Transcription Successful[/bold green]\n"
-                            f"   - [bold]Duration:[/bold] {audio_duration:.2f} seconds\n"
-                            f"   - [bold]Model Used:[/bold] {result.get('speech_model')}",
-                            title="[bold green]Result[/bold green]",
-                            border_style="green",
-                            expand=False,
-                        )
+                elif result["status"] in ("error", "failed"):
+                    raise Exception(
+                        f"AssemblyAI transcription failed: {result.get('error')}"
                     )
 
-                    # Handle case where diarization fails
-                    if not result.get("utterances"):
-                        print(
-                            "[bold yellow]LOG:[/bold yellow] "
-                            "Diarization did not return utterances. Creating fallback structure."
-                        )
-                        return {
-                            "utterances": [
-                                {"speaker": "A", "text": result.get("text", "")}
-                            ],
-                            "text": result.get("text", ""),
-                            "audio_duration": audio_duration,
-                        }
+                delay = schedule.next_delay()
+        finally:
+            self.last_poll_metrics = schedule.get_metrics()
 
-                    print(
-                        f"[bold green]LOG:[/bold green] "
-                        f"Diarization successful. Found {len(result['utterances'])} utterances."
-                    )
+    def _completed_result(
+        self, result: Dict[str, Any], transcript_id: str, storage_path: str, model_name: str
+    ) -> Dict[str, Any]:
+        audio_duration = result.get("audio_duration", 0)
 
-                    # Save AssemblyAI response to JSON file for debugging
-                    try:
-                        debug_dir = os.path.join(os.getcwd(), "debug_assemblyai")
-                        os.makedirs(debug_dir, exist_ok=True)
-
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        debug_filename = f"assemblyai_response_{transcript_id}_{timestamp}.json"
-                        debug_path = os.path.join(debug_dir, debug_filename)
-
-                        # Create debug data with metadata
-                        debug_data = {
-                            "metadata": {
-                                "transcript_id": transcript_id,
-                                "timestamp": datetime.now().isoformat(),
-                                "storage_path": storage_path,
-                                "model_name": model_name,
-                                "audio_duration": audio_duration,
-                                "utterance_count": len(result.get('utterances', [])),
-                                "has_words": "words" in result,
-                                "words_count": len(result.get('words', [])) if 'words' in result else 0
-                            },
-                            "assemblyai_response": result
-                        }
-
-                        with open(debug_path, 'w', encoding='utf-8') as f:
-                            json.dump(debug_data, f, indent=2, ensure_ascii=False)
-
-                        print(f"[bold yellow]DEBUG:[/bold yellow] Saved AssemblyAI response to {debug_path}")
-                    except Exception as e:
-                        print(f"[bold red]WARNING:[/bold red] Failed to save debug file: {e}")
-
-                    return result
-
-                elif result["status"] == "failed":
-                    raise Exception(
-                        f"AssemblyAI transcription failed: {result.get('error')}"
-                    )
+        if audio_duration is None:
+            audio_duration = 0
+
+        print(
+            Panel(
+                f"[bold green]Transcription Successful[/bold green]\n"
+                f"   - [bold]Duration:[/bold] {audio_duration:.2f} seconds\n"
+                f"   - [bold]Model Used:[/bold] {result.get('speech_model')}",
+                title="[bold green]Result[/bold green]",
+                border_style="green",
+                expand=False,
+            )
+        )
+
+        # Handle case where diarization fails
+        if not result.get("utterances"):
+            print(
+                "[bold yellow]LOG:[/bold yellow] "
+                "Diarization did not return utterances. Creating fallback structure."
+            )
+            return {
+                "utterances": [
+                    {"speaker": "A", "text": result.get("text", "")}
+                ],
+                "text": result.get("text", ""),
+                "audio_duration": audio_duration,
+            }
+
+        print(
+            f"[bold green]LOG:[/bold green] "
+            f"Diarization successful. Found {len(result['utterances'])} utterances."
+        )
+
+        # Save AssemblyAI response to JSON file for debugging
+        try:
+            debug_dir = os.path.join(os.getcwd(), "debug_assemblyai")
+            os.makedirs(debug_dir, exist_ok=True)
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            debug_filename = f"assemblyai_response_{transcript_id}_{timestamp}.json"
+            debug_path = os.path.join(debug_dir, debug_filename)
+
+            # Create debug data with metadata
+            debug_data = {
+                "metadata": {
+                    "transcript_id": transcript_id,
+                    "timestamp": datetime.now().isoformat(),
+                    "storage_path": storage_path,
+                    "model_name": model_name,
+                    "audio_duration": audio_duration,
+                    "utterance_count": len(result.get('utterances', [])),
+                    "has_words": "words" in result,
+                    "words_count": len(result.get('words', [])) if 'words' in result else 0
+                },
+                "assemblyai_response": result
+            }
+
+            with open(debug_path, 'w', encoding='utf-8') as f:
+                json.dump(debug_data, f, indent=2, ensure_ascii=False)
+
+            print(f"[bold yellow]DEBUG:[/bold yellow] Saved AssemblyAI response to {debug_path}")
+        except Exception as e:
+            print(f"[bold red]WARNING:[/bold red] Failed to save debug file: {e}")
+
+        return result
+
+    async def transcribe(
+        self,
+        storage_path: str,
+        model_name: str = "universal",
+        audio_duration: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Transcribes audio from GCS path using AssemblyAI,
+        requesting speaker labels and returning structured result.
+        audio_duration (seconds), when known, paces the status checks.
+        """
+        print(
+            Panel(
+                f"[bold cyan]🎤 Transcription & Diarization Initiated[/bold cyan]\n"
+                f"   - [bold]Storage Path:[/bold] {storage_path}\n"
+                f"   - [bold]Model:[/bold] [yellow]{model_name}[/yellow]",
+                title="[bold]AssemblyAI Transcription[/bold]",
+                border_style="cyan",
+                expand=False,
+            )
+        )
+
+        try:
+            start_time = time.time()
+            transcript_id = await self.submit(storage_path, model_name)
+            result = await self.wait_for_transcript(
+                transcript_id, storage_path, model_name, audio_duration=audio_duration
+            )
+            total_time = time.time() - start_time
+            print(f"   [bold yellow]⏱️  TOTAL TIME: {total_time:.2f}s[/bold yellow]")
+            return result
 
         except httpx.HTTPStatusError as e:
             print(
@@ -12,6 +12,34 @@ from .time_parsing import (
 )
 from .retry_helpers import (
     retry_with_exponential_backoff,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    call_with_retry,
+    get_circuit_breaker,
+    get_resilience_metrics,
+    job_retry_budget,
+    set_retry_budget,
+    reset_retry_budget,
+)
+from .tracing import current_trace_id, open_span, start_span
+from .async_db import AsyncDBManager
+from .job_log_buffer import JobLogBuffer
+from .section_result_writer import (
+    SectionResultWriter,
+    get_section_persistence_mode,
+)
+from .rate_limiter import (
+    LLMRateLimiter,
+    RateLimitedLLM,
+    get_rate_limiter,
+    get_rate_limiter_metrics,
+    rate_limited,
+)
+from .cpu_executor import (
+    CPUExecutor,
+    get_cpu_executor,
+    shutdown_cpu_executor,
 )
 
 __all__ = [
@@ -27,4 +55,36 @@ __all__ = [
     
     # Retry helpers
     "retry_with_exponential_backoff",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "RetryBudget",
+    "call_with_retry",
+    "get_circuit_breaker",
+    "get_resilience_metrics",
+    "job_retry_budget",
+    "set_retry_budget",
+    "reset_retry_budget",
+
+    # Tracing
+    "current_trace_id",
+    "open_span",
+    "start_span",
+
+    # Async data access
+    "AsyncDBManager",
+    "JobLogBuffer",
+    "SectionResultWriter",
+    "get_section_persistence_mode",
+
+    # LLM rate limiting
+    "LLMRateLimiter",
+    "RateLimitedLLM",
+    "get_rate_limiter",
+    "get_rate_limiter_metrics",
+    "rate_limited",
+
+    # CPU executor
+    "CPUExecutor",
+    "get_cpu_executor",
+    "shutdown_cpu_executor",
 ]
\ No newline at end of file
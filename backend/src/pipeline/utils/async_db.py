@@ -0,0 +1,96 @@
+"""
+Awaitable access to the synchronous db_manager module.
+
+db_manager talks to Firestore through the blocking client. Calling it from
+pipeline coroutines stalls the event loop for every round trip, which
+serializes sections that are meant to run concurrently. AsyncDBManager runs
+each call on a bounded thread pool instead, with the same function names and
+arguments:
+
+    async_db = AsyncDBManager(db_manager)
+    job_doc = await async_db.get_job_status(user_id, job_id)
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from .tracing import start_span
+
+_db_executor: Optional[ThreadPoolExecutor] = None
+_db_executor_lock = threading.Lock()
+
+
+def _get_db_executor() -> ThreadPoolExecutor:
+    """Shared pool for Firestore calls, sized by DB_MAX_CONCURRENCY."""
+    global _db_executor
+    with _db_executor_lock:
+        if _db_executor is None:
+            try:
+                from ...config import settings
+                max_workers = settings.DB_MAX_CONCURRENCY
+            except (ImportError, AttributeError):
+                max_workers = int(os.getenv("DB_MAX_CONCURRENCY", "16"))
+            _db_executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="firestore"
+            )
+        return _db_executor
+
+
+class AsyncDBManager:
+    """
+    Awaitable facade over db_manager (or anything with the same functions).
+
+    Every function of the wrapped manager is available under the same name as
+    a coroutine function. Attributes are looked up on each call, so the
+    wrapped object can be swapped or patched freely. The Firestore client
+    itself is still reachable as ``.db``.
+    """
+
+    def __init__(self, db_manager, executor: Optional[ThreadPoolExecutor] = None):
+        self._db_manager = db_manager
+        self._executor = executor
+
+    @classmethod
+    def wrap(cls, db_manager) -> "AsyncDBManager":
+        """Return db_manager as an AsyncDBManager, wrapping it if needed."""
+        if isinstance(db_manager, cls):
+            return db_manager
+        return cls(db_manager)
+
+    @property
+    def sync(self):
+        """The wrapped synchronous manager."""
+        return self._db_manager
+
+    @property
+    def db(self):
+        """The underlying Firestore client."""
+        return self._db_manager.db
+
+    async def run(self, func, *args, **kwargs) -> Any:
+        """Run any blocking Firestore callable on the DB pool."""
+        loop = asyncio.get_running_loop()
+        # Carry context variables (e.g. tracing) into the worker thread
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await loop.run_in_executor(self._executor or _get_db_executor(), call)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        attr = getattr(self._db_manager, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            with start_span(f"firestore.{name}", **{"db.system": "firestore"}):
+                return await self.run(getattr(self._db_manager, name), *args, **kwargs)
+
+        call.__name__ = name
+        return call
@@ -0,0 +1,207 @@
+"""
+Executor for CPU-bound pipeline work.
+
+Transcript conversion, segmentation and quote timestamp matching are pure
+Python and can take seconds on long transcripts. Running them inline stalls
+the worker's event loop, which also serves task callbacks and health checks
+and runs other jobs. CPUExecutor moves that work off the loop:
+
+- "process": a pool of warm worker processes (default in the worker service)
+- "thread": a thread pool, for callables that cannot be pickled
+- "inline": run on the loop, as before (default for directly built pipelines)
+"""
+
+import asyncio
+import functools
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from rich import print
+
+# Package prefix of this tree ("src." in the services, "" when src/ is on sys.path)
+_PACKAGE_ROOT = __name__[: -len("pipeline.utils.cpu_executor")]
+
+# Modules imported by each worker process on startup so the first job does
+# not pay for them
+DEFAULT_WARM_MODULES = (
+    "rapidfuzz.fuzz",
+    f"{_PACKAGE_ROOT}find_quote_timestamps",
+    f"{_PACKAGE_ROOT}pipeline.orchestrators.analysis_pipeline",
+)
+
+
+def _warm_worker(modules: Iterable[str]):
+    """Process pool initializer: import the modules the pipeline will use."""
+    for module_name in modules:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            print(f"[yellow]CPU worker could not preload {module_name}: {e}[/yellow]")
+
+
+def _noop() -> int:
+    return os.getpid()
+
+
+class CPUExecutor:
+    """Runs CPU-bound callables away from the event loop and tracks how it goes."""
+
+    MODES = ("process", "thread", "inline")
+
+    def __init__(
+        self,
+        mode: str = "process",
+        max_workers: Optional[int] = None,
+        warm_modules: Iterable[str] = DEFAULT_WARM_MODULES,
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid CPU executor mode '{mode}'. Expected one of {self.MODES}")
+
+        self.mode = mode
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.warm_modules = tuple(warm_modules)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+        self._in_flight = 0
+        self._max_queue_depth = 0
+        self._tasks_completed = 0
+        self._tasks_failed = 0
+        self._pool_restarts = 0
+        self._off_loop_seconds = 0.0
+
+    @property
+    def uses_processes(self) -> bool:
+        """True when callables and their arguments must be picklable."""
+        return self.mode == "process"
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                if self.mode == "process":
+                    # spawn, not fork: the parent holds gRPC/Firestore threads
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_warm_worker,
+                        initargs=(self.warm_modules,),
+                    )
+                else:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="cpu-executor"
+                    )
+            return self._pool
+
+    def warm_up(self):
+        """Start every worker now instead of on the first job."""
+        if self.mode == "inline":
+            return
+        pool = self._get_pool()
+        futures = [pool.submit(_noop) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+        print(f"[green]CPU executor ready ({self.mode}, {self.max_workers} workers)[/green]")
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run func(*args, **kwargs) on the executor and await its result.
+
+        In process mode, func and its arguments must be picklable: pass
+        module-level functions or methods of plain objects.
+        """
+        if self.mode == "inline":
+            return func(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+
+        self._in_flight += 1
+        self._max_queue_depth = max(self._max_queue_depth, self.queue_depth)
+        submitted_at = time.monotonic()
+        try:
+            try:
+                result = await loop.run_in_executor(self._get_pool(), call)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM). Replace the pool and run this call
+                # in a thread so the job itself is not lost.
+                print("[yellow]CPU executor process pool broke; restarting it[/yellow]")
+                self._reset_pool()
+                result = await asyncio.to_thread(call)
+            self._tasks_completed += 1
+            return result
+        except Exception:
+            self._tasks_failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._off_loop_seconds += time.monotonic() - submitted_at
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker."""
+        return max(0, self._in_flight - self.max_workers)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Snapshot of executor usage since startup."""
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self._max_queue_depth,
+            "tasks_completed": self._tasks_completed,
+            "tasks_failed": self._tasks_failed,
+            "pool_restarts": self._pool_restarts,
+            "off_loop_seconds": round(self._off_loop_seconds, 3),
+        }
+
+    def _reset_pool(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+            self._pool_restarts += 1
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_cpu_executor: Optional[CPUExecutor] = None
+
+
+def get_cpu_executor() -> CPUExecutor:
+    """
+    Shared executor for the worker process, configured from settings.
+
+    CPU_EXECUTOR_MODE picks "process", "thread" or "inline" and
+    CPU_EXECUTOR_MAX_WORKERS sizes the pool.
+    """
+    global _cpu_executor
+    if _cpu_executor is None:
+        try:
+            from ...config import settings
+            mode = settings.CPU_EXECUTOR_MODE
+            max_workers = settings.CPU_EXECUTOR_MAX_WORKERS
+        except (ImportError, AttributeError):
+            mode = os.getenv("CPU_EXECUTOR_MODE", "process")
+            max_workers = int(os.getenv("CPU_EXECUTOR_MAX_WORKERS", "0")) or None
+        _cpu_executor = CPUExecutor(mode=mode, max_workers=max_workers)
+    return _cpu_executor
+
+
+def shutdown_cpu_executor():
+    """Shut down the shared executor, if it was created."""
+    global _cpu_executor
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown()
+        _cpu_executor = None
@@ -0,0 +1,116 @@
+"""
+Buffered progress logging for a single job.
+
+Each db_manager.log_progress call is one Firestore write and one blocking
+round trip, and a job emits dozens of them. JobLogBuffer collects a job's
+messages and writes them together in one batch when enough have piled up,
+when the oldest has waited long enough, or when the job ends.
+
+Every entry is stamped when it is logged, not when it is written, with
+strictly increasing timestamps and a sequence number, so the frontend's
+orderBy("timestamp") still shows messages in the order they were produced.
+"""
+
+import asyncio
+import datetime
+from typing import Any, Dict, List, Optional
+
+from rich import print
+
+
+class JobLogBuffer:
+    """Coalesces a job's progress messages into batched Firestore writes."""
+
+    DEFAULT_MAX_ENTRIES = 20
+    DEFAULT_FLUSH_INTERVAL_SECONDS = 2.0
+
+    def __init__(
+        self,
+        async_db,
+        user_id: str,
+        job_id: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+    ):
+        """
+        Args:
+            async_db: AsyncDBManager providing log_progress_batch
+            user_id: Owner of the job
+            job_id: Job whose logs subcollection receives the entries
+            max_entries: Flush as soon as this many entries are pending
+            flush_interval: Flush pending entries at most this many seconds
+                after the first of them was logged
+        """
+        self.async_db = async_db
+        self.user_id = user_id
+        self.job_id = job_id
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval
+
+        self._pending: List[Dict[str, Any]] = []
+        self._sequence = 0
+        self._last_timestamp: Optional[datetime.datetime] = None
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.entries_logged = 0
+        self.batches_written = 0
+
+    async def log(self, message: str):
+        """Queue a message; it is written within flush_interval seconds."""
+        if self._closed:
+            # Late messages after close are still written, just unbuffered
+            await self._write([self._make_entry(message)])
+            return
+
+        self._pending.append(self._make_entry(message))
+
+        if len(self._pending) >= self.max_entries:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_after_interval())
+
+    async def flush(self):
+        """Write all pending entries now."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            entries, self._pending = self._pending, []
+            await self._write(entries)
+
+    async def close(self):
+        """Flush remaining entries and stop the timer. Call when the job ends."""
+        self._closed = True
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        self._timer = None
+        await self.flush()
+
+    def _make_entry(self, message: str) -> Dict[str, Any]:
+        timestamp = datetime.datetime.now(datetime.timezone.utc)
+        # Keep timestamps strictly increasing so ordering by timestamp is
+        # stable even for messages logged within the same microsecond
+        if self._last_timestamp is not None and timestamp <= self._last_timestamp:
+            timestamp = self._last_timestamp + datetime.timedelta(microseconds=1)
+        self._last_timestamp = timestamp
+
+        self._sequence += 1
+        self.entries_logged += 1
+        return {"message": message, "timestamp": timestamp, "sequence": self._sequence}
+
+    async def _flush_after_interval(self):
+        try:
+            await asyncio.sleep(self.flush_interval)
+            # Once writing, finish even if close() cancels the timer
+            await asyncio.shield(self.flush())
+        except asyncio.CancelledError:
+            pass
+
+    async def _write(self, entries: List[Dict[str, Any]]):
+        try:
+            await self.async_db.log_progress_batch(self.user_id, self.job_id, entries)
+            self.batches_written += 1
+        except Exception as e:
+            # Progress logs are best-effort, like db_manager.log_progress
+            print(f"[yellow]Warning: Could not write {len(entries)} progress log entries: {e}[/yellow]")
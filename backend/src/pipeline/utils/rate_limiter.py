@@ -0,0 +1,408 @@
+"""
+Process-wide LLM rate limiting.
+
+Every job on a worker shares the same Gemini quotas, so per-job concurrency
+limits are not enough: a few jobs running together still exceed the
+requests-per-minute and tokens-per-minute allowed for a model and get
+ResourceExhausted errors. LLMRateLimiter keeps two token buckets per model
+(requests and estimated tokens) and makes callers wait for capacity before
+a request is sent. RateLimitedLLM wraps a chat model so every chain built
+on it (prompt | llm | parser) goes through the limiter.
+
+Buckets live in a store. The default keeps them in memory for this process;
+SQLiteBucketStore keeps them in a local database file, so several worker
+processes on one host can share a quota. Its calls can wait on the file lock,
+so async callers make them on a worker thread.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.caches import BaseCache
+from langchain_core.globals import get_llm_cache
+from langchain_core.load import dumps
+from langchain_core.runnables import Runnable, RunnableConfig
+from rich import print
+
+from .tracing import start_span
+
+# Rough characters-per-token ratio for estimating prompt size before sending
+CHARS_PER_TOKEN = 4
+# Output tokens reserved per request until the real usage is known
+DEFAULT_OUTPUT_TOKENS = 1024
+
+# (key, amount, capacity, refill per second)
+BucketRequest = Tuple[str, float, float, float]
+
+
+class InMemoryBucketStore:
+    """Token buckets for this process."""
+
+    # Calls only hold a thread lock briefly, so async callers make them inline
+    blocking = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def take(self, requests: List[BucketRequest]) -> float:
+        """
+        Take from all buckets at once, or from none.
+        Returns 0 on success, otherwise the seconds to wait before retrying.
+        """
+        now = time.monotonic()
+        with self._lock:
+            levels = {}
+            wait = 0.0
+            for key, amount, capacity, rate in requests:
+                tokens, updated = self._buckets.get(key, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated) * rate)
+                levels[key] = tokens
+                if tokens < amount:
+                    wait = max(wait, (amount - tokens) / rate)
+            for key, amount, _, _ in requests:
+                self._buckets[key] = (levels[key] - (0 if wait else amount), now)
+            return wait
+
+    def adjust(self, key: str, delta: float, capacity: float, rate: float):
+        """Add delta to a bucket; negative values leave it in debt."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            self._buckets[key] = (min(capacity, tokens + delta), now)
+
+
+class SQLiteBucketStore:
+    """Token buckets in a SQLite file shared by processes on one host."""
+
+    # BEGIN IMMEDIATE may wait up to the connection timeout for other processes
+    blocking = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL, updated REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _levels(self, conn, requests, now) -> Dict[str, float]:
+        levels = {}
+        for key, _, capacity, rate in requests:
+            row = conn.execute(
+                "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            levels[key] = min(capacity, tokens + max(0.0, now - updated) * rate)
+        return levels
+
+    def take(self, requests: List[BucketRequest]) -> float:
+        # Wall-clock time, since monotonic clocks differ between processes
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            levels = self._levels(conn, requests, now)
+            wait = 0.0
+            for key, amount, _, rate in requests:
+                if levels[key] < amount:
+                    wait = max(wait, (amount - levels[key]) / rate)
+            for key, amount, _, _ in requests:
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                    (key, levels[key] - (0 if wait else amount), now),
+                )
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def adjust(self, key: str, delta: float, capacity: float, rate: float):
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            level = self._levels(conn, [(key, 0, capacity, rate)], now)[key]
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                (key, min(capacity, level + delta), now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+class LLMRateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one model."""
+
+    def __init__(self, model_name: str, rpm: int, tpm: int, store=None):
+        self.model_name = model_name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.store = store or InMemoryBucketStore()
+
+        self.requests = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def _requests_for(self, estimated_tokens: int) -> List[BucketRequest]:
+        # A single oversized request may use the whole minute, but no more
+        tokens = min(float(estimated_tokens), float(self.tpm))
+        return [
+            (f"{self.model_name}:rpm", 1.0, float(self.rpm), self.rpm / 60.0),
+            (f"{self.model_name}:tpm", tokens, float(self.tpm), self.tpm / 60.0),
+        ]
+
+    async def _call_store(self, method, *args):
+        """Call a store method without blocking the event loop."""
+        if getattr(self.store, "blocking", False):
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def acquire(self, estimated_tokens: int):
+        """Wait until the model has capacity for one request of this size."""
+        requests = self._requests_for(estimated_tokens)
+        started = None
+        while True:
+            wait = await self._call_store(self.store.take, requests)
+            if not wait:
+                break
+            if started is None:
+                started = time.monotonic()
+                self.waits += 1
+            await asyncio.sleep(wait)
+        if started is not None:
+            self.wait_seconds += time.monotonic() - started
+        self.requests += 1
+
+    def acquire_sync(self, estimated_tokens: int):
+        """Blocking acquire for synchronous callers on worker threads."""
+        requests = self._requests_for(estimated_tokens)
+        while True:
+            wait = self.store.take(requests)
+            if not wait:
+                break
+            self.waits += 1
+            self.wait_seconds += wait
+            time.sleep(wait)
+        self.requests += 1
+
+    def _adjustment(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        if actual_tokens is None:
+            return None
+        delta = min(estimated_tokens, self.tpm) - actual_tokens
+        if not delta:
+            return None
+        return f"{self.model_name}:tpm", delta, float(self.tpm), self.tpm / 60.0
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """Correct the token bucket once the real usage of a request is known."""
+        adjustment = self._adjustment(estimated_tokens, actual_tokens)
+        if adjustment:
+            self.store.adjust(*adjustment)
+
+    async def areconcile(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """Async reconcile for callers on the event loop."""
+        adjustment = self._adjustment(estimated_tokens, actual_tokens)
+        if adjustment:
+            await self._call_store(self.store.adjust, *adjustment)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "requests": self.requests,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+def estimate_tokens(llm_input: Any) -> int:
+    """Rough token count for a prompt value, message list or string."""
+    if hasattr(llm_input, "to_string"):
+        text = llm_input.to_string()
+    elif isinstance(llm_input, (list, tuple)):
+        text = " ".join(str(getattr(m, "content", m)) for m in llm_input)
+    else:
+        text = str(llm_input)
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _usage_tokens(output: Any) -> Optional[int]:
+    usage = getattr(output, "usage_metadata", None)
+    if usage:
+        return usage.get("total_tokens")
+    return None
+
+
+def _cache_lookup_args(llm: Any, input: Any, kwargs: Dict[str, Any]):
+    """
+    The cache (prompt, llm_string) pair the chat model will use for this call,
+    or None if its cache cannot answer without counting a lookup.
+    """
+    cache = getattr(llm, "cache", False)
+    if cache is False or not hasattr(llm, "_get_llm_string"):
+        return None, None
+    if not isinstance(cache, BaseCache):
+        cache = get_llm_cache()
+    if not hasattr(cache, "acontains"):
+        return None, None
+    try:
+        messages = llm._convert_input(input).to_messages()
+        llm_string = llm._get_llm_string(**{"stop": None, **kwargs})
+    except Exception:
+        return None, None
+    return cache, (dumps(messages), llm_string)
+
+
+def _record_usage(span, output: Any):
+    usage = getattr(output, "usage_metadata", None) or {}
+    span.set_attribute("llm.input_tokens", usage.get("input_tokens"))
+    span.set_attribute("llm.output_tokens", usage.get("output_tokens"))
+    metadata = getattr(output, "response_metadata", None) or {}
+    span.set_attribute("llm.cache", metadata.get("llm_cache", "miss"))
+
+
+class RateLimitedLLM(Runnable):
+    """
+    Chat model wrapper that waits for the model's rate limiter before each call.
+    Calls the LLM cache can answer are not sent to the provider, so they skip the limiter.
+    Each call is traced as an llm.call span.
+    """
+
+    def __init__(self, llm: Runnable, limiter: LLMRateLimiter, output_tokens: int = DEFAULT_OUTPUT_TOKENS):
+        self.llm = llm
+        self.limiter = limiter
+        self.output_tokens = output_tokens
+
+    @property
+    def InputType(self):
+        return self.llm.InputType
+
+    @property
+    def OutputType(self):
+        return self.llm.OutputType
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        with start_span("llm.call", **{"llm.model": self.limiter.model_name}) as span:
+            cache, args = _cache_lookup_args(self.llm, input, kwargs)
+            if cache is not None and cache.contains(*args):
+                span.set_attribute("llm.cache", "hit")
+                return self.llm.invoke(input, config, **kwargs)
+            estimated = estimate_tokens(input) + self.output_tokens
+            started = time.monotonic()
+            self.limiter.acquire_sync(estimated)
+            span.set_attribute("llm.rate_limit_wait_s", time.monotonic() - started)
+            output = self.llm.invoke(input, config, **kwargs)
+            self.limiter.reconcile(estimated, _usage_tokens(output))
+            _record_usage(span, output)
+            return output
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        with start_span("llm.call", **{"llm.model": self.limiter.model_name}) as span:
+            cache, args = _cache_lookup_args(self.llm, input, kwargs)
+            if cache is not None and await cache.acontains(*args):
+                span.set_attribute("llm.cache", "hit")
+                return await self.llm.ainvoke(input, config, **kwargs)
+            estimated = estimate_tokens(input) + self.output_tokens
+            started = time.monotonic()
+            await self.limiter.acquire(estimated)
+            span.set_attribute("llm.rate_limit_wait_s", time.monotonic() - started)
+            output = await self.llm.ainvoke(input, config, **kwargs)
+            await self.limiter.areconcile(estimated, _usage_tokens(output))
+            _record_usage(span, output)
+            return output
+
+    def __getattr__(self, name: str) -> Any:
+        # Anything else (model name, temperature, ...) comes from the model
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+
+_limiters: Dict[str, LLMRateLimiter] = {}
+_limiters_lock = threading.Lock()
+_store = None
+
+
+def _get_store():
+    global _store
+    if _store is None:
+        try:
+            from ...config import settings
+            location = settings.LLM_RATE_LIMIT_STORE
+        except (ImportError, AttributeError):
+            location = os.getenv("LLM_RATE_LIMIT_STORE", "memory")
+        if location.startswith("sqlite:///"):
+            _store = SQLiteBucketStore(location[len("sqlite:///"):])
+        else:
+            _store = InMemoryBucketStore()
+    return _store
+
+
+def _get_app_config():
+    try:
+        from ...config import app_config
+        return app_config
+    except ImportError:
+        return None
+
+
+def resolve_model_name(model: str) -> str:
+    """Model name for an AppConfig.LLM_MODELS alias such as "best-lite"."""
+    app_config = _get_app_config()
+    models = getattr(app_config, "LLM_MODELS", {})
+    return models.get(model, model)
+
+
+def _get_limits(model_name: str) -> Optional[Dict[str, int]]:
+    app_config = _get_app_config()
+    return getattr(app_config, "LLM_RATE_LIMITS", {}).get(model_name)
+
+
+def get_rate_limiter(model: str) -> Optional[LLMRateLimiter]:
+    """
+    Shared limiter for a model name or AppConfig.LLM_MODELS alias,
+    or None if the model has no configured limits.
+    """
+    model_name = resolve_model_name(model)
+    with _limiters_lock:
+        if model_name not in _limiters:
+            limits = _get_limits(model_name)
+            if not limits:
+                return None
+            _limiters[model_name] = LLMRateLimiter(
+                model_name, limits["rpm"], limits["tpm"], store=_get_store()
+            )
+        return _limiters[model_name]
+
+
+def rate_limited(llm: Runnable, model: str) -> Runnable:
+    """Wrap llm with the shared limiter for a model name or alias, if limits are configured."""
+    if isinstance(llm, RateLimitedLLM):
+        return llm
+    limiter = get_rate_limiter(model)
+    if limiter is None:
+        print(f"[yellow]No rate limits configured for '{model}'; calls are not limited.[/yellow]")
+        return llm
+    return RateLimitedLLM(llm, limiter)
+
+
+def get_rate_limiter_metrics() -> Dict[str, Any]:
+    with _limiters_lock:
+        return {name: limiter.get_metrics() for name, limiter in _limiters.items()}
@@ -0,0 +1,161 @@
+"""
+Batched persistence of section results for a single job.
+
+By default every analysed section is saved with its own Firestore set() as
+soon as it finishes. For jobs with many short sections, SectionResultWriter
+instead groups finished sections and commits them together in WriteBatch
+writes, once enough results or bytes have piled up, once the oldest result
+has waited max_latency seconds, or when the section step ends.
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, Dict, Optional
+
+from rich import print
+
+PERSISTENCE_MODES = ("immediate", "batched")
+
+
+def get_section_persistence_mode() -> str:
+    """Configured section persistence mode: "immediate" or "batched"."""
+    try:
+        from ...config import settings
+        mode = settings.SECTION_RESULT_PERSISTENCE
+    except (ImportError, AttributeError):
+        mode = os.getenv("SECTION_RESULT_PERSISTENCE", "immediate")
+    return mode if mode in PERSISTENCE_MODES else "immediate"
+
+
+class SectionResultWriter:
+    """Coalesces a job's section results into batched Firestore commits."""
+
+    DEFAULT_MAX_RESULTS = 10
+    DEFAULT_MAX_BYTES = 4_000_000
+    DEFAULT_MAX_LATENCY_SECONDS = 5.0
+
+    def __init__(
+        self,
+        async_db,
+        user_id: str,
+        job_id: str,
+        max_results: int = DEFAULT_MAX_RESULTS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_latency: float = DEFAULT_MAX_LATENCY_SECONDS,
+    ):
+        """
+        Args:
+            async_db: AsyncDBManager providing save_section_results_batch
+            user_id: Owner of the job
+            job_id: Job whose results subcollection receives the sections
+            max_results: Commit as soon as this many results are pending
+            max_bytes: Commit as soon as the pending results' estimated size
+                reaches this (Firestore rejects requests over 10 MiB)
+            max_latency: Commit pending results at most this many seconds
+                after the first of them was saved
+        """
+        self.async_db = async_db
+        self.user_id = user_id
+        self.job_id = job_id
+        self.max_results = max_results
+        self.max_bytes = max_bytes
+        self.max_latency = max_latency
+
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._pending_bytes = 0
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+        self.results_saved = 0
+        self.batches_written = 0
+
+    @classmethod
+    def from_settings(cls, async_db, user_id: str, job_id: str) -> "SectionResultWriter":
+        """Writer with limits taken from the SECTION_RESULT_BATCH_* settings."""
+        try:
+            from ...config import settings
+            limits = {
+                "max_results": settings.SECTION_RESULT_BATCH_MAX_RESULTS,
+                "max_bytes": settings.SECTION_RESULT_BATCH_MAX_BYTES,
+                "max_latency": settings.SECTION_RESULT_BATCH_MAX_LATENCY,
+            }
+        except (ImportError, AttributeError):
+            limits = {}
+        return cls(async_db, user_id, job_id, **limits)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def save(self, section_index: int, section_data: Dict[str, Any]):
+        """
+        Queue a section result; it is committed within max_latency seconds.
+        A failed commit does not fail the section: it is retried later.
+        """
+        self._pending[section_index] = section_data
+        self._pending_bytes += len(json.dumps(section_data, default=str))
+
+        if len(self._pending) >= self.max_results or self._pending_bytes >= self.max_bytes:
+            try:
+                await self.flush()
+                return
+            except Exception as e:
+                # Results stay pending and are retried by the timer or close()
+                print(f"[yellow]Warning: Could not save {len(self._pending)} section results yet: {e}[/yellow]")
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_after_latency())
+
+    async def flush(self):
+        """Commit all pending results now. Failed results stay pending."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            results, self._pending = self._pending, {}
+            pending_bytes, self._pending_bytes = self._pending_bytes, 0
+            try:
+                await self.async_db.save_section_results_batch(
+                    self.user_id, self.job_id, results
+                )
+            except Exception:
+                # Anything queued since takes precedence over the failed copy
+                self._pending = {**results, **self._pending}
+                self._pending_bytes += pending_bytes
+                raise
+            self.results_saved += len(results)
+            self.batches_written += 1
+
+    async def close(self):
+        """
+        Commit everything still pending. Call when the section step ends.
+
+        If the batched commit fails, each result is retried with its own write
+        before giving up; the error is raised if any result could not be saved.
+        """
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        self._timer = None
+
+        try:
+            await self.flush()
+            return
+        except Exception as e:
+            print(f"[yellow]Warning: Batched save of {len(self._pending)} section results failed: {e}. Saving individually.[/yellow]")
+
+        results, self._pending, self._pending_bytes = self._pending, {}, 0
+        for section_index, section_data in sorted(results.items()):
+            await self.async_db.save_section_result(
+                self.user_id, self.job_id, section_index, section_data
+            )
+            self.results_saved += 1
+
+    async def _flush_after_latency(self):
+        try:
+            await asyncio.sleep(self.max_latency)
+            # Once writing, finish even if close() cancels the timer
+            await asyncio.shield(self.flush())
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            # Results stay pending and are retried by the next flush or close()
+            print(f"[yellow]Warning: Could not save {len(self._pending)} section results yet: {e}[/yellow]")
@@ -0,0 +1,12 @@
+"""
+Tracing helpers.
+
+The implementation lives in src/tracing.py, shared with the API and worker
+routes; this module keeps the import path pipeline code uses.
+"""
+
+try:
+    from ...tracing import current_trace_id, open_span, start_span
+except ImportError:
+    # pipeline imported as a top-level package (src/ on sys.path)
+    from tracing import current_trace_id, open_span, start_span
@@ -0,0 +1,440 @@
+"""
+Retries, retry budgets and circuit breakers for calls to external providers.
+
+retry_with_exponential_backoff works on both coroutine functions and plain
+functions. Coroutines are retried with asyncio.sleep so the event loop keeps
+running; plain functions (which run on worker threads) use time.sleep.
+Delays use full jitter: a random wait between zero and an exponentially
+growing cap, which spreads out retries from calls that failed together.
+
+A job can set a RetryBudget to cap the total number of retries made on its
+behalf, and each provider (Gemini, Tavily, AssemblyAI) has a CircuitBreaker
+that fails calls fast after repeated give-ups instead of queueing more
+retries against a provider that is down.
+"""
+
+import asyncio
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+import httpx
+from google.api_core import exceptions as google_exceptions
+from rich import print
+
+try:
+    from .tracing import start_span
+except ImportError:
+    # imported as a top-level module (src/ on sys.path)
+    from tracing import start_span
+
+# HTTP statuses worth retrying: rate limits and transient server errors
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+TRANSIENT_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+    httpx.TimeoutException,
+    httpx.TransportError,
+    ConnectionError,
+    TimeoutError,
+    json.JSONDecodeError,
+)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """True for errors that are likely to succeed on a later attempt."""
+    if isinstance(error, TRANSIENT_EXCEPTIONS):
+        return True
+    response = getattr(error, "response", None)
+    status_code = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    return status_code in TRANSIENT_STATUS_CODES
+
+
+def full_jitter_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Random delay in [0, min(max_delay, base_delay * 2**attempt)]."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(
+            f"Circuit breaker for '{provider}' is open; retry in {retry_after:.0f}s"
+        )
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one provider.
+
+    After failure_threshold calls in a row have given up, the breaker opens
+    and calls fail immediately for reset_timeout seconds. It then lets a
+    single trial call through (half-open); success closes it again, failure
+    reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self):
+        """Raise CircuitOpenError if the call should not be attempted."""
+        with self._lock:
+            if self._state == self.OPEN:
+                elapsed = time.monotonic() - self._opened_at
+                if elapsed < self.reset_timeout:
+                    self.short_circuited += 1
+                    raise CircuitOpenError(self.name, self.reset_timeout - elapsed)
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    self.short_circuited += 1
+                    raise CircuitOpenError(self.name, self.reset_timeout)
+                self._trial_in_flight = True
+            self.calls += 1
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._consecutive_failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.times_opened += 1
+                    print(f"[bold red]Circuit breaker for '{self.name}' opened after {self._consecutive_failures} failures.[/bold red]")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def reset(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "short_circuited": self.short_circuited,
+            "times_opened": self.times_opened,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Shared circuit breaker for a provider such as "gemini" or "tavily"."""
+    with _breakers_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(provider)
+        return _breakers[provider]
+
+
+class RetryBudget:
+    """Caps the total number of retries made on behalf of one job."""
+
+    def __init__(self, max_retries: int):
+        self.max_retries = max_retries
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.used >= self.max_retries:
+                return False
+            self.used += 1
+            return True
+
+    @property
+    def exhausted(self) -> bool:
+        return self.used >= self.max_retries
+
+
+_retry_budget: contextvars.ContextVar[Optional[RetryBudget]] = contextvars.ContextVar(
+    "retry_budget", default=None
+)
+
+
+def job_retry_budget() -> RetryBudget:
+    """A fresh budget sized by the RETRY_BUDGET_PER_JOB setting."""
+    try:
+        from .config import settings
+        max_retries = settings.RETRY_BUDGET_PER_JOB
+    except (ImportError, AttributeError):
+        max_retries = int(os.getenv("RETRY_BUDGET_PER_JOB", "40"))
+    return RetryBudget(max_retries)
+
+
+def set_retry_budget(budget: Optional[RetryBudget]) -> contextvars.Token:
+    """
+    Apply a retry budget to the current context, e.g. one analysis job.
+    Tasks and threads started from this context share it. Pass the returned
+    token to reset_retry_budget when the job ends.
+    """
+    return _retry_budget.set(budget)
+
+
+def reset_retry_budget(token: contextvars.Token):
+    _retry_budget.reset(token)
+
+
+def get_retry_budget() -> Optional[RetryBudget]:
+    return _retry_budget.get()
+
+
+def get_resilience_metrics() -> Dict[str, Any]:
+    """Retry and circuit breaker counters for every provider seen so far."""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.get_metrics() for name, breaker in breakers.items()}
+
+
+def _failure_default(func: Callable, return_empty_dict_on_failure: bool):
+    if not return_empty_dict_on_failure:
+        return None
+    # Special handling for specific function types
+    if "verify_claim" in func.__name__ or "generate_contextual_briefing" in func.__name__:
+        return {"summary": "Failed after multiple retries.", "perspectives": []}
+    return {}
+
+
+class _RetryState:
+    """Per-call bookkeeping shared by the sync and async wrappers."""
+
+    def __init__(self, func, provider, max_retries, base_delay, max_delay, retry_on):
+        self.name = getattr(func, "__name__", repr(func))
+        self.breaker = get_circuit_breaker(provider) if provider else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+
+    def should_retry(self, error: BaseException) -> bool:
+        if self.retry_on is not None:
+            return isinstance(error, self.retry_on)
+        return is_transient_error(error)
+
+    def next_delay(self, attempt: int, error: BaseException) -> Optional[float]:
+        """Delay before the next attempt, or None to give up now."""
+        if attempt + 1 >= self.max_retries:
+            return None
+        budget = get_retry_budget()
+        if budget is not None and not budget.try_acquire():
+            print(f"[bold red]Retry budget of {budget.max_retries} exhausted; not retrying '{self.name}'.[/bold red]")
+            return None
+        if self.breaker:
+            self.breaker.record_retry()
+        wait_time = full_jitter_delay(attempt, self.base_delay, self.max_delay)
+        error_type = (
+            "Rate limit hit"
+            if isinstance(error, google_exceptions.ResourceExhausted)
+            else "JSON parsing error"
+            if isinstance(error, json.JSONDecodeError)
+            else f"{type(error).__name__}"
+        )
+        print(
+            f"[yellow]{error_type}. Retrying in {wait_time:.2f} seconds... "
+            f"(Attempt {attempt + 1}/{self.max_retries})[/yellow]"
+        )
+        return wait_time
+
+    def on_unexpected(self, error: BaseException):
+        print(
+            f"[bold red]An unexpected error occurred in '{self.name}': {error}. "
+            f"Skipping retries for this call.[/bold red]"
+        )
+
+    def on_give_up(self, transient: bool):
+        if self.breaker:
+            # Only provider trouble counts towards opening the breaker; a
+            # non-retryable error means the provider did answer
+            if transient:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+        print(
+            f"[bold red]Max retries reached or fatal error occurred for '{self.name}'. "
+            f"Returning a default value.[/bold red]"
+        )
+
+
+def retry_with_exponential_backoff(
+    max_retries: int = 5,
+    base_delay: float = 2,
+    return_empty_dict_on_failure: bool = True,
+    max_delay: float = 60,
+    provider: Optional[str] = None,
+    retry_on: Optional[Tuple[Type[BaseException], ...]] = None,
+):
+    """
+    Decorator for retrying sync or async functions with full-jitter backoff.
+
+    Args:
+        max_retries: Total attempts before giving up
+        base_delay: Cap of the first backoff delay; doubles per attempt
+        return_empty_dict_on_failure: Return {} (or the claim-verification
+            default) instead of None when all attempts fail
+        max_delay: Upper bound for any single delay
+        provider: Circuit breaker and metrics bucket, e.g. "gemini"
+        retry_on: Exception types to retry; defaults to is_transient_error
+
+    Can also be applied bare, as @retry_with_exponential_backoff.
+    """
+    if callable(max_retries):
+        # Used without parentheses
+        return retry_with_exponential_backoff()(max_retries)
+
+    def decorator(func: Callable) -> Callable:
+        state = _RetryState(func, provider, max_retries, base_delay, max_delay, retry_on)
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                try:
+                    if state.breaker:
+                        state.breaker.before_call()
+                except CircuitOpenError as e:
+                    print(f"[bold red]{e}. Skipping '{func.__name__}'.[/bold red]")
+                    return _failure_default(func, return_empty_dict_on_failure)
+
+                transient = False
+                for attempt in range(max_retries):
+                    try:
+                        result = await func(*args, **kwargs)
+                        if state.breaker:
+                            state.breaker.record_success()
+                        return result
+                    except Exception as e:
+                        transient = state.should_retry(e)
+                        if not transient:
+                            state.on_unexpected(e)
+                            break
+                        wait_time = state.next_delay(attempt, e)
+                        if wait_time is None:
+                            break
+                        await asyncio.sleep(wait_time)
+
+                state.on_give_up(transient)
+                return _failure_default(func, return_empty_dict_on_failure)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            try:
+                if state.breaker:
+                    state.breaker.before_call()
+            except CircuitOpenError as e:
+                print(f"[bold red]{e}. Skipping '{func.__name__}'.[/bold red]")
+                return _failure_default(func, return_empty_dict_on_failure)
+
+            transient = False
+            for attempt in range(max_retries):
+                try:
+                    result = func(*args, **kwargs)
+                    if state.breaker:
+                        state.breaker.record_success()
+                    return result
+                except Exception as e:
+                    transient = state.should_retry(e)
+                    if not transient:
+                        state.on_unexpected(e)
+                        break
+                    wait_time = state.next_delay(attempt, e)
+                    if wait_time is None:
+                        break
+                    time.sleep(wait_time)
+
+            state.on_give_up(transient)
+            return _failure_default(func, return_empty_dict_on_failure)
+
+        return wrapper
+
+    return decorator
+
+
+async def call_with_retry(
+    provider: str,
+    func: Callable,
+    *args,
+    max_retries: int = 4,
+    base_delay: float = 1,
+    max_delay: float = 30,
+    **kwargs,
+) -> Any:
+    """
+    Await func(*args, **kwargs) with retries and the provider's circuit breaker.
+
+    Unlike the decorator this re-raises the last error (or CircuitOpenError)
+    instead of returning a default, for callers with their own error handling.
+    """
+    breaker = get_circuit_breaker(provider)
+    breaker.before_call()
+    state = _RetryState(func, provider, max_retries, base_delay, max_delay, None)
+
+    for attempt in range(max_retries):
+        try:
+            with start_span(f"{provider}.request", provider=provider, attempt=attempt + 1):
+                result = await func(*args, **kwargs)
+            breaker.record_success()
+            return result
+        except Exception as e:
+            transient = state.should_retry(e)
+            wait_time = state.next_delay(attempt, e) if transient else None
+            if wait_time is None:
+                if transient:
+                    breaker.record_failure()
+                else:
+                    # The provider answered; a bad request is not an outage
+                    breaker.record_success()
+                raise
+            await asyncio.sleep(wait_time)
@@ -1,15 +1,20 @@
 import os
 import json
+import time
 from google.cloud import tasks_v2
-from google.protobuf import duration_pb2
+from google.protobuf import duration_pb2, timestamp_pb2
 
 tasks_client = tasks_v2.CloudTasksClient()
 
 
-def create_analysis_task(user_id: str, job_id: str):
+def create_analysis_task(
+    user_id: str, job_id: str, delay_seconds: int = 0, trace_id: str = None
+):
     """
     Creates a new task in the Google Cloud Tasks queue.
     This version uses the root service URL for the OIDC token audience.
+    With delay_seconds the task is dispatched that many seconds from now.
+    trace_id is passed to the worker so the job's spans share one trace.
     """
     try:
         # --- 1. Read all configuration from environment variables ---
@@ -48,6 +53,8 @@ def create_analysis_task(user_id: str, job_id: str):
         # --- END FIX ---
 
         payload = {"user_id": user_id, "job_id": job_id}
+        if trace_id:
+            payload["trace_id"] = trace_id
 
         # --- 3. Define the full task object ---
         task = {
@@ -63,6 +70,10 @@ def create_analysis_task(user_id: str, job_id: str):
             },
             "dispatch_deadline": duration_pb2.Duration(seconds=15 * 60),
         }
+        if delay_seconds:
+            schedule_time = timestamp_pb2.Timestamp()
+            schedule_time.FromSeconds(int(time.time()) + int(delay_seconds))
+            task["schedule_time"] = schedule_time
 
         # --- 4. Create the task ---
         print(
@@ -0,0 +1,292 @@
+"""
+Tracing for analysis jobs across the API, Cloud Tasks and the worker.
+
+A job passes through three processes: the API creates it, Cloud Tasks
+delivers it, and a worker runs the pipeline. The API starts a trace and puts
+its ID in the task payload (create_analysis_task's trace_id), so the
+worker's spans join the same trace. Spans are opened for pipeline stages and
+sections, every LLM call (RateLimitedLLM), every Firestore call
+(AsyncDBManager) and every provider request made through call_with_retry
+(AssemblyAI, Tavily).
+
+Finished spans are appended to a local file as OTLP/JSON, one
+ExportTraceServiceRequest per line. That is the format the OpenTelemetry
+Collector's file exporter writes and its otlpjsonfile receiver reads, so a
+trace file can be loaded into any OTLP backend. Nothing is recorded unless
+TRACING_EXPORT_PATH is set; trace IDs are still propagated.
+
+    with trace_context(trace_id):
+        with start_span("job.run_analysis", job_id=job_id):
+            ...
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from rich import print
+
+# The span new spans are created under, and the trace of the current task
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "tracing_current_span", default=None
+)
+_current_trace_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "tracing_trace_id", default=None
+)
+
+_exporter: Optional["JSONLinesSpanExporter"] = None
+
+SCOPE_NAME = "transcript-analysis"
+
+
+def new_trace_id() -> str:
+    """A random 128-bit trace ID as 32 hex characters."""
+    return os.urandom(16).hex()
+
+
+def is_valid_trace_id(trace_id: Any) -> bool:
+    if not isinstance(trace_id, str) or len(trace_id) != 32:
+        return False
+    try:
+        return int(trace_id, 16) != 0
+    except ValueError:
+        return False
+
+
+def current_trace_id() -> Optional[str]:
+    """Trace ID of the current span or trace context, if any."""
+    span = _current_span.get()
+    if span is not None:
+        return span.trace_id
+    return _current_trace_id.get()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON encodes 64-bit integers as strings
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"key": key, "value": _otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_span_id: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self):
+        if self.end_time_ns is None:
+            self.end_time_ns = time.time_ns()
+            if _exporter is not None:
+                _exporter.export([self])
+
+    @property
+    def duration_seconds(self) -> float:
+        end = self.end_time_ns if self.end_time_ns is not None else time.time_ns()
+        return (end - self.start_time_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or self.start_time_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            # STATUS_CODE_ERROR or STATUS_CODE_UNSET
+            "status": {"code": 2, "message": self.error} if self.error else {},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+class _NonRecordingSpan:
+    """Stands in for a span while tracing is off."""
+
+    name = ""
+    span_id = None
+    parent_span_id = None
+    attributes: Dict[str, Any] = {}
+
+    def __init__(self, trace_id: Optional[str]):
+        self.trace_id = trace_id
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def record_error(self, error: BaseException):
+        pass
+
+    def end(self):
+        pass
+
+
+class JSONLinesSpanExporter:
+    """Appends finished spans to a file as OTLP/JSON, one request per line."""
+
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+        self.exported = 0
+
+    def export(self, spans: List[Span]):
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes({"service.name": self.service_name})
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": SCOPE_NAME},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        line = json.dumps(request, separators=(",", ":"), default=str)
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.exported += len(spans)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def tracing_enabled() -> bool:
+    return _exporter is not None
+
+
+@contextmanager
+def trace_context(trace_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Make trace_id the current trace (a new one if it is missing or invalid)
+    and yield it. Spans opened inside are roots of, or descend from, it.
+    """
+    if not is_valid_trace_id(trace_id):
+        trace_id = new_trace_id()
+    trace_token = _current_trace_id.set(trace_id)
+    span_token = _current_span.set(None)
+    try:
+        yield trace_id
+    finally:
+        _current_span.reset(span_token)
+        _current_trace_id.reset(trace_token)
+
+
+def open_span(name: str, **attributes: Any):
+    """
+    Start a span under the current one without making it current, for
+    operations that end in a different callback than they start in. The
+    caller must call .end().
+    """
+    parent = _current_span.get()
+    trace_id = parent.trace_id if parent is not None else _current_trace_id.get()
+    if _exporter is None:
+        return _NonRecordingSpan(trace_id)
+    return Span(
+        name,
+        trace_id or new_trace_id(),
+        parent.span_id if parent is not None else None,
+        attributes,
+    )
+
+
+@contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Time the enclosed block as a child of the current span. Works in sync
+    and async code; tasks created inside inherit the span as their parent.
+    An exception escaping the block marks the span as failed.
+    """
+    span = open_span(name, **attributes)
+    if isinstance(span, _NonRecordingSpan):
+        yield span
+        return
+
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+def _get_export_path() -> Optional[str]:
+    try:
+        from .config import settings
+        return settings.TRACING_EXPORT_PATH
+    except (ImportError, AttributeError):
+        return os.getenv("TRACING_EXPORT_PATH")
+
+
+def configure_tracing(
+    service_name: str, export_path: Optional[str] = None
+) -> Optional[JSONLinesSpanExporter]:
+    """
+    Start writing spans to export_path (default: the TRACING_EXPORT_PATH
+    setting). Tracing stays off if neither is set.
+    """
+    global _exporter
+    path = export_path or _get_export_path()
+    shutdown_tracing()
+    if not path:
+        return None
+    _exporter = JSONLinesSpanExporter(path, service_name)
+    print(f"INFO:     Tracing enabled; writing spans to {path}.")
+    return _exporter
+
+
+def shutdown_tracing():
+    """Stop recording spans and close the trace file."""
+    global _exporter
+    exporter, _exporter = _exporter, None
+    if exporter is not None:
+        exporter.close()
@@ -1,8 +1,20 @@
 import re
+import time
 import httpx
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 import os
 
+try:
+    from src.http_clients import get_http_client
+except ImportError:
+    from http_clients import get_http_client
+
+# Video metadata rarely changes, so recent lookups are kept in memory
+METADATA_CACHE_TTL_SECONDS = 6 * 3600
+METADATA_CACHE_MAX_ENTRIES = 1024
+_metadata_cache: "OrderedDict[str, Tuple[float, Dict[str, str]]]" = OrderedDict()
+
 def extract_youtube_video_id(url: str) -> Optional[str]:
     """Extract YouTube video ID from various YouTube URL formats."""
     patterns = [
@@ -17,13 +29,41 @@ def extract_youtube_video_id(url: str) -> Optional[str]:
     
     return None
 
-async def fetch_youtube_metadata(video_id: str) -> Dict[str, str]:
-    """Fetch YouTube video metadata using YouTube Data API v3."""
+def _get_cached_metadata(video_id: str) -> Optional[Dict[str, str]]:
+    entry = _metadata_cache.get(video_id)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        del _metadata_cache[video_id]
+        return None
+    _metadata_cache.move_to_end(video_id)
+    return dict(entry[1])
+
+
+def _cache_metadata(video_id: str, metadata: Dict[str, str]):
+    _metadata_cache[video_id] = (time.monotonic() + METADATA_CACHE_TTL_SECONDS, dict(metadata))
+    _metadata_cache.move_to_end(video_id)
+    while len(_metadata_cache) > METADATA_CACHE_MAX_ENTRIES:
+        _metadata_cache.popitem(last=False)
+
+
+async def fetch_youtube_metadata(
+    video_id: str, client: Optional[httpx.AsyncClient] = None
+) -> Dict[str, str]:
+    """
+    Fetch YouTube video metadata using YouTube Data API v3.
+    Uses the shared "youtube" HTTP client unless one is given, and serves
+    recently fetched videos from an in-memory cache.
+    """
     api_key = os.getenv('YOUTUBE_API_KEY')
     
     if not api_key:
         print("WARNING: YouTube API key not found. Skipping metadata fetch.")
         return {}
+
+    cached = _get_cached_metadata(video_id)
+    if cached is not None:
+        return cached
     
     url = f"https://www.googleapis.com/youtube/v3/videos"
     params = {
@@ -33,34 +73,36 @@ async def fetch_youtube_metadata(video_id: str) -> Dict[str, str]:
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            if not data.get('items'):
-                print(f"WARNING: No YouTube metadata found for video ID: {video_id}")
-                return {}
-            
-            video_item = data['items'][0]
-            snippet = video_item.get('snippet', {})
-            content_details = video_item.get('contentDetails', {})
-            
-            # Get the best available thumbnail
-            thumbnails = snippet.get('thumbnails', {})
-            thumbnail_url = (
-                thumbnails.get('high', {}).get('url') or
-                thumbnails.get('medium', {}).get('url') or
-                thumbnails.get('default', {}).get('url') or
-                ""
-            )
-            
-            return {
-                'title': snippet.get('title', ''),
-                'channel_name': snippet.get('channelTitle', ''),
-                'thumbnail_url': thumbnail_url,
-                'duration': content_details.get('duration', '')
-            }
+        client = client or get_http_client("youtube")
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
+        
+        if not data.get('items'):
+            print(f"WARNING: No YouTube metadata found for video ID: {video_id}")
+            return {}
+        
+        video_item = data['items'][0]
+        snippet = video_item.get('snippet', {})
+        content_details = video_item.get('contentDetails', {})
+        
+        # Get the best available thumbnail
+        thumbnails = snippet.get('thumbnails', {})
+        thumbnail_url = (
+            thumbnails.get('high', {}).get('url') or
+            thumbnails.get('medium', {}).get('url') or
+            thumbnails.get('default', {}).get('url') or
+            ""
+        )
+        
+        metadata = {
+            'title': snippet.get('title', ''),
+            'channel_name': snippet.get('channelTitle', ''),
+            'thumbnail_url': thumbnail_url,
+            'duration': content_details.get('duration', '')
+        }
+        _cache_metadata(video_id, metadata)
+        return metadata
             
     except Exception as e:
         print(f"ERROR: Failed to fetch YouTube metadata for video {video_id}: {e}")
@@ -4,12 +4,25 @@ from src.new_pipeline import run_full_analysis  # Updated to use refactored pipe
 from src.security import verify_gcp_task_request
 from src.features import grade_open_ended_response
 from src import clients
+from src.llm_cache import get_llm_cache_metrics
+from src.pipeline.services.transcript import WEBHOOK_SECRET_HEADER
+from src.pipeline.utils import (
+    AsyncDBManager,
+    get_cpu_executor,
+    get_rate_limiter_metrics,
+    get_resilience_metrics,
+)
 from langchain_core.runnables import RunnableConfig
 from langchain.callbacks.base import BaseCallbackHandler
+from src.config import settings
 import asyncio
+import hmac
 
 router = APIRouter()
 
+# Firestore calls from the async routes go through a thread pool
+async_db = AsyncDBManager(db_manager)
+
 
 @router.get("/health", status_code=200)
 async def worker_health_check():
@@ -31,6 +44,10 @@ async def worker_health_check():
             "has_db_connection": db_manager.db is not None,
             "worker_service_url": os.getenv("WORKER_SERVICE_URL")
         },
+        "cpu_executor": get_cpu_executor().get_metrics(),
+        "providers": get_resilience_metrics(),
+        "llm_rate_limits": get_rate_limiter_metrics(),
+        "llm_cache": get_llm_cache_metrics(),
         "message": "Worker service is running and ready to process analysis tasks"
     }
 
@@ -56,7 +73,7 @@ async def run_analysis_worker(
 
     # --- This logic to fetch the persona remains the same ---
     try:
-        job_doc = db_manager.get_job_status(user_id, job_id)
+        job_doc = await async_db.get_job_status(user_id, job_id)
         if not job_doc:
             raise HTTPException(status_code=404, detail=f"Job {job_id} not found.")
 
@@ -65,7 +82,7 @@ async def run_analysis_worker(
         analysis_persona = config.get("analysis_persona", "general")
 
     except Exception as e:
-        db_manager.update_job_status(
+        await async_db.update_job_status(
             user_id, job_id, "FAILED", f"Could not read job config: {e}"
         )
         raise HTTPException(
@@ -81,11 +98,54 @@ async def run_analysis_worker(
         user_id=user_id,
         job_id=job_id,
         persona=analysis_persona,  # <-- 3. Pass the persona as an argument
+        job_doc=job_doc,
+        trace_id=body.get("trace_id"),
     )
 
     return {"status": "acknowledged", "job_id": job_id}
 
 
+@router.post("/assemblyai-webhook", status_code=200)
+async def assemblyai_webhook(request: Request, user_id: str, job_id: str):
+    """
+    Called by AssemblyAI when a transcript submitted in webhook mode finishes.
+    Queues an analysis task that resumes the job; the request itself is
+    authenticated by the shared secret header sent with the webhook.
+    """
+    secret = settings.ASSEMBLYAI_WEBHOOK_SECRET
+    received = request.headers.get(WEBHOOK_SECRET_HEADER, "")
+    if not secret or not hmac.compare_digest(received, secret):
+        raise HTTPException(status_code=401, detail="Invalid webhook secret")
+
+    body = await request.json()
+    transcript_id = body.get("transcript_id")
+
+    job_doc = await async_db.get_job_status(user_id, job_id)
+    if (
+        not job_doc
+        or not job_doc.get("awaiting_transcription")
+        or job_doc.get("assemblyai_transcript_id") != transcript_id
+    ):
+        # Already resumed (e.g. by the fallback task) or not ours; a non-2xx
+        # answer would only make AssemblyAI retry
+        print(f"INFO: Ignoring AssemblyAI webhook for job {job_id} (transcript {transcript_id})")
+        return {"status": "ignored", "job_id": job_id}
+
+    print(
+        f"INFO: AssemblyAI transcript {transcript_id} is {body.get('status')}; resuming job {job_id}"
+    )
+    # Imported here: creating the Cloud Tasks client needs GCP credentials
+    from src import task_manager
+
+    await asyncio.to_thread(
+        task_manager.create_analysis_task,
+        user_id,
+        job_id,
+        trace_id=job_doc.get("trace_id"),
+    )
+    return {"status": "resumed", "job_id": job_id}
+
+
 # --- NEW: Open-Ended Grading Worker ---
 
 @router.post("/grade-open-ended", status_code=200)
@@ -108,15 +168,15 @@ async def grade_open_ended_worker(
 
     try:
         # Update grading status to PROCESSING in the new subcollection
-        db_manager.update_open_ended_grading(user_id, job_id, question_id, "PROCESSING")
+        await async_db.update_open_ended_grading(user_id, job_id, question_id, "PROCESSING")
         
         # Get the question data from the new subcollection
-        question_data = db_manager.get_open_ended_question_status(user_id, job_id, question_id)
+        question_data = await async_db.get_open_ended_question_status(user_id, job_id, question_id)
         if not question_data:
             raise HTTPException(status_code=404, detail=f"Question {question_id} not found in job {job_id}.")
 
         # Get the analysis job to retrieve section data and questions
-        job_doc = db_manager.get_job_status(user_id, job_id)
+        job_doc = await async_db.get_job_status(user_id, job_id)
         if not job_doc:
             raise HTTPException(status_code=404, detail=f"Job {job_id} not found.")
 
@@ -141,7 +201,7 @@ async def grade_open_ended_worker(
         print(f"DEBUG: Found target question {question_id}: {target_question.get('question', 'No question text')}")
             
         # Get section results to find the relevant section for context
-        section_results = db_manager.get_job_results_from_subcollection(user_id, job_id)
+        section_results = await async_db.get_job_results_from_subcollection(user_id, job_id)
         if not section_results:
             raise HTTPException(status_code=404, detail=f"No section results found for job {job_id}.")
             
@@ -184,14 +244,14 @@ async def grade_open_ended_worker(
         )
 
         # Update grading status with results in the new subcollection
-        db_manager.update_open_ended_grading(user_id, job_id, question_id, "COMPLETED", grading_result)
+        await async_db.update_open_ended_grading(user_id, job_id, question_id, "COMPLETED", grading_result)
 
         return {"status": "completed", "job_id": job_id, "question_id": question_id, "result": grading_result}
 
     except Exception as e:
         # Update grading status to FAILED in the new subcollection
         try:
-            db_manager.update_open_ended_grading(user_id, job_id, question_id, "FAILED")
+            await async_db.update_open_ended_grading(user_id, job_id, question_id, "FAILED")
         except Exception as update_error:
             print(f"WARNING: Failed to update grading status to FAILED: {update_error}")
         
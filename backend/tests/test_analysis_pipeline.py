@@ -30,6 +30,7 @@ with patch.dict('sys.modules', {
         raw_transcript: Optional[str] = None
         config: Optional[Dict[str, Any]] = None
         model_choice: str = "universal"
+        audio_duration_seconds: Optional[float] = None
         
         def __post_init__(self):
             if self.config is None:
@@ -320,7 +321,9 @@ class TestInputProcessing(unittest.TestCase):
             )
             
             # Verify calls
-            self.pipeline.audio_processor.transcribe.assert_called_with("gs://bucket/audio.mp3", "universal")
+            self.pipeline.audio_processor.transcribe.assert_called_with(
+                "gs://bucket/audio.mp3", "universal", audio_duration=None
+            )
             
             # Verify cost metrics updated
             self.assertEqual(cost_metrics["assemblyai_audio_seconds"], 60)
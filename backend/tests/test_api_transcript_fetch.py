@@ -0,0 +1,118 @@
+"""
+Unit tests for the async transcript fetch in api_routes.py
+
+test_api_routes.py replaces the route dependencies with mocks, which FastAPI
+rejects; these tests import api_routes with its real models instead.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import unittest
+from unittest.mock import patch, Mock, AsyncMock
+
+# Creating the Cloud Tasks client needs GCP credentials and db_manager pulls
+# in the real Cloud Storage client; neither is used by these tests
+sys.modules.setdefault('src.task_manager', Mock())
+sys.modules.setdefault('src.db_manager', Mock())
+
+with patch.dict(os.environ, {
+    'DATIMP_USER': 'user',
+    'DATIMP_PASS': 'pass',
+    'DATIMP_HOST': 'proxy.local',
+    'DATIMP_PORT': '8080',
+}):
+    import api_routes
+
+
+class TestAsyncTranscriptFetching(unittest.TestCase):
+    """Test the non-blocking transcript fetch used by the async endpoint."""
+
+    @patch('api_routes.asyncio.sleep', new_callable=AsyncMock)
+    @patch('api_routes.time.sleep')
+    @patch('api_routes._fetch_transcript_once')
+    def test_retries_without_blocking_the_loop(self, mock_fetch, mock_sleep, mock_async_sleep):
+        """Test failed attempts back off with asyncio.sleep, never time.sleep."""
+        mock_transcript = [{"text": "Hello", "start": 0.0, "duration": 1.0}]
+        mock_fetch.side_effect = [Exception("Proxy error"), mock_transcript]
+
+        result = asyncio.run(api_routes.fetch_transcript_async("video", deadline_seconds=5))
+
+        self.assertEqual(result, mock_transcript)
+        self.assertEqual(mock_fetch.call_count, 2)
+        mock_sleep.assert_not_called()
+        self.assertEqual(mock_async_sleep.await_count, 1)
+
+    @patch('api_routes._fetch_transcript_once')
+    def test_deadline_stops_slow_fetches(self, mock_fetch):
+        """Test a fetch that outlives its deadline raises TimeoutError."""
+        import time as real_time
+        mock_fetch.side_effect = lambda video_id, language: real_time.sleep(0.5)
+
+        with self.assertRaises(TimeoutError):
+            asyncio.run(api_routes.fetch_transcript_async("video", deadline_seconds=0.1))
+
+    @patch('api_routes.requests.Session.request')
+    def test_youtube_requests_have_timeouts(self, mock_request):
+        """Test every request made for a fetch carries the connect and read timeouts."""
+        session = api_routes._youtube_http_client()
+        session.get("https://www.youtube.com/watch?v=video")
+
+        self.assertEqual(
+            mock_request.call_args.kwargs["timeout"],
+            (
+                api_routes.settings.YOUTUBE_FETCH_CONNECT_TIMEOUT_SECONDS,
+                api_routes.settings.YOUTUBE_FETCH_READ_TIMEOUT_SECONDS,
+            ),
+        )
+
+    @patch('api_routes._fetch_transcript_once')
+    def test_attempts_run_on_the_fetch_threads(self, mock_fetch):
+        """Test attempts never use the event loop's default executor."""
+        import threading
+        mock_fetch.side_effect = lambda video_id, language: threading.current_thread().name
+
+        thread_name = asyncio.run(api_routes.fetch_transcript_async("video", deadline_seconds=5))
+
+        self.assertTrue(thread_name.startswith("youtube-fetch"))
+
+
+class TestTranscriptDetailsEndpoint(unittest.TestCase):
+    """Test the /get-transcript-details request flow."""
+
+    @patch('api_routes.fetch_youtube_metadata')
+    @patch('api_routes._fetch_transcript_once')
+    @patch('api_routes.db_manager')
+    def test_transcript_and_metadata_are_fetched_concurrently(self, mock_db_manager, mock_fetch, mock_metadata):
+        """Test the metadata request overlaps the transcript fetch."""
+        import time as real_time
+        mock_db_manager.get_stored_youtube_transcript.return_value = None
+
+        def slow_fetch(video_id, language):
+            real_time.sleep(0.3)
+            return [{"text": "Hello", "start": 0.0, "duration": 1.0}]
+
+        async def slow_metadata(video_id):
+            await asyncio.sleep(0.3)
+            return {"title": "Video"}
+
+        mock_fetch.side_effect = slow_fetch
+        mock_metadata.side_effect = slow_metadata
+        background_tasks = api_routes.BackgroundTasks()
+        request = api_routes.TranscriptDetailRequest(video_id="video")
+
+        started = real_time.monotonic()
+        asyncio.run(api_routes.get_transcript_and_cache(request, background_tasks))
+
+        self.assertLess(real_time.monotonic() - started, 0.55)
+        mock_db_manager.db.collection.return_value.document.return_value.set.assert_called_once()
+        # The shared store is written after the response is sent
+        mock_db_manager.save_youtube_transcript.assert_not_called()
+        self.assertEqual(len(background_tasks.tasks), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
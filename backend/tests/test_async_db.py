@@ -0,0 +1,89 @@
+"""
+Unit tests for the awaitable db_manager facade in pipeline/utils/async_db.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from pipeline.utils.async_db import AsyncDBManager
+
+
+class TestAsyncDBManager(unittest.TestCase):
+    """Test AsyncDBManager delegation and concurrency."""
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=5)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_delegates_calls_off_the_event_loop(self):
+        """Test calls reach the wrapped manager on a worker thread."""
+        calls = []
+
+        def get_job_status(user_id, job_id):
+            calls.append(threading.current_thread().name)
+            return {"user": user_id, "job": job_id}
+
+        manager = SimpleNamespace(get_job_status=get_job_status, db="client")
+        async_db = AsyncDBManager(manager, self.executor)
+
+        result = asyncio.run(async_db.get_job_status("user_1", job_id="job_1"))
+
+        self.assertEqual(result, {"user": "user_1", "job": "job_1"})
+        self.assertNotEqual(calls[0], threading.current_thread().name)
+        self.assertEqual(async_db.db, "client")
+        self.assertIs(async_db.sync, manager)
+
+    def test_calls_overlap(self):
+        """Test blocking calls from concurrent coroutines run in parallel."""
+        manager = SimpleNamespace(log_progress=lambda *args: time.sleep(0.2))
+        async_db = AsyncDBManager(manager, self.executor)
+
+        async def log_many():
+            await asyncio.gather(*(async_db.log_progress("u", "j", str(i)) for i in range(5)))
+
+        started = time.monotonic()
+        asyncio.run(log_many())
+
+        self.assertLess(time.monotonic() - started, 0.6)
+
+    def test_exceptions_propagate(self):
+        """Test errors from the wrapped manager reach the caller."""
+        def update_job_status(*args):
+            raise ConnectionError("Database client not initialized.")
+
+        async_db = AsyncDBManager(SimpleNamespace(update_job_status=update_job_status), self.executor)
+
+        with self.assertRaises(ConnectionError):
+            asyncio.run(async_db.update_job_status("u", "j", "FAILED"))
+
+    def test_attributes_resolved_per_call(self):
+        """Test patched functions on the wrapped object are picked up."""
+        manager = Mock()
+        async_db = AsyncDBManager(manager, self.executor)
+        manager.get_section_result.return_value = {"generated_title": "Intro"}
+
+        result = asyncio.run(async_db.get_section_result("u", "j", "section_000"))
+
+        self.assertEqual(result, {"generated_title": "Intro"})
+        manager.get_section_result.assert_called_once_with("u", "j", "section_000")
+
+    def test_wrap_is_idempotent(self):
+        """Test wrapping an AsyncDBManager returns it unchanged."""
+        async_db = AsyncDBManager(SimpleNamespace())
+        self.assertIs(AsyncDBManager.wrap(async_db), async_db)
+        self.assertIsInstance(AsyncDBManager.wrap(SimpleNamespace()), AsyncDBManager)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+"""
+Unit tests for AssemblyAI transcription in pipeline/services/transcript/audio_processor.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import io
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+
+import json
+
+import httpx
+
+from pipeline.services.transcript.audio_processor import (
+    AssemblyAIProcessor,
+    TranscriptPollSchedule,
+    WEBHOOK_SECRET_HEADER,
+)
+
+
+class FakeBlob:
+    """GCS blob whose reader records the largest read."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.reads = []
+
+    def open(self, mode, chunk_size=None):
+        reader = io.BytesIO(self.data)
+        read = reader.read
+
+        def tracked_read(size):
+            chunk = read(size)
+            self.reads.append(len(chunk))
+            return chunk
+
+        reader.read = tracked_read
+        return reader
+
+
+class TestStreamingUpload(unittest.TestCase):
+    """Test audio is piped from GCS to the upload request in chunks."""
+
+    def setUp(self):
+        self.uploaded = []
+        self.attempts = 0
+
+        async def handler(request):
+            self.attempts += 1
+            body = b""
+            async for chunk in request.stream:
+                body += chunk
+            if self.attempts == 1 and self.fail_first:
+                return httpx.Response(503)
+            self.uploaded.append(body)
+            return httpx.Response(200, json={"upload_url": "https://cdn.assemblyai.com/upload/1"})
+
+        self.fail_first = False
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch.dict(os.environ, {"GCP_STORAGE_BUCKET_NAME": "bucket"}):
+            self.processor = AssemblyAIProcessor("key", self.client, Mock())
+
+    def test_file_is_streamed_in_chunks(self):
+        data = os.urandom(10_000)
+        blob = FakeBlob(data)
+
+        async def run():
+            stream = self.processor._stream_blob(blob, chunk_size=1024)
+            return [chunk async for chunk in stream]
+
+        chunks = asyncio.run(run())
+
+        self.assertEqual(b"".join(chunks), data)
+        self.assertLessEqual(max(blob.reads), 1024)
+        self.assertEqual(len(chunks), 10)
+
+    @patch('resilience.asyncio.sleep', new_callable=AsyncMock)
+    def test_upload_retries_with_a_fresh_stream(self, mock_sleep):
+        """Test a failed upload re-reads the object from the start."""
+        self.fail_first = True
+        data = b"audio" * 1000
+
+        url = asyncio.run(self.processor._upload_from_gcs(FakeBlob(data), {"authorization": "key"}))
+
+        self.assertEqual(url, "https://cdn.assemblyai.com/upload/1")
+        self.assertEqual(self.attempts, 2)
+        self.assertEqual(self.uploaded, [data])
+
+
+class TestTranscriptCompletion(unittest.TestCase):
+    """Test submitting transcripts and collecting the result."""
+
+    def setUp(self):
+        self.requests = []
+        self.statuses = []
+
+        async def handler(request):
+            self.requests.append(request)
+            if request.url.path == "/v2/upload":
+                async for _ in request.stream:
+                    pass
+                return httpx.Response(200, json={"upload_url": "https://cdn.assemblyai.com/upload/1"})
+            if request.method == "POST":
+                return httpx.Response(200, json={"id": "tr_1", "status": "queued"})
+            return httpx.Response(200, json=self.statuses.pop(0))
+
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        gcs_client = Mock()
+        gcs_client.bucket.return_value.blob.return_value = FakeBlob(b"audio")
+        with patch.dict(os.environ, {"GCP_STORAGE_BUCKET_NAME": "bucket"}):
+            self.processor = AssemblyAIProcessor("key", self.client, gcs_client)
+
+    def test_submit_registers_the_webhook(self):
+        transcript_id = asyncio.run(
+            self.processor.submit(
+                "audio/a.mp3",
+                webhook_url="https://worker/api/tasks/assemblyai-webhook?job_id=j",
+                webhook_secret="s3cret",
+            )
+        )
+
+        self.assertEqual(transcript_id, "tr_1")
+        payload = json.loads(self.requests[-1].content)
+        self.assertEqual(payload["webhook_url"], "https://worker/api/tasks/assemblyai-webhook?job_id=j")
+        self.assertEqual(payload["webhook_auth_header_name"], WEBHOOK_SECRET_HEADER)
+        self.assertEqual(payload["webhook_auth_header_value"], "s3cret")
+
+    def test_submit_without_webhook_leaves_payload_unchanged(self):
+        asyncio.run(self.processor.submit("audio/a.mp3"))
+
+        payload = json.loads(self.requests[-1].content)
+        self.assertNotIn("webhook_url", payload)
+
+    @patch('pipeline.services.transcript.audio_processor.asyncio.sleep', new_callable=AsyncMock)
+    def test_finished_transcript_is_collected_without_waiting(self, mock_sleep):
+        """Test a resumed job fetches its transcript straight away."""
+        self.statuses = [{"status": "completed", "text": "hi", "audio_duration": 3}]
+
+        result = asyncio.run(self.processor.wait_for_transcript("tr_1", initial_delay=0))
+
+        self.assertEqual(result["utterances"], [{"speaker": "A", "text": "hi"}])
+        mock_sleep.assert_not_called()
+
+    @patch('pipeline.services.transcript.audio_processor.asyncio.sleep', new_callable=AsyncMock)
+    def test_failed_transcript_raises(self, mock_sleep):
+        self.statuses = [{"status": "processing"}, {"status": "error", "error": "bad audio"}]
+
+        with self.assertRaises(Exception) as ctx:
+            asyncio.run(self.processor.wait_for_transcript("tr_1"))
+
+        self.assertIn("bad audio", str(ctx.exception))
+        self.assertEqual(mock_sleep.await_count, 2)
+        self.assertEqual(self.processor.last_poll_metrics["transcription_polls"], 2)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTranscriptPollSchedule(unittest.TestCase):
+    """Test status checks are paced around the expected finish."""
+
+    def delays(self, schedule, clock, count):
+        result = []
+        for _ in range(count):
+            delay = schedule.next_delay()
+            result.append(delay)
+            clock.now += delay
+        return result
+
+    def test_checks_are_sparse_early_and_frequent_near_the_finish(self):
+        clock = FakeClock()
+        # One hour of audio with the universal model: ~550s expected
+        schedule = TranscriptPollSchedule(3600, "universal", clock=clock)
+        expected = schedule.expected_seconds
+
+        checks = []
+        while clock.now < expected + 5:
+            clock.now += schedule.next_delay()
+            checks.append(clock.now)
+
+        early = [t for t in checks if t < expected / 2]
+        self.assertLessEqual(len(early), 10)
+        # The check after the expected finish comes within two seconds of it
+        self.assertLess(min(t for t in checks if t >= expected) - expected, 2.0)
+        self.assertLess(len(checks), 30)
+
+    def test_expectation_depends_on_model(self):
+        self.assertLess(
+            TranscriptPollSchedule(600, "nano").expected_seconds,
+            TranscriptPollSchedule(600, "slam-1").expected_seconds,
+        )
+
+    def test_interval_backs_off_after_the_expected_finish(self):
+        clock = FakeClock()
+        schedule = TranscriptPollSchedule(60, "universal", clock=clock)
+        clock.now = schedule.expected_seconds + 1
+
+        delays = self.delays(schedule, clock, 12)
+
+        self.assertEqual(delays[0], 1.0)
+        self.assertEqual(delays, sorted(delays))
+        self.assertEqual(delays[-1], 30.0)
+
+    def test_deadline_stops_polling(self):
+        clock = FakeClock()
+        schedule = TranscriptPollSchedule(None, deadline_seconds=100, clock=clock)
+
+        with self.assertRaises(TimeoutError):
+            self.delays(schedule, clock, 50)
+        self.assertEqual(clock.now, 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Unit tests for the CPU executor in pipeline/utils/cpu_executor.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import unittest
+
+from pipeline.utils.cpu_executor import CPUExecutor
+from find_quote_timestamps import (
+    add_timestamps_to_notable_quotes,
+    add_timestamps_with_cached_index,
+)
+
+
+TRANSCRIPT = [
+    {"text": "welcome to the show", "start": 0.0, "duration": 10.0},
+    {"text": "consistency beats intensity every time", "start": 10.0, "duration": 10.0},
+]
+
+
+class TestCPUExecutor(unittest.TestCase):
+    """Test CPUExecutor modes and metrics."""
+
+    def test_invalid_mode(self):
+        """Test unknown modes are rejected."""
+        with self.assertRaises(ValueError):
+            CPUExecutor(mode="gpu")
+
+    def test_inline_mode_runs_on_loop(self):
+        """Test inline mode calls the function directly."""
+        executor = CPUExecutor(mode="inline")
+        result = asyncio.run(executor.run(sorted, [3, 1, 2], reverse=True))
+
+        self.assertEqual(result, [3, 2, 1])
+        self.assertFalse(executor.uses_processes)
+        self.assertEqual(executor.get_metrics()["tasks_completed"], 0)
+
+    def test_thread_mode_records_metrics(self):
+        """Test thread mode runs work off the loop and counts it."""
+        executor = CPUExecutor(mode="thread", max_workers=2)
+
+        async def run_many():
+            return await asyncio.gather(*(executor.run(pow, 2, n) for n in range(5)))
+
+        try:
+            self.assertEqual(asyncio.run(run_many()), [1, 2, 4, 8, 16])
+        finally:
+            executor.shutdown()
+
+        metrics = executor.get_metrics()
+        self.assertEqual(metrics["tasks_completed"], 5)
+        self.assertEqual(metrics["in_flight"], 0)
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertGreaterEqual(metrics["max_queue_depth"], 1)
+
+    def test_failures_are_counted_and_raised(self):
+        """Test exceptions propagate to the caller."""
+        executor = CPUExecutor(mode="thread", max_workers=1)
+        try:
+            with self.assertRaises(ValueError):
+                asyncio.run(executor.run(int, "not a number"))
+        finally:
+            executor.shutdown()
+        self.assertEqual(executor.get_metrics()["tasks_failed"], 1)
+
+    def test_process_mode_timestamp_matching(self):
+        """Test timestamp helpers run in worker processes with a cached index."""
+        executor = CPUExecutor(mode="process", max_workers=1, warm_modules=())
+        quotes = [{"quote": "consistency beats intensity", "timestamp": "00:00"}]
+
+        async def run_twice():
+            return [
+                await executor.run(
+                    add_timestamps_to_notable_quotes,
+                    quotes,
+                    TRANSCRIPT,
+                    None,
+                    (10.0, 20.0),
+                    index_cache_key="job-1",
+                )
+                for _ in range(2)
+            ]
+
+        try:
+            executor.warm_up()
+            results = asyncio.run(run_twice())
+        finally:
+            executor.shutdown()
+
+        self.assertTrue(executor.uses_processes)
+        self.assertEqual(results[0][0]["timestamp"], "00:10")
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(executor.get_metrics()["tasks_completed"], 2)
+
+    def test_process_mode_ships_transcript_once(self):
+        """Test a worker only needs the transcript until it has cached the index."""
+        executor = CPUExecutor(mode="process", max_workers=1, warm_modules=())
+        quotes = [{"quote": "consistency beats intensity", "timestamp": "00:00"}]
+        args = (add_timestamps_to_notable_quotes, quotes, "job-2", len(TRANSCRIPT), (10.0, 20.0))
+
+        async def run():
+            missing = await executor.run(add_timestamps_with_cached_index, *args)
+            first = await executor.run(
+                add_timestamps_with_cached_index, *args, structured_transcript=TRANSCRIPT
+            )
+            cached = await executor.run(add_timestamps_with_cached_index, *args)
+            return missing, first, cached
+
+        try:
+            missing, first, cached = asyncio.run(run())
+        finally:
+            executor.shutdown()
+
+        self.assertIsNone(missing)
+        self.assertEqual(first[0]["timestamp"], "00:10")
+        self.assertEqual(cached, first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -194,6 +194,22 @@ class TestJobManagement(unittest.TestCase):
         self.mock_collection.document.assert_called_with(job_id)
         self.mock_document.delete.assert_called_once()
     
+    def test_update_job_fields(self):
+        """Test updating arbitrary job fields."""
+        db_manager.update_job_fields("test_user", "job_123", {"show_notes": {"chapters": []}})
+
+        self.mock_db.collection.assert_called_with("saas_users/test_user/jobs")
+        self.mock_collection.document.assert_called_with("job_123")
+        self.mock_document.update.assert_called_with({"show_notes": {"chapters": []}})
+
+    def test_update_job_fields_touch(self):
+        """Test touch=True also sets updatedAt."""
+        db_manager.update_job_fields("test_user", "job_123", {"status": "COMPLETED"}, touch=True)
+
+        update_call_args = self.mock_document.update.call_args[0][0]
+        self.assertEqual(update_call_args["status"], "COMPLETED")
+        self.assertIn("updatedAt", update_call_args)
+
     def test_update_job_status_basic(self):
         """Test basic job status update."""
         user_id = "test_user"
@@ -330,6 +346,54 @@ class TestSectionResults(unittest.TestCase):
         self.assertEqual(results[0], {"section": 1, "title": "Section 1"})
         self.assertEqual(results[1], {"section": 2, "title": "Section 2"})
     
+    def test_list_section_results(self):
+        """Test listing section results in document order."""
+        mock_docs = [Mock(), Mock()]
+        mock_docs[0].to_dict.return_value = {"generated_title": "First"}
+        mock_docs[1].to_dict.return_value = {"generated_title": "Second"}
+        self.mock_collection.get.return_value = mock_docs
+
+        results = db_manager.list_section_results("test_user", "job_123")
+
+        self.mock_db.collection.assert_called_with("saas_users/test_user/jobs/job_123/results")
+        self.assertEqual(
+            results, [{"generated_title": "First"}, {"generated_title": "Second"}]
+        )
+
+    def test_save_section_results_batch(self):
+        """Test several sections are written in one batch with ordered document IDs."""
+        mock_batch = Mock()
+        self.mock_db.batch.return_value = mock_batch
+
+        db_manager.save_section_results_batch(
+            "test_user", "job_123", {2: {"generated_title": "C"}, 0: {"generated_title": "A"}}
+        )
+
+        self.mock_document.collection.assert_called_with("results")
+        results_ref = self.mock_document.collection.return_value
+        document_ids = [c[0][0] for c in results_ref.document.call_args_list]
+        self.assertEqual(document_ids, ["section_000", "section_002"])
+        self.assertEqual(mock_batch.set.call_count, 2)
+        mock_batch.commit.assert_called_once()
+
+    def test_get_section_results_by_id(self):
+        """Test loading all section results keyed by document ID."""
+        mock_docs = [Mock(id="section_000"), Mock(id="section_002")]
+        mock_docs[0].to_dict.return_value = {"generated_title": "First"}
+        mock_docs[1].to_dict.return_value = {"generated_title": "Third"}
+        self.mock_collection.get.return_value = mock_docs
+
+        results = db_manager.get_section_results_by_id("test_user", "job_123")
+
+        self.mock_db.collection.assert_called_with("saas_users/test_user/jobs/job_123/results")
+        self.assertEqual(
+            results,
+            {
+                "section_000": {"generated_title": "First"},
+                "section_002": {"generated_title": "Third"},
+            },
+        )
+
     def test_get_section_result_exists(self):
         """Test getting specific section result when it exists."""
         user_id = "test_user"
@@ -619,6 +683,24 @@ class TestUtilityFunctions(unittest.TestCase):
         self.assertEqual(add_call_args["message"], message)
         self.assertIn("timestamp", add_call_args)
     
+    def test_log_progress_batch(self):
+        """Test writing several log entries in one batch."""
+        mock_collection = Mock()
+        mock_batch = Mock()
+        self.mock_db.collection.return_value = mock_collection
+        self.mock_db.batch.return_value = mock_batch
+        entries = [
+            {"message": "first", "timestamp": 1, "sequence": 1},
+            {"message": "second", "timestamp": 2, "sequence": 2},
+        ]
+
+        db_manager.log_progress_batch("test_user", "job_123", entries)
+
+        self.mock_db.collection.assert_called_with("saas_users/test_user/jobs/job_123/logs")
+        self.assertEqual(mock_batch.set.call_count, 2)
+        self.assertEqual(mock_batch.set.call_args_list[1][0][1], entries[1])
+        mock_batch.commit.assert_called_once()
+
     def test_log_progress_no_db(self):
         """Test logging progress when database is not available."""
         db_manager.db = None
@@ -715,6 +797,64 @@ class TestTranscriptCache(unittest.TestCase):
         self.assertIsNone(result)
 
 
+
+class TestYouTubeTranscriptStore(unittest.TestCase):
+    """Test the shared YouTube transcript store."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_db = Mock()
+        db_manager.db = self.mock_db
+        self.mock_document = self.mock_db.collection.return_value.document.return_value
+
+    @patch.object(db_manager, 'settings')
+    def test_large_transcripts_round_trip_compressed(self, mock_settings):
+        """Test transcripts above the threshold are stored compressed and read back."""
+        mock_settings.YOUTUBE_TRANSCRIPT_STORE_TTL_DAYS = 30
+        mock_settings.YOUTUBE_TRANSCRIPT_COMPRESS_MIN_BYTES = 1000
+        transcript = [{"text": f"line {i}", "start": float(i), "duration": 1.0} for i in range(200)]
+
+        self.assertTrue(
+            db_manager.save_youtube_transcript("vid", "en", transcript, 1500, {"title": "T"})
+        )
+        self.mock_db.collection.assert_called_with("youtube_transcripts")
+        self.mock_db.collection.return_value.document.assert_called_with("vid_en")
+        saved = self.mock_document.set.call_args[0][0]
+        self.assertNotIn("structured_transcript", saved)
+        self.assertIn("transcript_zlib", saved)
+
+        mock_doc = Mock()
+        mock_doc.exists = True
+        mock_doc.to_dict.return_value = dict(saved)
+        self.mock_document.get.return_value = mock_doc
+
+        stored = db_manager.get_stored_youtube_transcript("vid", "en")
+        self.assertEqual(stored["structured_transcript"], transcript)
+        self.assertEqual(stored["metadata"], {"title": "T"})
+
+    @patch.object(db_manager, 'settings')
+    def test_small_transcripts_are_stored_as_is(self, mock_settings):
+        mock_settings.YOUTUBE_TRANSCRIPT_STORE_TTL_DAYS = 30
+        mock_settings.YOUTUBE_TRANSCRIPT_COMPRESS_MIN_BYTES = 32_000
+        transcript = [{"text": "hi", "start": 0.0, "duration": 1.0}]
+
+        db_manager.save_youtube_transcript("vid", "en", transcript, 2)
+
+        saved = self.mock_document.set.call_args[0][0]
+        self.assertEqual(saved["structured_transcript"], transcript)
+
+    def test_expired_transcripts_are_ignored(self):
+        mock_doc = Mock()
+        mock_doc.exists = True
+        mock_doc.to_dict.return_value = {
+            "structured_transcript": [],
+            "expiresAt": datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=1),
+        }
+        self.mock_document.get.return_value = mock_doc
+
+        self.assertIsNone(db_manager.get_stored_youtube_transcript("vid", "en"))
+
+
 class TestGCSFileManagement(unittest.TestCase):
     """Test Google Cloud Storage file management."""
     
@@ -784,5 +924,43 @@ class TestGCSFileManagement(unittest.TestCase):
         db_manager.delete_gcs_file(None)
 
 
+
+class TestJobCheckpoints(unittest.TestCase):
+    """Test stage checkpoints stored with a job."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_db = Mock()
+        db_manager.db = self.mock_db
+        self.checkpoints = (
+            self.mock_db.collection.return_value.document.return_value.collection.return_value
+        )
+
+    def test_checkpoints_round_trip_compressed(self):
+        data = {"utterances": [{"text": f"line {i}"} for i in range(500)]}
+
+        self.assertTrue(db_manager.save_job_checkpoint("user_1", "job_1", "transcript", 1, data))
+        self.mock_db.collection.assert_called_with("saas_users/user_1/jobs")
+        self.checkpoints.document.assert_called_with("transcript")
+        saved = self.checkpoints.document.return_value.set.call_args[0][0]
+        self.assertEqual(saved["version"], 1)
+        self.assertLess(len(saved["data_zlib"]), 2000)
+
+        mock_doc = Mock()
+        mock_doc.id = "transcript"
+        mock_doc.to_dict.return_value = saved
+        self.checkpoints.stream.return_value = [mock_doc]
+
+        self.assertEqual(
+            db_manager.get_job_checkpoints("user_1", "job_1"),
+            {"transcript": {"version": 1, "data": data}},
+        )
+
+    def test_oversized_checkpoints_are_not_stored(self):
+        data = os.urandom(db_manager.MAX_STORED_TRANSCRIPT_BYTES).hex()
+
+        self.assertFalse(db_manager.save_job_checkpoint("user_1", "job_1", "sections", 1, data))
+        self.checkpoints.document.return_value.set.assert_not_called()
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
\ No newline at end of file
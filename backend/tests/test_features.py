@@ -53,8 +53,8 @@ class TestRetryDecorator(unittest.TestCase):
         self.assertEqual(result, {"success": True})
         self.assertEqual(self.call_count, 1)
     
-    @patch('features.time.sleep')
-    @patch('features.random.uniform', return_value=0.5)
+    @patch('resilience.time.sleep')
+    @patch('resilience.random.uniform', return_value=0.5)
     def test_retry_decorator_resource_exhausted(self, mock_uniform, mock_sleep):
         """Test retry decorator with ResourceExhausted exception."""
         ResourceExhausted = MockResourceExhausted
@@ -72,8 +72,8 @@ class TestRetryDecorator(unittest.TestCase):
         self.assertEqual(self.call_count, 3)
         self.assertEqual(mock_sleep.call_count, 2)  # Called for first 2 failures
     
-    @patch('features.time.sleep')
-    @patch('features.random.uniform', return_value=0.5)
+    @patch('resilience.time.sleep')
+    @patch('resilience.random.uniform', return_value=0.5)
     def test_retry_decorator_json_decode_error(self, mock_uniform, mock_sleep):
         """Test retry decorator with JSONDecodeError."""
         @features.retry_with_exponential_backoff
@@ -89,7 +89,7 @@ class TestRetryDecorator(unittest.TestCase):
         self.assertEqual(self.call_count, 2)
         self.assertEqual(mock_sleep.call_count, 1)
     
-    @patch('features.time.sleep')
+    @patch('resilience.time.sleep')
     def test_retry_decorator_max_retries_reached(self, mock_sleep):
         """Test retry decorator when max retries are reached."""
         ResourceExhausted = MockResourceExhausted
@@ -103,9 +103,9 @@ class TestRetryDecorator(unittest.TestCase):
         
         self.assertEqual(result, {})  # Default return for non-verify_claim functions
         self.assertEqual(self.call_count, 5)  # Max retries
-        self.assertEqual(mock_sleep.call_count, 5)
+        self.assertEqual(mock_sleep.call_count, 4)  # No wait after the final attempt
     
-    @patch('features.time.sleep')
+    @patch('resilience.time.sleep')
     def test_retry_decorator_verify_claim_max_retries(self, mock_sleep):
         """Test retry decorator for verify_claim function when max retries reached."""
         ResourceExhausted = MockResourceExhausted
@@ -138,7 +138,7 @@ class TestRetryDecorator(unittest.TestCase):
         self.assertEqual(result, {})  # Default return after unexpected error
         self.assertEqual(self.call_count, 1)  # Should not retry unexpected errors
     
-    @patch('features.time.sleep')
+    @patch('resilience.time.sleep')
     def test_retry_exponential_backoff_timing(self, mock_sleep):
         """Test that exponential backoff increases delay correctly."""
         ResourceExhausted = MockResourceExhausted
@@ -570,7 +570,7 @@ class TestRetryDecoratorEdgeCases(unittest.TestCase):
         expected = {"param1": "test", "param2": "custom"}
         self.assertEqual(result, expected)
     
-    @patch('features.time.sleep')
+    @patch('resilience.time.sleep')
     def test_retry_decorator_timing_precision(self, mock_sleep):
         """Test retry decorator timing with precise control."""
         ResourceExhausted = MockResourceExhausted
@@ -584,14 +584,15 @@ class TestRetryDecoratorEdgeCases(unittest.TestCase):
                 raise ResourceExhausted("Rate limit")
             return {"success": True}
         
-        with patch('features.random.uniform', return_value=0):  # No jitter
+        # Full jitter draws each delay from [0, cap]; take the cap every time
+        with patch('resilience.random.uniform', side_effect=lambda low, high: high):
             result = timing_function()
         
         self.assertEqual(result, {"success": True})
         self.assertEqual(len(call_times), 3)
         
         # Verify sleep was called with expected delays
-        expected_delays = [2.0, 4.0]  # Base delays without jitter
+        expected_delays = [2.0, 4.0]  # Caps double per attempt
         actual_delays = [call[0][0] for call in mock_sleep.call_args_list]
         self.assertEqual(actual_delays, expected_delays)
 
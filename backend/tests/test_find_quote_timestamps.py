@@ -0,0 +1,321 @@
+"""
+Unit tests for quote timestamp extraction in find_quote_timestamps.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+
+from find_quote_timestamps import (
+    TranscriptQuoteIndex,
+    FuzzyTranscriptMatcher,
+    normalize_quote_words,
+    find_quote_timestamp,
+    find_fuzzy_transcript_match,
+    find_quote_timestamp_with_fuzzy_fallback,
+    QuoteLookup,
+    resolve_quote_timestamps,
+    add_timestamps_to_actionable_takeaways,
+    add_timestamps_to_notable_quotes,
+)
+
+
+def make_transcript(texts, step=10.0):
+    """Build a structured transcript with one entry every `step` seconds."""
+    return [
+        {"text": text, "start": index * step, "duration": step}
+        for index, text in enumerate(texts)
+    ]
+
+
+class TestNormalizeQuoteWords(unittest.TestCase):
+    """Test normalize_quote_words function."""
+
+    def test_strips_punctuation_and_case(self):
+        """Test punctuation is removed and text lowercased."""
+        self.assertEqual(
+            normalize_quote_words("Don't STOP, believing!"),
+            ["dont", "stop", "believing"],
+        )
+
+    def test_empty_text(self):
+        """Test empty input returns no words."""
+        self.assertEqual(normalize_quote_words(""), [])
+        self.assertEqual(normalize_quote_words(None), [])
+
+
+class TestTranscriptQuoteIndex(unittest.TestCase):
+    """Test TranscriptQuoteIndex lookups."""
+
+    def setUp(self):
+        self.transcript = make_transcript([
+            "Welcome back to the show everyone.",
+            "Today we talk about compounding habits",
+            "and why small wins matter over time.",
+            "Small wins matter because they compound.",
+            "",
+            "Thanks for listening to the show.",
+        ])
+        self.index = TranscriptQuoteIndex(self.transcript)
+
+    def test_token_entry_map(self):
+        """Test every token maps back to its transcript entry."""
+        self.assertEqual(len(self.index.tokens), len(self.index.token_entries))
+        self.assertEqual(self.index.token_entries[0], 0)
+        self.assertEqual(self.index.token_entries[-1], 5)
+
+    def test_single_entry_match(self):
+        """Test a quote inside a single entry."""
+        result = self.index.find_quote_timestamp("we talk about compounding habits")
+        self.assertEqual(result, {"start": "00:10"})
+
+    def test_multi_entry_match(self):
+        """Test a quote spanning adjacent entries."""
+        result = self.index.find_quote_timestamp("compounding habits and why small")
+        self.assertEqual(result, {"start": "00:10"})
+
+    def test_smallest_span_preferred(self):
+        """Test a single-entry occurrence beats an earlier multi-entry one."""
+        transcript = make_transcript([
+            "small wins",
+            "matter a lot",
+            "filler text here",
+            "small wins matter a lot",
+        ])
+        index = TranscriptQuoteIndex(transcript)
+        self.assertEqual(
+            index.find_quote_timestamp("small wins matter a lot"),
+            {"start": "00:30"},
+        )
+
+    def test_earliest_entry_on_tie(self):
+        """Test the earliest entry wins among equally tight matches."""
+        result = self.index.find_quote_timestamp("small wins matter")
+        self.assertEqual(result, {"start": "00:20"})
+
+    def test_falls_back_to_shorter_probe(self):
+        """Test the first words still match when the quote tail was paraphrased."""
+        result = self.index.find_quote_timestamp(
+            "Thanks for listening to our wonderful podcast"
+        )
+        self.assertEqual(result, {"start": "00:50"})
+
+    def test_span_limit(self):
+        """Test matches spanning more than max_block_entries are rejected."""
+        transcript = make_transcript(["one", "two", "three", "four"])
+        index = TranscriptQuoteIndex(transcript, max_block_entries=2)
+        self.assertIsNone(index.find_quote_timestamp("one two three"))
+        self.assertIsNone(index.find_quote_timestamp("two three four"))
+
+        wide_index = TranscriptQuoteIndex(transcript, max_block_entries=3)
+        self.assertEqual(wide_index.find_quote_timestamp("two three four"), {"start": "00:10"})
+
+    def test_whole_word_matching(self):
+        """Test partial words are not treated as matches."""
+        transcript = make_transcript(["the zeta eta alpha"])
+        index = TranscriptQuoteIndex(transcript)
+        self.assertIsNone(index.find_quote_timestamp("a eta alpha"))
+
+    def test_short_or_missing_quote(self):
+        """Test quotes under three words and unknown quotes return None."""
+        self.assertIsNone(self.index.find_quote_timestamp("small wins"))
+        self.assertIsNone(self.index.find_quote_timestamp(""))
+        self.assertIsNone(self.index.find_quote_timestamp("nothing like this exists"))
+
+    def test_skips_malformed_entries(self):
+        """Test entries that are not dicts or lack text are ignored."""
+        transcript = ["bad entry", {"start": 5}, {"text": "real words live here", "start": 12}]
+        index = TranscriptQuoteIndex(transcript)
+        self.assertEqual(index.find_quote_timestamp("real words live"), {"start": "00:12"})
+
+
+class TestFuzzyTranscriptMatcher(unittest.TestCase):
+    """Test fuzzy quote alignment."""
+
+    def setUp(self):
+        self.transcript = make_transcript([
+            "So let me tell you about the experiment we ran.",
+            "We asked people to write down three good things every evening.",
+            "After six weeks their reported happiness went up noticeably.",
+            "That surprised even the researchers running the study.",
+        ])
+
+    def test_paraphrased_quote_matches(self):
+        """Test a lightly paraphrased quote still finds its utterance."""
+        result = find_fuzzy_transcript_match(
+            self.transcript,
+            "we asked people to write down 3 good things each evening",
+        )
+        self.assertIsNotNone(result)
+        self.assertEqual(result[0]["start"], 10.0)
+
+    def test_no_match_below_cutoff(self):
+        """Test unrelated text returns None."""
+        self.assertIsNone(
+            find_fuzzy_transcript_match(self.transcript, "quantum chromodynamics lecture notes")
+        )
+
+    def test_transcript_not_mutated(self):
+        """Test matching leaves the caller's entries untouched."""
+        find_fuzzy_transcript_match(self.transcript, "their reported happiness went up")
+        find_fuzzy_transcript_match(self.transcript, "nothing similar at all here")
+        for entry in self.transcript:
+            self.assertEqual(set(entry.keys()), {"text", "start", "duration"})
+
+    def test_empty_inputs(self):
+        """Test empty transcript or query returns None."""
+        self.assertIsNone(find_fuzzy_transcript_match([], "anything"))
+        self.assertIsNone(find_fuzzy_transcript_match(self.transcript, ""))
+
+    def test_prefiltered_search_on_long_transcript(self):
+        """Test rare-token prefiltering finds quotes in transcripts above the exhaustive limit."""
+        filler = [f"filler sentence number {i} about nothing" for i in range(200)]
+        filler[150] = "the octopus escaped its aquarium twice last winter"
+        transcript = make_transcript(filler)
+        matcher = FuzzyTranscriptMatcher(transcript)
+        self.assertGreater(len(transcript), matcher.EXHAUSTIVE_ENTRY_LIMIT)
+
+        match = matcher.match("the octopus escaped the aquarium two times last winter")
+
+        self.assertIsNotNone(match)
+        self.assertEqual(match[0], 150)
+
+    def test_index_shares_fuzzy_matcher(self):
+        """Test the quote index builds its fuzzy matcher once and reuses it."""
+        index = TranscriptQuoteIndex(self.transcript)
+        self.assertIs(index.fuzzy_matcher, index.fuzzy_matcher)
+
+        result = find_quote_timestamp_with_fuzzy_fallback(
+            "That surprised even researchers who ran the study",
+            self.transcript,
+            index,
+        )
+        self.assertEqual(result, {"start": "00:30"})
+
+
+class TestResolveQuoteTimestamps(unittest.TestCase):
+    """Test batch, window-restricted timestamp resolution."""
+
+    def setUp(self):
+        self.transcript = make_transcript([
+            "Habits compound over time if you keep at them.",
+            "Some filler about the weather and the week.",
+            "More filler about sponsors and housekeeping.",
+            "Habits compound over time if you keep at them.",
+            "A closing remark about the next episode.",
+        ])
+        self.index = TranscriptQuoteIndex(self.transcript)
+
+    def test_entry_range_for_window(self):
+        """Test time windows map to the entries they cover."""
+        self.assertEqual(self.index.entry_range_for_window(25.0, 45.0), (2, 4))
+        self.assertEqual(self.index.entry_range_for_window(0.0, 12.0), (0, 1))
+        self.assertIsNone(self.index.entry_range_for_window(None, 10.0))
+
+    def test_window_picks_section_occurrence(self):
+        """Test a repeated quote resolves to the occurrence inside its section."""
+        results = resolve_quote_timestamps(
+            [
+                QuoteLookup("habits compound over time", 0.0, 15.0),
+                QuoteLookup("habits compound over time", 30.0, 45.0),
+                QuoteLookup("habits compound over time"),
+            ],
+            self.transcript,
+            self.index,
+        )
+        self.assertEqual(
+            results, [{"start": "00:00"}, {"start": "00:30"}, {"start": "00:00"}]
+        )
+
+    def test_global_fallback_on_window_miss(self):
+        """Test quotes outside their window still resolve globally."""
+        results = resolve_quote_timestamps(
+            [QuoteLookup("a closing remark about", 0.0, 5.0), QuoteLookup("")],
+            self.transcript,
+            self.index,
+        )
+        self.assertEqual(results, [{"start": "00:40"}, None])
+
+    def test_window_restricted_fuzzy_match(self):
+        """Test fuzzy matching honours the window before going global."""
+        results = resolve_quote_timestamps(
+            [QuoteLookup("habits compound over the time if you keep at it", 28.0, 45.0)],
+            self.transcript,
+            self.index,
+        )
+        self.assertEqual(results, [{"start": "00:30"}])
+
+    def test_unsorted_transcript_searches_everything(self):
+        """Test transcripts out of time order fall back to whole-transcript search."""
+        transcript = [
+            {"text": "later words appear first here", "start": 50.0},
+            {"text": "earlier words appear second here", "start": 10.0},
+        ]
+        index = TranscriptQuoteIndex(transcript)
+        self.assertIsNone(index.entry_range_for_window(0.0, 20.0))
+        results = resolve_quote_timestamps(
+            [QuoteLookup("later words appear", 0.0, 20.0)], transcript, index
+        )
+        self.assertEqual(results, [{"start": "00:50"}])
+
+
+class TestQuoteTimestampHelpers(unittest.TestCase):
+    """Test module-level helpers built on the index."""
+
+    def setUp(self):
+        self.transcript = make_transcript([
+            "The first principle is to start small.",
+            "The second principle is consistency beats intensity.",
+        ])
+
+    def test_find_quote_timestamp_without_index(self):
+        """Test the helper builds an index when none is supplied."""
+        result = find_quote_timestamp("consistency beats intensity", self.transcript)
+        self.assertEqual(result, {"start": "00:10"})
+
+    def test_find_quote_timestamp_empty_inputs(self):
+        """Test empty inputs return None."""
+        self.assertIsNone(find_quote_timestamp("", self.transcript))
+        self.assertIsNone(find_quote_timestamp("start small now", []))
+
+    def test_add_timestamps_to_actionable_takeaways_shared_index(self):
+        """Test takeaways are enriched using a shared index."""
+        index = TranscriptQuoteIndex(self.transcript)
+        takeaways = [
+            {"takeaway": "Start small", "supporting_quote": "is to start small"},
+            {"takeaway": "No quote"},
+            "not a dict",
+        ]
+
+        result = add_timestamps_to_actionable_takeaways(takeaways, self.transcript, index)
+
+        self.assertEqual(result[0]["quote_timestamp"], {"start": "00:00"})
+        self.assertNotIn("quote_timestamp", result[1])
+        self.assertEqual(result[2], "not a dict")
+        self.assertNotIn("quote_timestamp", takeaways[0])
+
+    def test_add_timestamps_to_notable_quotes(self):
+        """Test notable quote timestamps are replaced with the matched position."""
+        quotes = [{"quote": "consistency beats intensity", "timestamp": "00:00"}]
+
+        result = add_timestamps_to_notable_quotes(quotes, self.transcript)
+
+        self.assertEqual(result[0]["timestamp"], "00:10")
+        self.assertEqual(quotes[0]["timestamp"], "00:00")
+
+    def test_time_window_passed_through(self):
+        """Test helpers search the given section window first."""
+        transcript = make_transcript(["start small today", "filler", "start small today"])
+        takeaways = [{"takeaway": "x", "supporting_quote": "start small today"}]
+
+        result = add_timestamps_to_actionable_takeaways(
+            takeaways, transcript, time_window=(20.0, 30.0)
+        )
+
+        self.assertEqual(result[0]["quote_timestamp"], {"start": "00:20"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Unit tests for shared HTTP clients in http_clients.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import unittest
+
+import http_clients
+
+
+class TestHttpClientRegistry(unittest.TestCase):
+    """Test one pooled client is shared per provider profile."""
+
+    def tearDown(self):
+        http_clients._clients.clear()
+
+    def test_client_is_reused_within_a_loop(self):
+        async def run():
+            first = http_clients.get_http_client("youtube")
+            second = http_clients.get_http_client("youtube")
+            other = http_clients.get_http_client("assemblyai")
+            await http_clients.close_http_clients()
+            return first, second, other
+
+        first, second, other = asyncio.run(run())
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertTrue(first.is_closed)
+
+    def test_profile_timeouts_are_applied(self):
+        client = http_clients.create_http_client("assemblyai")
+        self.assertEqual(client.timeout.read, 600.0)
+        self.assertEqual(client.timeout.connect, 10.0)
+        asyncio.run(client.aclose())
+
+    def test_client_is_replaced_on_a_new_loop(self):
+        """Test pooled connections are never shared between event loops."""
+        async def get():
+            return http_clients.get_http_client("default")
+
+        async def get_and_settle():
+            client = await get()
+            await asyncio.sleep(0)
+            return client
+
+        first = asyncio.run(get())
+        second = asyncio.run(get_and_settle())
+        self.assertIsNot(first, second)
+        self.assertTrue(first.is_closed)
+        self.assertFalse(second.is_closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
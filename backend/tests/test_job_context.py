@@ -0,0 +1,240 @@
+"""
+Unit tests for the per-run job document cache in pipeline/orchestrators/job_context.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import time
+import unittest
+from unittest.mock import Mock
+
+from pipeline.orchestrators.job_context import JobContext
+
+
+class TestJobContext(unittest.TestCase):
+    """Test JobContext reads, refreshes and write-behind updates."""
+
+    def setUp(self):
+        self.db_manager = Mock()
+        self.db_manager.get_job_status.return_value = {
+            "status": "QUEUED",
+            "request_data": {"source_type": "youtube"},
+        }
+        self.context = JobContext(self.db_manager, "user_1", "job_1")
+
+    def test_loads_document_once(self):
+        """Test repeated loads are served from memory."""
+        async def run():
+            first = await self.context.load()
+            second = await self.context.load()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual(first["status"], "QUEUED")
+        self.assertIs(first, second)
+        self.db_manager.get_job_status.assert_called_once_with("user_1", "job_1")
+        self.assertEqual(self.context.request_data, {"source_type": "youtube"})
+
+    def test_snapshot_skips_read(self):
+        """Test a caller-provided snapshot is used without reading Firestore."""
+        context = JobContext(self.db_manager, "user_1", "job_1", snapshot={"status": "QUEUED"})
+
+        job_doc = asyncio.run(context.load())
+
+        self.assertEqual(job_doc, {"status": "QUEUED"})
+        self.db_manager.get_job_status.assert_not_called()
+        self.assertEqual(context.reads, 0)
+
+    def test_missing_job_is_not_reread(self):
+        """Test a missing job returns None and is only looked up once."""
+        self.db_manager.get_job_status.return_value = None
+
+        async def run():
+            return await self.context.load(), await self.context.load()
+
+        self.assertEqual(asyncio.run(run()), (None, None))
+        self.assertFalse(self.context.exists)
+        self.db_manager.get_job_status.assert_called_once()
+
+    def test_writes_are_mirrored_locally(self):
+        """Test later reads see staged updates before they are written."""
+        transcript = [{"text": "hello", "start": 0}]
+
+        async def run():
+            await self.context.load()
+            await self.context.update_status("PROCESSING", "Step 2/7", transcript=transcript)
+            await self.context.update_title("New title")
+            await self.context.update_fields({"show_notes": {"chapters": []}})
+
+        asyncio.run(run())
+
+        self.assertEqual(self.context.get("status"), "PROCESSING")
+        self.assertEqual(self.context.get("progress"), "Step 2/7")
+        self.assertEqual(self.context.get("transcript"), transcript)
+        self.assertEqual(self.context.get("job_title"), "New title")
+        self.assertEqual(self.context.get("show_notes"), {"chapters": []})
+        self.db_manager.get_job_status.assert_called_once()
+        self.db_manager.update_job_fields.assert_not_called()
+
+    def test_flush_coalesces_updates(self):
+        """Test staged updates are merged into one write, latest value winning."""
+        context = JobContext(self.db_manager, "user_1", "job_1", min_write_interval=0)
+
+        async def run():
+            await context.update_status("PROCESSING", "Step 5/7")
+            await context.update_fields({"synthesis_results": {"a": 1}})
+            await context.update_title("Title", {"youtube_title": "Video"})
+            await context.update_status("PROCESSING", "Step 7/7")
+            await context.flush()
+            await context.flush()
+
+        asyncio.run(run())
+
+        self.db_manager.update_job_fields.assert_called_once_with(
+            "user_1", "job_1",
+            {
+                "status": "PROCESSING",
+                "progress": "Step 7/7",
+                "synthesis_results": {"a": 1},
+                "job_title": "Title",
+            },
+            touch=True,
+        )
+        self.assertEqual((context.updates_staged, context.writes), (4, 1))
+
+    def test_terminal_status_flushes_immediately(self):
+        """Test COMPLETED and FAILED are written together with pending fields."""
+        context = JobContext(self.db_manager, "user_1", "job_1", min_write_interval=0)
+
+        async def run():
+            await context.update_fields({"libraryTagsSuggestion": ["ai"]})
+            await context.update_status("FAILED", "Analysis failed: boom")
+
+        asyncio.run(run())
+
+        fields = self.db_manager.update_job_fields.call_args[0][2]
+        self.assertEqual(fields["status"], "FAILED")
+        self.assertEqual(fields["libraryTagsSuggestion"], ["ai"])
+        self.assertEqual(context.pending, {})
+
+    def test_writes_are_spaced_by_min_interval(self):
+        """Test a flush inside the write interval is deferred, not awaited."""
+        context = JobContext(self.db_manager, "user_1", "job_1", min_write_interval=0.2)
+
+        async def run():
+            await context.update_status("PROCESSING", "Step 2/7")
+            await context.flush()
+            first_write = time.monotonic()
+            await context.update_status("PROCESSING", "Step 5/7")
+            await context.flush()
+            self.assertLess(time.monotonic() - first_write, 0.1)
+            self.assertEqual(context.writes, 1)
+            await context.flush(wait=True)
+            return time.monotonic() - first_write
+
+        self.assertGreaterEqual(asyncio.run(run()), 0.15)
+        self.assertEqual(context.writes, 2)
+
+    def test_deferred_write_merges_later_updates(self):
+        """Test updates staged before a scheduled write go out with it."""
+        context = JobContext(self.db_manager, "user_1", "job_1", min_write_interval=0.1)
+
+        async def run():
+            await context.update_status("PROCESSING", "Step 2/7")
+            await context.flush()
+            await context.update_status("PROCESSING", "Step 5/7")
+            await context.flush()
+            await context.update_fields({"show_notes": {}})
+            await context.flush()
+            await context.flush(wait=True)
+
+        asyncio.run(run())
+
+        self.assertEqual(context.writes, 2)
+        fields = self.db_manager.update_job_fields.call_args[0][2]
+        self.assertEqual(fields, {"status": "PROCESSING", "progress": "Step 5/7", "show_notes": {}})
+
+    def test_terminal_status_replaces_scheduled_write(self):
+        """Test COMPLETED is written at once, with the fields of a deferred write."""
+        context = JobContext(self.db_manager, "user_1", "job_1", min_write_interval=5)
+
+        async def run():
+            await context.update_status("PROCESSING", "Step 2/7")
+            await context.flush()
+            await context.update_fields({"show_notes": {}})
+            await context.flush()
+            started = time.monotonic()
+            await context.update_status("COMPLETED", "Analysis complete!")
+            await context.flush(wait=True)
+            return time.monotonic() - started
+
+        self.assertLess(asyncio.run(run()), 1)
+        self.assertEqual(context.writes, 2)
+        fields = self.db_manager.update_job_fields.call_args[0][2]
+        self.assertEqual(fields["status"], "COMPLETED")
+        self.assertEqual(fields["show_notes"], {})
+
+    def test_touch_refreshes_updated_at_only(self):
+        """Test a heartbeat writes no fields and leaves staged ones pending."""
+        async def run():
+            await self.context.update_fields({"show_notes": {}})
+            await self.context.touch()
+
+        asyncio.run(run())
+
+        self.db_manager.update_job_fields.assert_called_once_with(
+            "user_1", "job_1", {}, touch=True
+        )
+        self.assertEqual(self.context.pending, {"show_notes": {}})
+
+    def test_failed_write_keeps_fields_pending(self):
+        """Test a failed flush raises and retries the same fields next time."""
+        context = JobContext(self.db_manager, "user_1", "job_1", min_write_interval=0)
+        self.db_manager.update_job_fields.side_effect = [ConnectionError("unavailable"), None]
+
+        async def run():
+            await context.update_fields({"show_notes": {}})
+            with self.assertRaises(ConnectionError):
+                await context.flush()
+            await context.update_status("PROCESSING", "Step 6/7")
+            await context.flush()
+
+        asyncio.run(run())
+
+        fields = self.db_manager.update_job_fields.call_args[0][2]
+        self.assertEqual(fields, {"show_notes": {}, "status": "PROCESSING", "progress": "Step 6/7"})
+        self.assertEqual(context.writes, 1)
+
+    def test_refresh_rereads(self):
+        """Test refresh writes pending updates and discards the local copy."""
+        async def run():
+            await self.context.load()
+            self.db_manager.get_job_status.return_value = {"status": "COMPLETED"}
+            return await self.context.refresh()
+
+        self.assertEqual(asyncio.run(run()), {"status": "COMPLETED"})
+        self.assertEqual(self.context.reads, 2)
+
+    def test_refresh_flushes_first(self):
+        """Test a re-read never loses staged updates."""
+        context = JobContext(self.db_manager, "user_1", "job_1", min_write_interval=0)
+
+        async def run():
+            await context.update_fields({"show_notes": {}})
+            await context.refresh()
+
+        asyncio.run(run())
+        self.db_manager.update_job_fields.assert_called_once()
+
+    def test_get_before_load_raises(self):
+        """Test reading fields before loading is an error."""
+        with self.assertRaises(RuntimeError):
+            self.context.get("status")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for batched progress logging in pipeline/utils/job_log_buffer.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import unittest
+
+from pipeline.utils.job_log_buffer import JobLogBuffer
+
+
+class RecordingDB:
+    """Collects the batches passed to log_progress_batch."""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    async def log_progress_batch(self, user_id, job_id, entries):
+        if self.fail:
+            raise ConnectionError("Firestore unavailable")
+        self.batches.append((user_id, job_id, list(entries)))
+
+
+class TestJobLogBuffer(unittest.TestCase):
+    """Test JobLogBuffer flushing and ordering."""
+
+    def test_flushes_when_size_threshold_reached(self):
+        """Test a full buffer is written immediately as one batch."""
+        db = RecordingDB()
+
+        async def run():
+            buffer = JobLogBuffer(db, "user_1", "job_1", max_entries=3, flush_interval=60)
+            for i in range(3):
+                await buffer.log(f"message {i}")
+            self.assertEqual(len(db.batches), 1)
+            await buffer.close()
+
+        asyncio.run(run())
+
+        user_id, job_id, entries = db.batches[0]
+        self.assertEqual((user_id, job_id), ("user_1", "job_1"))
+        self.assertEqual([e["message"] for e in entries], ["message 0", "message 1", "message 2"])
+
+    def test_flushes_after_interval(self):
+        """Test pending messages are written once the interval passes."""
+        db = RecordingDB()
+
+        async def run():
+            buffer = JobLogBuffer(db, "user_1", "job_1", max_entries=50, flush_interval=0.05)
+            await buffer.log("step one")
+            await buffer.log("step two")
+            self.assertEqual(db.batches, [])
+            await asyncio.sleep(0.2)
+            self.assertEqual(len(db.batches), 1)
+            await buffer.close()
+
+        asyncio.run(run())
+        self.assertEqual(len(db.batches[0][2]), 2)
+
+    def test_close_flushes_remaining_entries(self):
+        """Test closing the buffer writes everything still pending."""
+        db = RecordingDB()
+
+        async def run():
+            buffer = JobLogBuffer(db, "user_1", "job_1", max_entries=50, flush_interval=60)
+            await buffer.log("✅ Analysis Complete.")
+            await buffer.close()
+            await buffer.log("late message")
+
+        asyncio.run(run())
+
+        messages = [e["message"] for _, _, entries in db.batches for e in entries]
+        self.assertEqual(messages, ["✅ Analysis Complete.", "late message"])
+
+    def test_timestamps_and_sequence_preserve_order(self):
+        """Test entries get strictly increasing timestamps and sequence numbers."""
+        db = RecordingDB()
+
+        async def run():
+            buffer = JobLogBuffer(db, "user_1", "job_1", max_entries=100, flush_interval=60)
+            for i in range(50):
+                await buffer.log(f"message {i}")
+            await buffer.close()
+
+        asyncio.run(run())
+
+        entries = db.batches[0][2]
+        timestamps = [e["timestamp"] for e in entries]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual(len(set(timestamps)), 50)
+        self.assertEqual([e["sequence"] for e in entries], list(range(1, 51)))
+        self.assertIsNotNone(timestamps[0].tzinfo)
+
+    def test_write_errors_are_swallowed(self):
+        """Test a failed write does not break the job."""
+        buffer_holder = {}
+
+        async def run():
+            buffer = JobLogBuffer(RecordingDB(fail=True), "user_1", "job_1", max_entries=1)
+            buffer_holder["buffer"] = buffer
+            await buffer.log("message")
+            await buffer.close()
+
+        asyncio.run(run())
+        self.assertEqual(buffer_holder["buffer"].batches_written, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Unit tests for library metadata generation in pipeline/orchestrators/analysis_pipeline.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import json
+import unittest
+from unittest.mock import Mock
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from pipeline.interfaces import SectionAnalysis
+from pipeline.orchestrators.analysis_pipeline import AnalysisPipeline, AnalysisRequest
+from pipeline.orchestrators.job_context import JobContext
+
+METADATA = {"description": "A talk about focus.", "tags": ["productivity", "learning", "health"]}
+
+
+def make_analysis(summary, takeaway):
+    return SectionAnalysis(
+        start_time="00:00",
+        end_time="05:00",
+        title="Section",
+        summary=summary,
+        quotes=[],
+        entities=[],
+        additional_data={"actionable_takeaways": [{"takeaway": takeaway}]},
+    )
+
+
+class TestLibraryMetadata(unittest.TestCase):
+    """Test library metadata is built from the analyses the pipeline holds."""
+
+    def setUp(self):
+        self.db_manager = Mock()
+        self.db_manager.list_section_results.return_value = [
+            {"1_sentence_summary": "Stored summary", "actionable_takeaways": []}
+        ]
+        self.llm = FakeListChatModel(responses=[json.dumps(METADATA)])
+        meta_analyzer = Mock()
+        meta_analyzer.llm = self.llm
+        self.pipeline = AnalysisPipeline(
+            transcript_normalizer=Mock(),
+            youtube_normalizer=Mock(),
+            segmenter=Mock(),
+            audio_processor=Mock(),
+            section_processor=Mock(),
+            meta_analyzer=meta_analyzer,
+            title_generator=Mock(),
+            claim_processor=Mock(),
+            briefing_generator=Mock(),
+            db_manager=self.db_manager,
+            token_tracker=Mock(),
+        )
+        self.pipeline.job_context = JobContext(
+            self.db_manager, "user_1", "job_1",
+            snapshot={"request_data": {"source_type": "youtube", "youtube_video_title": "Focus"}},
+        )
+        self.request = AnalysisRequest(user_id="user_1", job_id="job_1", persona="deep_dive")
+
+    def generate(self, section_analyses=None):
+        return asyncio.run(
+            self.pipeline._generate_library_metadata(self.request, {}, {}, section_analyses)
+        )
+
+    def test_uses_in_memory_analyses(self):
+        analyses = [make_analysis("Deep work matters", "Block two hours a day")]
+
+        self.assertEqual(self.generate(analyses), METADATA)
+
+        self.db_manager.list_section_results.assert_not_called()
+        self.db_manager.get_job_status.assert_not_called()
+        section_results = asyncio.run(
+            self.pipeline._library_section_results(self.request, analyses)
+        )
+        self.assertEqual(section_results[0]["1_sentence_summary"], "Deep work matters")
+        self.assertEqual(
+            section_results[0]["actionable_takeaways"], [{"takeaway": "Block two hours a day"}]
+        )
+
+    def test_falls_back_to_stored_results(self):
+        self.assertEqual(self.generate(), METADATA)
+
+        self.db_manager.list_section_results.assert_called_once_with("user_1", "job_1")
+
+    def test_other_personas_are_skipped(self):
+        self.request.persona = "general"
+
+        self.assertEqual(self.generate([make_analysis("s", "t")]), {})
+        self.assertEqual(self.llm.i, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Unit tests for the LLM response cache in llm_cache.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import tempfile
+import unittest
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.prompts import ChatPromptTemplate
+
+from cost_tracking import TokenCostCallbackHandler
+from llm_cache import SQLiteLLMCacheStore, TieredLLMCache, cache_key
+from pipeline.utils.rate_limiter import LLMRateLimiter, RateLimitedLLM
+
+
+def make_chain(cache, responses=("first", "second")):
+    llm = FakeListChatModel(responses=list(responses), cache=cache)
+    return ChatPromptTemplate.from_template("Summarize {text}") | llm | StrOutputParser(), llm
+
+
+class TestTieredLLMCache(unittest.TestCase):
+    """Test lookups through the in-memory and persistent tiers."""
+
+    def test_repeat_calls_are_served_from_memory(self):
+        """Test the same rendered prompt is only sent to the model once."""
+        cache = TieredLLMCache()
+        chain, llm = make_chain(cache)
+
+        async def run():
+            return [
+                await chain.ainvoke({"text": "a transcript"}),
+                await chain.ainvoke({"text": "a transcript"}),
+                await chain.ainvoke({"text": "another transcript"}),
+            ]
+
+        self.assertEqual(asyncio.run(run()), ["first", "first", "second"])
+        metrics = cache.get_metrics()
+        self.assertEqual((metrics["hits"], metrics["misses"]), (1, 2))
+        self.assertEqual(metrics["memory_hits"], 1)
+
+    def test_key_depends_on_model_parameters(self):
+        prompt = '[{"content": "hi"}]'
+        self.assertNotEqual(
+            cache_key(prompt, "gemini-2.5-flash---temperature=0.2"),
+            cache_key(prompt, "gemini-2.5-flash---temperature=0"),
+        )
+        self.assertEqual(cache_key(prompt, "m"), cache_key(prompt, "m"))
+
+    def test_expired_entries_are_misses(self):
+        cache = TieredLLMCache(ttl_seconds=0)
+        chain, _ = make_chain(cache)
+
+        self.assertEqual(chain.invoke({"text": "x"}), "first")
+        self.assertEqual(chain.invoke({"text": "x"}), "second")
+        self.assertEqual(cache.get_metrics()["hits"], 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TieredLLMCache(max_entries=1)
+        chain, _ = make_chain(cache, responses=("a", "b", "c"))
+
+        chain.invoke({"text": "one"})
+        chain.invoke({"text": "two"})
+        self.assertEqual(chain.invoke({"text": "one"}), "c")
+        self.assertEqual(cache.get_metrics()["entries_in_memory"], 1)
+
+    def test_sqlite_store_survives_a_new_process(self):
+        """Test a fresh cache on the same file answers from the persistent tier."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "llm_cache.db")
+            chain, _ = make_chain(TieredLLMCache(store=SQLiteLLMCacheStore(path)))
+            self.assertEqual(asyncio.run(chain.ainvoke({"text": "x"})), "first")
+
+            cache = TieredLLMCache(store=SQLiteLLMCacheStore(path))
+            chain, llm = make_chain(cache)
+            self.assertEqual(asyncio.run(chain.ainvoke({"text": "x"})), "first")
+            self.assertEqual(cache.get_metrics()["store_hits"], 1)
+            self.assertEqual(llm.i, 0)
+
+
+class TestCacheMetrics(unittest.TestCase):
+    """Test hit and miss accounting in TokenCostCallbackHandler."""
+
+    def result(self, cache_status):
+        message = AIMessage(
+            content="answer",
+            usage_metadata={"input_tokens": 100, "output_tokens": 20, "total_tokens": 120},
+            response_metadata={"llm_cache": cache_status},
+        )
+        return LLMResult(generations=[[ChatGeneration(message=message)]])
+
+    def test_cached_responses_are_not_charged(self):
+        handler = TokenCostCallbackHandler("user_1", "job_1")
+        handler.on_llm_end(self.result("miss"))
+        handler.on_llm_end(self.result("hit"))
+
+        metrics = handler.get_metrics()
+        self.assertEqual((metrics["llm_input_tokens"], metrics["llm_output_tokens"]), (100, 20))
+        self.assertEqual((metrics["llm_cache_hits"], metrics["llm_cache_misses"]), (1, 1))
+        self.assertEqual(metrics["llm_cached_input_tokens"], 100)
+
+    def test_handler_sees_chain_cache_hits(self):
+        handler = TokenCostCallbackHandler("user_1", "job_1")
+        chain, _ = make_chain(TieredLLMCache())
+
+        for _ in range(3):
+            chain.invoke({"text": "x"}, config={"callbacks": [handler]})
+
+        metrics = handler.get_metrics()
+        self.assertEqual((metrics["llm_cache_hits"], metrics["llm_cache_misses"]), (2, 1))
+
+
+class TestRateLimiterSkipsCachedCalls(unittest.TestCase):
+
+    def test_cached_calls_do_not_use_rate_limit_capacity(self):
+        limiter = LLMRateLimiter("fake", rpm=100, tpm=100_000)
+        cache = TieredLLMCache()
+        llm = RateLimitedLLM(FakeListChatModel(responses=["hello", "world"], cache=cache), limiter)
+        chain = ChatPromptTemplate.from_template("Say {word}") | llm | StrOutputParser()
+
+        async def run():
+            return [await chain.ainvoke({"word": "hi"}), chain.invoke({"word": "hi"})]
+
+        self.assertEqual(asyncio.run(run()), ["hello", "hello"])
+        self.assertEqual(limiter.requests, 1)
+        self.assertEqual(cache.get_metrics()["hits"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Unit tests for the offline pipeline benchmark in benchmarks/
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import asyncio
+import random
+import unittest
+
+from benchmarks.fakes import InMemoryDBManager, LatencyModel
+from benchmarks.llm_responses import scripted_response
+from benchmarks.pipeline_benchmark import (
+    BenchmarkConfig,
+    compare_with_baseline,
+    percentile,
+    run_persona,
+)
+from benchmarks.transcripts import (
+    load_recordings,
+    parse_duration,
+    synthesize_assemblyai_response,
+    youtube_transcript,
+)
+
+
+class TestLatencyModel(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertEqual(LatencyModel.parse("1.5:4"), LatencyModel(1.5, 4.0))
+        self.assertEqual(LatencyModel.parse("0.2"), LatencyModel(0.2))
+        with self.assertRaises(ValueError):
+            LatencyModel.parse("4:1")
+
+    def test_samples_follow_the_percentiles(self):
+        latency = LatencyModel(1.0, 3.0)
+        rng = random.Random(7)
+        samples = [latency.sample(rng) for _ in range(4000)]
+        self.assertAlmostEqual(percentile(samples, 50), 1.0, delta=0.1)
+        self.assertAlmostEqual(percentile(samples, 95), 3.0, delta=0.4)
+        self.assertEqual(LatencyModel().sample(rng), 0.0)
+
+
+class TestTranscripts(unittest.TestCase):
+
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration("5m"), 300)
+        self.assertEqual(parse_duration("1h30m"), 5400)
+        self.assertEqual(parse_duration("90"), 90)
+        with self.assertRaises(ValueError):
+            parse_duration("ten minutes")
+
+    def test_synthetic_transcript_covers_the_duration(self):
+        response = synthesize_assemblyai_response(3 * 3600, load_recordings(), speakers=2)
+        words = response["words"]
+        self.assertEqual(response["status"], "completed")
+        self.assertEqual(response["audio_duration"], 3 * 3600)
+        self.assertGreater(words[-1]["start"], 3 * 3600 * 1000 - 60_000)
+        self.assertLessEqual(words[-1]["end"], 3 * 3600 * 1000)
+        self.assertTrue(all(a["start"] <= b["start"] for a, b in zip(words, words[1:])))
+        self.assertEqual({u["speaker"] for u in response["utterances"]}, {"A", "B"})
+        self.assertEqual(
+            sum(len(u["words"]) for u in response["utterances"]), len(words)
+        )
+        captions = youtube_transcript(response)
+        self.assertEqual(set(captions[0]), {"text", "start", "duration"})
+
+
+class TestFakes(unittest.TestCase):
+
+    def test_unknown_prompt_is_not_scripted(self):
+        self.assertIsNone(scripted_response("Translate this into French."))
+        self.assertEqual(
+            scripted_response("You are a search query generator. Create a single, concise "
+                              "search query to explain the term 'Stoicism' using the context."),
+            "What is Stoicism",
+        )
+
+    def test_db_manager_round_trip(self):
+        db = InMemoryDBManager(LatencyModel())
+        job_id = db.create_job("user_1", {"persona": "podcaster"})
+        db.update_job_fields("user_1", job_id, {"status": "PROCESSING", "progress": "Step 2"})
+        db.save_section_results_batch("user_1", job_id, {0: {"title": "a"}, 1: {"title": "b"}})
+
+        self.assertEqual(db.get_job_status("user_1", job_id)["status"], "PROCESSING")
+        self.assertEqual(
+            set(db.get_section_results_by_id("user_1", job_id)), {"section_000", "section_001"}
+        )
+        self.assertTrue(db.save_job_checkpoint("user_1", job_id, "title", 1, "Title"))
+        self.assertEqual(
+            db.get_job_checkpoints("user_1", job_id), {"title": {"version": 1, "data": "Title"}}
+        )
+        self.assertEqual(db.calls["update_job_fields"], 1)
+
+
+class TestBaselineComparison(unittest.TestCase):
+
+    def test_regressions_beyond_tolerance(self):
+        baseline = [{"persona": "podcaster", "jobs_per_minute": 10.0, "latency_p95_s": 20.0,
+                     "cpu_seconds": 5.0, "peak_rss_mb": 300.0}]
+        results = [{"persona": "podcaster", "jobs_per_minute": 7.0, "latency_p95_s": 22.0,
+                    "cpu_seconds": 7.0, "peak_rss_mb": 290.0}]
+
+        regressions = compare_with_baseline(results, baseline, tolerance=0.2)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("podcaster: jobs_per_minute"))
+        self.assertTrue(regressions[1].startswith("podcaster: cpu_seconds"))
+
+
+class TestEndToEnd(unittest.TestCase):
+    """A short job per persona, through the real pipeline with no simulated latency."""
+
+    def test_jobs_complete_for_every_persona(self):
+        for persona in ("deep_dive", "podcaster"):
+            with self.subTest(persona=persona):
+                config = BenchmarkConfig(personas=[persona], durations=[300])
+                result = asyncio.run(run_persona(config, persona))
+
+                self.assertEqual(result["completed"], 1, result["samples"])
+                self.assertEqual(result["unmatched_prompts"], 0, result["unmatched_prompt_samples"])
+                self.assertGreater(result["samples"][0]["sections"], 0)
+                self.assertGreater(result["llm_calls"], 0)
+                self.assertGreater(result["jobs_per_minute"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
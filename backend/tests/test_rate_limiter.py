@@ -0,0 +1,133 @@
+"""
+Unit tests for LLM rate limiting in pipeline/utils/rate_limiter.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+from pipeline.utils.rate_limiter import (
+    InMemoryBucketStore,
+    LLMRateLimiter,
+    RateLimitedLLM,
+    SQLiteBucketStore,
+    estimate_tokens,
+)
+
+
+class TestBucketStores(unittest.TestCase):
+    """Test token bucket accounting."""
+
+    def check_store(self, store):
+        request = [("m:rpm", 1.0, 2.0, 1.0), ("m:tpm", 50.0, 100.0, 10.0)]
+        self.assertEqual(store.take(request), 0)
+        self.assertEqual(store.take(request), 0)
+        # Both buckets are now empty; the rpm bucket needs ~1s to refill
+        wait = store.take(request)
+        self.assertGreater(wait, 0.9)
+        self.assertLessEqual(wait, 5.0)
+
+    def test_in_memory_store(self):
+        self.check_store(InMemoryBucketStore())
+
+    def test_sqlite_store(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.check_store(SQLiteBucketStore(os.path.join(tmp, "buckets.db")))
+
+    def test_take_is_all_or_nothing(self):
+        """Test a request that does not fit takes nothing from either bucket."""
+        store = InMemoryBucketStore()
+        self.assertGreater(store.take([("a", 1.0, 10.0, 1.0), ("b", 20.0, 10.0, 1.0)]), 0)
+        self.assertEqual(store.take([("a", 10.0, 10.0, 1.0)]), 0)
+
+
+class TestLLMRateLimiter(unittest.TestCase):
+    """Test LLMRateLimiter waiting and reconciliation."""
+
+    def test_waits_when_requests_per_minute_exhausted(self):
+        """Test callers beyond the rpm burst wait for the bucket to refill."""
+        limiter = LLMRateLimiter("model", rpm=120, tpm=1_000_000)
+
+        async def run():
+            await asyncio.gather(*(limiter.acquire(10) for _ in range(121)))
+
+        started = time.monotonic()
+        asyncio.run(run())
+
+        # 120 fit in the bucket; the 121st waits for a 0.5s refill
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+        self.assertEqual(limiter.requests, 121)
+        self.assertEqual(limiter.waits, 1)
+
+    def test_reconcile_charges_actual_usage(self):
+        """Test underestimated requests leave the token bucket in debt."""
+        store = InMemoryBucketStore()
+        limiter = LLMRateLimiter("model", rpm=1000, tpm=600, store=store)
+
+        asyncio.run(limiter.acquire(100))
+        limiter.reconcile(100, 700)
+
+        self.assertGreater(store.take([("model:tpm", 1.0, 600.0, 10.0)]), 9)
+
+    def test_blocking_store_runs_off_the_event_loop(self):
+        """Test SQLite store calls from async callers do not run on the loop thread."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SQLiteBucketStore(os.path.join(tmp, "buckets.db"))
+            limiter = LLMRateLimiter("model", rpm=1000, tpm=600, store=store)
+            threads = []
+            take, adjust = store.take, store.adjust
+
+            def record(method):
+                def call(*args):
+                    threads.append(threading.get_ident())
+                    return method(*args)
+                return call
+
+            store.take, store.adjust = record(take), record(adjust)
+
+            async def run():
+                await limiter.acquire(100)
+                await limiter.areconcile(100, 700)
+                return threading.get_ident()
+
+            loop_thread = asyncio.run(run())
+
+            self.assertEqual(len(threads), 2)
+            self.assertNotIn(loop_thread, threads)
+            self.assertGreater(take([("model:tpm", 1.0, 600.0, 10.0)]), 9)
+
+
+class TestRateLimitedLLM(unittest.TestCase):
+    """Test the chat model wrapper inside LangChain chains."""
+
+    def test_wrapper_composes_into_chains(self):
+        """Test prompt | llm | parser goes through the limiter."""
+        limiter = LLMRateLimiter("fake", rpm=100, tpm=100_000)
+        llm = RateLimitedLLM(FakeListChatModel(responses=["hello", "world"]), limiter)
+        chain = ChatPromptTemplate.from_template("Say {word}") | llm | StrOutputParser()
+
+        async def run():
+            return [await chain.ainvoke({"word": "hi"}), chain.invoke({"word": "there"})]
+
+        self.assertEqual(asyncio.run(run()), ["hello", "world"])
+        self.assertEqual(limiter.requests, 2)
+        self.assertEqual(llm.responses, ["hello", "world"])
+
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens("x" * 400), 101)
+        prompt = ChatPromptTemplate.from_template("{text}").invoke({"text": "y" * 40})
+        self.assertGreater(estimate_tokens(prompt), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+"""
+Unit tests for retries, retry budgets and circuit breakers in resilience.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from google.api_core.exceptions import ResourceExhausted
+
+from resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    call_with_retry,
+    full_jitter_delay,
+    get_circuit_breaker,
+    is_transient_error,
+    reset_retry_budget,
+    retry_with_exponential_backoff,
+    set_retry_budget,
+)
+
+
+def http_error(status_code):
+    request = httpx.Request("GET", "https://api.example.com")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class TestRetryDecorator(unittest.TestCase):
+    """Test retry_with_exponential_backoff on coroutine functions."""
+
+    def setUp(self):
+        self.call_count = 0
+        get_circuit_breaker("test_provider").reset()
+
+    @patch('resilience.asyncio.sleep', new_callable=AsyncMock)
+    def test_async_function_is_retried(self, mock_sleep):
+        """Test coroutine failures are awaited and retried, not returned unawaited."""
+        @retry_with_exponential_backoff(provider="test_provider")
+        async def flaky():
+            self.call_count += 1
+            if self.call_count < 3:
+                raise ResourceExhausted("Rate limit hit")
+            return {"success": True}
+
+        self.assertTrue(asyncio.iscoroutinefunction(flaky))
+        self.assertEqual(asyncio.run(flaky()), {"success": True})
+        self.assertEqual(self.call_count, 3)
+        self.assertEqual(mock_sleep.await_count, 2)
+
+    @patch('resilience.time.sleep')
+    @patch('resilience.asyncio.sleep', new_callable=AsyncMock)
+    def test_async_retries_do_not_block_the_loop(self, mock_async_sleep, mock_sleep):
+        """Test coroutine retries never call time.sleep."""
+        @retry_with_exponential_backoff(max_retries=3)
+        async def always_failing():
+            raise ConnectionError("reset by peer")
+
+        self.assertEqual(asyncio.run(always_failing()), {})
+        mock_sleep.assert_not_called()
+        self.assertEqual(mock_async_sleep.await_count, 2)
+
+    def test_non_transient_errors_are_not_retried(self):
+        """Test programming errors give up immediately."""
+        @retry_with_exponential_backoff(return_empty_dict_on_failure=False)
+        async def broken():
+            self.call_count += 1
+            raise ValueError("bad input")
+
+        self.assertIsNone(asyncio.run(broken()))
+        self.assertEqual(self.call_count, 1)
+
+    @patch('resilience.asyncio.sleep', new_callable=AsyncMock)
+    def test_retry_budget_limits_retries(self, mock_sleep):
+        """Test a job's retry budget is shared by all its calls."""
+        @retry_with_exponential_backoff(max_retries=5)
+        async def always_failing():
+            self.call_count += 1
+            raise ResourceExhausted("Rate limit hit")
+
+        async def run():
+            budget = RetryBudget(3)
+            token = set_retry_budget(budget)
+            try:
+                await asyncio.gather(always_failing(), always_failing())
+            finally:
+                reset_retry_budget(token)
+            return budget
+
+        budget = asyncio.run(run())
+        self.assertTrue(budget.exhausted)
+        self.assertEqual(mock_sleep.await_count, 3)
+        self.assertEqual(self.call_count, 5)  # 2 first attempts + 3 retries
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test CircuitBreaker state changes."""
+
+    def test_opens_after_threshold_and_recovers(self):
+        """Test the breaker short-circuits while open and closes after a good trial."""
+        breaker = CircuitBreaker("provider", failure_threshold=2, reset_timeout=0.05)
+
+        for _ in range(2):
+            breaker.before_call()
+            breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        breaker.before_call()
+        # Only one trial call at a time while half-open
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_success()
+
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        metrics = breaker.get_metrics()
+        self.assertEqual((metrics["short_circuited"], metrics["times_opened"]), (2, 1))
+
+    @patch('resilience.asyncio.sleep', new_callable=AsyncMock)
+    def test_open_breaker_skips_decorated_calls(self, mock_sleep):
+        """Test decorated calls return the default without calling the provider."""
+        breaker = get_circuit_breaker("down_provider")
+        breaker.reset()
+        calls = []
+
+        @retry_with_exponential_backoff(max_retries=2, provider="down_provider")
+        async def call_provider():
+            calls.append(1)
+            raise ResourceExhausted("Rate limit hit")
+
+        async def run():
+            for _ in range(breaker.failure_threshold + 2):
+                await call_provider()
+
+        asyncio.run(run())
+        self.assertEqual(len(calls), breaker.failure_threshold * 2)
+        self.assertEqual(breaker.get_metrics()["short_circuited"], 2)
+        breaker.reset()
+
+
+class TestCallWithRetry(unittest.TestCase):
+    """Test call_with_retry for callers that handle errors themselves."""
+
+    def setUp(self):
+        get_circuit_breaker("http_provider").reset()
+
+    @patch('resilience.asyncio.sleep', new_callable=AsyncMock)
+    def test_retries_transient_http_errors(self, mock_sleep):
+        """Test 429 and 5xx responses are retried."""
+        send = AsyncMock(side_effect=[http_error(429), http_error(503), "ok"])
+
+        self.assertEqual(asyncio.run(call_with_retry("http_provider", send)), "ok")
+        self.assertEqual(send.await_count, 3)
+
+    def test_reraises_client_errors(self):
+        """Test 4xx errors other than 429 are raised without retrying."""
+        send = AsyncMock(side_effect=http_error(401))
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            asyncio.run(call_with_retry("http_provider", send))
+        self.assertEqual(send.await_count, 1)
+
+
+class TestHelpers(unittest.TestCase):
+    """Test error classification and jitter."""
+
+    def test_is_transient_error(self):
+        self.assertTrue(is_transient_error(ResourceExhausted("quota")))
+        self.assertTrue(is_transient_error(httpx.ReadTimeout("timeout")))
+        self.assertTrue(is_transient_error(http_error(502)))
+        self.assertFalse(is_transient_error(http_error(404)))
+        self.assertFalse(is_transient_error(KeyError("missing")))
+
+    def test_full_jitter_delay_bounds(self):
+        with patch('resilience.random.uniform', side_effect=lambda low, high: (low, high)):
+            self.assertEqual(full_jitter_delay(0, 2, 60), (0, 2))
+            self.assertEqual(full_jitter_delay(3, 2, 60), (0, 16))
+            self.assertEqual(full_jitter_delay(10, 2, 60), (0, 60))
+
+
+if __name__ == '__main__':
+    unittest.main()
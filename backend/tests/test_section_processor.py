@@ -0,0 +1,97 @@
+"""
+Unit tests for section skip/resume in pipeline/orchestrators/section_processor.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, Mock
+
+from pipeline.interfaces import TranscriptSection, TranscriptUtterance
+from pipeline.orchestrators.section_processor import SectionProcessor
+
+
+def make_sections(count):
+    return [
+        TranscriptSection(
+            utterances=[TranscriptUtterance("Speaker A", i * 60.0, i * 60.0 + 60, f"part {i}")],
+            start_time=i * 60.0,
+            end_time=i * 60.0 + 60,
+        )
+        for i in range(count)
+    ]
+
+
+class TestSectionResume(unittest.TestCase):
+    """Test that saved section results are looked up in bulk."""
+
+    def setUp(self):
+        self.db_manager = Mock()
+        self.analyzer = Mock()
+        # New sections stop right after analysis so no enrichment is needed
+        self.analyzer.analyze_content = AsyncMock(return_value=None)
+        self.processor = SectionProcessor(self.analyzer, Mock(), self.db_manager)
+
+    def test_saved_sections_are_skipped_from_one_query(self):
+        """Test resume decisions come from a single results query."""
+        self.db_manager.get_section_results_by_id.return_value = {
+            "section_000": {"generated_title": "Intro", "1_sentence_summary": "Hello"},
+            "section_002": {"generated_title": "Outro"},
+        }
+
+        results = asyncio.run(
+            self.processor.process_sections_parallel(make_sections(3), "user_1", "job_1", None)
+        )
+
+        self.assertEqual(
+            [r.status for r in results], ["skipped", "skipped_no_data", "skipped"]
+        )
+        self.assertEqual(results[0].full_analysis.title, "Intro")
+        self.assertEqual(results[2].full_analysis.title, "Outro")
+        self.db_manager.get_section_results_by_id.assert_called_once_with("user_1", "job_1")
+        self.db_manager.does_section_result_exist.assert_not_called()
+        self.db_manager.get_section_result.assert_not_called()
+        self.assertEqual(self.analyzer.analyze_content.await_count, 1)
+
+    def test_falls_back_to_per_section_reads(self):
+        """Test a failed bulk query falls back to checking each section."""
+        self.db_manager.get_section_results_by_id.side_effect = ConnectionError("unavailable")
+        self.db_manager.does_section_result_exist.side_effect = lambda u, j, doc_id: doc_id == "section_001"
+        self.db_manager.get_section_result.return_value = {"generated_title": "Middle"}
+
+        results = asyncio.run(
+            self.processor.process_sections_parallel(make_sections(2), "user_1", "job_1", None)
+        )
+
+        self.assertEqual([r.status for r in results], ["skipped_no_data", "skipped"])
+        self.assertEqual(self.db_manager.does_section_result_exist.call_count, 2)
+        self.db_manager.get_section_result.assert_called_once_with("user_1", "job_1", "section_001")
+
+
+class TestBatchedPersistence(unittest.TestCase):
+    """Test batched section result saves."""
+
+    def test_results_are_committed_before_returning(self):
+        """Test queued results are flushed when the section step ends."""
+        db_manager = Mock()
+        db_manager.get_section_results_by_id.return_value = {}
+        processor = SectionProcessor(Mock(), Mock(), db_manager, result_persistence="batched")
+
+        async def analyze_and_save(section, index, user_id, job_id, config):
+            await processor._save_section_result(user_id, job_id, index, {"generated_title": str(index)})
+
+        processor.process_section = analyze_and_save
+        asyncio.run(processor.process_sections_parallel(make_sections(3), "user_1", "job_1", None))
+
+        db_manager.save_section_results_batch.assert_called_once()
+        _, _, results = db_manager.save_section_results_batch.call_args[0]
+        self.assertEqual(sorted(results), [0, 1, 2])
+        db_manager.save_section_result.assert_not_called()
+        self.assertIsNone(processor.result_writer)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Unit tests for batched section persistence in pipeline/utils/section_result_writer.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import unittest
+
+from pipeline.utils.section_result_writer import SectionResultWriter
+
+
+class RecordingDB:
+    """Collects batched and individual section saves."""
+
+    def __init__(self, batch_failures=0, single_failures=0):
+        self.batches = []
+        self.single_saves = []
+        self.batch_failures = batch_failures
+        self.single_failures = single_failures
+
+    async def save_section_results_batch(self, user_id, job_id, results):
+        if self.batch_failures:
+            self.batch_failures -= 1
+            raise ConnectionError("Firestore unavailable")
+        self.batches.append(dict(results))
+
+    async def save_section_result(self, user_id, job_id, section_index, section_data):
+        if self.single_failures:
+            self.single_failures -= 1
+            raise ConnectionError("Firestore unavailable")
+        self.single_saves.append(section_index)
+
+
+class TestSectionResultWriter(unittest.TestCase):
+    """Test SectionResultWriter batching limits and failure handling."""
+
+    def test_commits_when_count_reached(self):
+        """Test a full batch is committed immediately."""
+        db = RecordingDB()
+
+        async def run():
+            writer = SectionResultWriter(db, "user_1", "job_1", max_results=2, max_latency=60)
+            await writer.save(1, {"generated_title": "B"})
+            self.assertEqual(db.batches, [])
+            await writer.save(0, {"generated_title": "A"})
+            self.assertEqual(len(db.batches), 1)
+            await writer.close()
+            return writer
+
+        writer = asyncio.run(run())
+        self.assertEqual(set(db.batches[0]), {0, 1})
+        self.assertEqual((writer.results_saved, writer.batches_written), (2, 1))
+
+    def test_commits_when_bytes_reached(self):
+        """Test large results are committed before the count limit."""
+        db = RecordingDB()
+
+        async def run():
+            writer = SectionResultWriter(db, "user_1", "job_1", max_results=50, max_bytes=100, max_latency=60)
+            await writer.save(0, {"summary": "x" * 200})
+            await writer.close()
+
+        asyncio.run(run())
+        self.assertEqual(len(db.batches), 1)
+
+    def test_commits_after_max_latency(self):
+        """Test pending results are committed once max_latency passes."""
+        db = RecordingDB()
+
+        async def run():
+            writer = SectionResultWriter(db, "user_1", "job_1", max_results=50, max_latency=0.05)
+            await writer.save(0, {"generated_title": "A"})
+            await asyncio.sleep(0.2)
+            self.assertEqual(len(db.batches), 1)
+            await writer.close()
+
+        asyncio.run(run())
+        self.assertEqual(len(db.batches), 1)
+
+    def test_failed_batch_falls_back_to_single_saves(self):
+        """Test results from a failed batch are saved one by one on close."""
+        db = RecordingDB(batch_failures=2)
+
+        async def run():
+            writer = SectionResultWriter(db, "user_1", "job_1", max_results=2, max_latency=60)
+            await writer.save(0, {"generated_title": "A"})
+            await writer.save(1, {"generated_title": "B"})
+            self.assertEqual(writer.pending_count, 2)
+            await writer.close()
+            return writer
+
+        writer = asyncio.run(run())
+        self.assertEqual(db.single_saves, [0, 1])
+        self.assertEqual(writer.results_saved, 2)
+        self.assertEqual(writer.pending_count, 0)
+
+    def test_failed_size_flush_is_retried_by_timer(self):
+        """Test a failed commit in save() leaves the results for the timer."""
+        db = RecordingDB(batch_failures=1)
+
+        async def run():
+            writer = SectionResultWriter(db, "user_1", "job_1", max_results=2, max_latency=0.05)
+            await writer.save(0, {"generated_title": "A"})
+            await writer.save(1, {"generated_title": "B"})
+            self.assertEqual(writer.pending_count, 2)
+            await asyncio.sleep(0.2)
+            self.assertEqual(writer.pending_count, 0)
+            await writer.close()
+
+        asyncio.run(run())
+        self.assertEqual(db.batches, [{0: {"generated_title": "A"}, 1: {"generated_title": "B"}}])
+        self.assertEqual(db.single_saves, [])
+
+    def test_close_raises_when_single_saves_fail(self):
+        """Test close() raises once the per-result fallback fails too."""
+        db = RecordingDB(batch_failures=2, single_failures=1)
+
+        async def run():
+            writer = SectionResultWriter(db, "user_1", "job_1", max_results=1, max_latency=60)
+            await writer.save(0, {"generated_title": "A"})
+            with self.assertRaises(ConnectionError):
+                await writer.close()
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Unit tests for stage checkpoints in pipeline/orchestrators/stage_checkpoints.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import unittest
+from unittest.mock import Mock
+
+from pipeline.interfaces import TranscriptSection, TranscriptUtterance
+from pipeline.orchestrators.stage_checkpoints import (
+    STAGE_VERSIONS,
+    StageCheckpoints,
+    sections_from_checkpoint,
+    sections_to_checkpoint,
+)
+
+
+def stored(**stages):
+    return {
+        stage: {"version": STAGE_VERSIONS[stage], "data": data}
+        for stage, data in stages.items()
+    }
+
+
+class TestStageCheckpoints(unittest.TestCase):
+    """Test which stages a resumed job may skip."""
+
+    def setUp(self):
+        self.db_manager = Mock()
+        self.checkpoints = StageCheckpoints(self.db_manager, "user_1", "job_1")
+
+    def load(self, checkpoints):
+        self.db_manager.get_job_checkpoints.return_value = checkpoints
+        return asyncio.run(self.checkpoints.load())
+
+    def test_completed_stages_are_skipped(self):
+        completed = self.load(stored(transcript={"utterances": []}, sections=[], synthesis={"a": 1}))
+
+        self.assertEqual(completed, ["transcript", "sections", "synthesis"])
+        self.assertEqual(self.checkpoints.get("synthesis"), {"a": 1})
+        self.assertIsNone(self.checkpoints.get("title"))
+        self.db_manager.get_job_checkpoints.assert_called_once_with("user_1", "job_1")
+
+    def test_only_leading_stages_count(self):
+        """Test a later checkpoint is not used when an earlier stage must run again."""
+        completed = self.load(stored(transcript={"utterances": []}, synthesis={"a": 1}))
+
+        self.assertEqual(completed, ["transcript"])
+        self.assertIsNone(self.checkpoints.get("synthesis"))
+
+    def test_sections_do_not_need_the_transcript_checkpoint(self):
+        """Test a stored sections checkpoint is used when the transcript one is missing."""
+        sections = {"sections": [], "cost_metrics": {}, "youtube_metadata": {}}
+        completed = self.load(stored(sections=sections, synthesis={"a": 1}))
+
+        self.assertEqual(completed, ["sections", "synthesis"])
+        self.assertEqual(self.checkpoints.get("sections"), sections)
+        self.assertIsNone(self.checkpoints.get("transcript"))
+
+    def test_checkpoints_from_another_version_are_ignored(self):
+        checkpoints = stored(transcript={"utterances": []})
+        checkpoints["transcript"]["version"] = STAGE_VERSIONS["transcript"] + 1
+
+        self.assertEqual(self.load(checkpoints), [])
+
+    def test_failed_save_does_not_stop_the_job(self):
+        self.db_manager.save_job_checkpoint.side_effect = ConnectionError("down")
+
+        asyncio.run(self.checkpoints.save("transcript", {"utterances": []}))
+
+        self.assertEqual(self.checkpoints.saved, 0)
+        self.assertEqual(self.checkpoints.completed_stages(), ["transcript"])
+
+    def test_save_records_the_stage_version(self):
+        self.db_manager.save_job_checkpoint.return_value = True
+
+        asyncio.run(self.checkpoints.save("title", "A title"))
+
+        self.db_manager.save_job_checkpoint.assert_called_once_with(
+            "user_1", "job_1", "title", STAGE_VERSIONS["title"], "A title"
+        )
+        self.assertEqual(self.checkpoints.saved, 1)
+
+    def test_save_after_waits_for_the_job_write(self):
+        """Test a checkpoint is only stored once its job fields are."""
+        self.db_manager.save_job_checkpoint.return_value = True
+        written = []
+
+        async def job_write(fail):
+            await asyncio.sleep(0.01)
+            if fail:
+                raise ConnectionError("down")
+            written.append(True)
+
+        async def run():
+            self.checkpoints.save_after("transcript", {"utterances": []}, job_write(fail=False))
+            self.checkpoints.save_after("sections", [], job_write(fail=True))
+            self.assertEqual(self.checkpoints.get("sections"), [])
+            self.db_manager.save_job_checkpoint.assert_not_called()
+            await self.checkpoints.wait_saved()
+
+        asyncio.run(run())
+
+        self.assertEqual(written, [True])
+        self.db_manager.save_job_checkpoint.assert_called_once_with(
+            "user_1", "job_1", "transcript", STAGE_VERSIONS["transcript"], {"utterances": []}
+        )
+        self.assertEqual(self.checkpoints.saved, 1)
+
+    def test_sections_round_trip(self):
+        sections = [
+            TranscriptSection(
+                utterances=[TranscriptUtterance("Speaker A", 0.0, 2.5, "Hello there")],
+                start_time=0.0,
+                end_time=2.5,
+            )
+        ]
+
+        self.assertEqual(sections_from_checkpoint(sections_to_checkpoint(sections)), sections)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Unit tests for stage scheduling in pipeline/orchestrators/stage_graph.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import time
+import unittest
+from graphlib import CycleError
+
+from pipeline.orchestrators.stage_graph import Stage, StageGraph
+
+
+class TestStageGraph(unittest.TestCase):
+    """Test stages run in dependency order and concurrently where possible."""
+
+    def test_outputs_flow_to_dependent_stages(self):
+        async def double(number):
+            return number * 2
+
+        async def add(number, double):
+            return number + double
+
+        graph = StageGraph([
+            Stage("add", add, inputs=("number", "double")),
+            Stage("double", double, inputs=("number",)),
+        ])
+
+        outputs = asyncio.run(graph.run({"number": 3}))
+
+        self.assertEqual(outputs["double"], 6)
+        self.assertEqual(outputs["add"], 9)
+
+    def test_independent_stages_run_concurrently(self):
+        """Test two 0.2s stages after a shared input finish in about 0.2s."""
+        events = []
+
+        async def slow(name):
+            events.append(("start", name))
+            await asyncio.sleep(0.2)
+            events.append(("end", name))
+
+        async def left(source):
+            await slow("left")
+
+        async def right(source):
+            await slow("right")
+
+        async def last(left, right):
+            events.append(("start", "last"))
+
+        graph = StageGraph([
+            Stage("left", left, inputs=("source",)),
+            Stage("right", right, inputs=("source",)),
+            Stage("last", last, inputs=("left", "right")),
+        ])
+        timing_metrics = {}
+
+        started = time.monotonic()
+        asyncio.run(graph.run({"source": None}, timing_metrics))
+
+        self.assertLess(time.monotonic() - started, 0.35)
+        self.assertEqual(events[:2], [("start", "left"), ("start", "right")])
+        self.assertEqual(events[-1], ("start", "last"))
+        self.assertGreaterEqual(timing_metrics["stage_left_s"], 0.2)
+        self.assertIn("stage_last_s", timing_metrics)
+
+    def test_failure_cancels_running_stages(self):
+        cancelled = []
+
+        async def fails():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def after(fails):
+            raise AssertionError("must not run")
+
+        graph = StageGraph([
+            Stage("fails", fails),
+            Stage("slow", slow),
+            Stage("after", after, inputs=("fails",)),
+        ])
+
+        with self.assertRaises(ValueError):
+            asyncio.run(graph.run())
+        self.assertEqual(cancelled, [True])
+
+    def test_invalid_graphs_are_rejected(self):
+        async def noop(**_):
+            return None
+
+        with self.assertRaises(ValueError):
+            StageGraph([Stage("a", noop, inputs=("missing",))]).order()
+        with self.assertRaises(CycleError):
+            StageGraph([
+                Stage("a", noop, inputs=("b",)),
+                Stage("b", noop, inputs=("a",)),
+            ]).order()
+        with self.assertRaises(ValueError):
+            StageGraph([Stage("a", noop), Stage("a", noop)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Unit tests for job tracing in tracing.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import json
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import tracing
+from resilience import call_with_retry
+from tracing import configure_tracing, current_trace_id, shutdown_tracing, start_span, trace_context
+from pipeline.orchestrators.stage_graph import Stage, StageGraph
+from pipeline.utils import AsyncDBManager
+from pipeline.utils.rate_limiter import LLMRateLimiter, RateLimitedLLM
+
+
+class TracingTestCase(unittest.TestCase):
+    """Records spans to a temporary OTLP/JSON file."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "traces.jsonl")
+        configure_tracing("test-service", self.path)
+
+    def tearDown(self):
+        shutdown_tracing()
+        self.tmp.cleanup()
+
+    def read_spans(self):
+        spans = []
+        with open(self.path) as f:
+            for line in f:
+                request = json.loads(line)
+                for resource_spans in request["resourceSpans"]:
+                    for scope_spans in resource_spans["scopeSpans"]:
+                        spans.extend(scope_spans["spans"])
+        return {span["name"]: span for span in spans}
+
+
+class TestSpans(TracingTestCase):
+
+    def test_nested_spans_share_the_trace(self):
+        with trace_context("ab" * 16) as trace_id:
+            with start_span("job", job_id="job_1"):
+                with start_span("stage.sections", sections=3):
+                    pass
+
+        spans = self.read_spans()
+        self.assertEqual(trace_id, "ab" * 16)
+        self.assertEqual(spans["job"]["traceId"], trace_id)
+        self.assertEqual(spans["stage.sections"]["traceId"], trace_id)
+        self.assertEqual(spans["stage.sections"]["parentSpanId"], spans["job"]["spanId"])
+        self.assertNotIn("parentSpanId", spans["job"])
+        self.assertIn(
+            {"key": "sections", "value": {"intValue": "3"}},
+            spans["stage.sections"]["attributes"],
+        )
+
+    def test_file_lines_are_otlp_export_requests(self):
+        with start_span("api.process"):
+            pass
+
+        with open(self.path) as f:
+            request = json.loads(f.readline())
+        resource = request["resourceSpans"][0]["resource"]
+        self.assertIn(
+            {"key": "service.name", "value": {"stringValue": "test-service"}},
+            resource["attributes"],
+        )
+        span = request["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        self.assertEqual(len(span["traceId"]), 32)
+        self.assertEqual(len(span["spanId"]), 16)
+        self.assertLessEqual(int(span["startTimeUnixNano"]), int(span["endTimeUnixNano"]))
+
+    def test_escaping_error_marks_the_span(self):
+        with self.assertRaises(ValueError):
+            with start_span("stage.title"):
+                raise ValueError("no title")
+
+        status = self.read_spans()["stage.title"]["status"]
+        self.assertEqual(status["code"], 2)
+        self.assertIn("no title", status["message"])
+
+    def test_invalid_trace_id_starts_a_new_trace(self):
+        with trace_context("not-a-trace-id") as trace_id:
+            self.assertEqual(len(trace_id), 32)
+            self.assertEqual(current_trace_id(), trace_id)
+        self.assertIsNone(current_trace_id())
+
+    def test_concurrent_tasks_are_children_of_the_enclosing_span(self):
+        async def section(index):
+            with start_span(f"section.{index}"):
+                await asyncio.sleep(0)
+
+        async def run():
+            with start_span("stage.sections"):
+                await asyncio.gather(section(0), section(1))
+
+        asyncio.run(run())
+        spans = self.read_spans()
+        for name in ("section.0", "section.1"):
+            self.assertEqual(spans[name]["parentSpanId"], spans["stage.sections"]["spanId"])
+
+
+class TestDisabledTracing(unittest.TestCase):
+
+    def test_trace_id_propagates_without_recording(self):
+        shutdown_tracing()
+        with trace_context("cd" * 16):
+            with start_span("job") as span:
+                span.set_attribute("job_id", "job_1")
+                self.assertEqual(current_trace_id(), "cd" * 16)
+        self.assertFalse(tracing.tracing_enabled())
+
+
+class TestInstrumentation(TracingTestCase):
+    """Test spans from the shared choke points: Firestore, providers, LLMs, stages."""
+
+    def test_firestore_calls(self):
+        db = SimpleNamespace(get_job_status=lambda user_id, job_id: {"status": "QUEUED"})
+
+        async def run():
+            with start_span("job"):
+                return await AsyncDBManager(db).get_job_status("user_1", "job_1")
+
+        self.assertEqual(asyncio.run(run()), {"status": "QUEUED"})
+        spans = self.read_spans()
+        self.assertEqual(
+            spans["firestore.get_job_status"]["parentSpanId"], spans["job"]["spanId"]
+        )
+
+    def test_provider_requests(self):
+        async def search():
+            return {"results": []}
+
+        asyncio.run(call_with_retry("tracing-test", search))
+        span = self.read_spans()["tracing-test.request"]
+        self.assertIn({"key": "attempt", "value": {"intValue": "1"}}, span["attributes"])
+
+    def test_llm_calls(self):
+        llm = RateLimitedLLM(
+            FakeListChatModel(responses=["hello"]),
+            LLMRateLimiter("fake-model", rpm=100, tpm=100_000),
+        )
+        asyncio.run(llm.ainvoke("Say hello"))
+
+        attributes = {
+            a["key"]: a["value"] for a in self.read_spans()["llm.call"]["attributes"]
+        }
+        self.assertEqual(attributes["llm.model"], {"stringValue": "fake-model"})
+        self.assertEqual(attributes["llm.cache"], {"stringValue": "miss"})
+        self.assertIn("llm.rate_limit_wait_s", attributes)
+
+    def test_stage_graph_stages(self):
+        async def synthesis(section_analyses):
+            return {"summary": "s"}
+
+        async def title(synthesis):
+            return "Title"
+
+        graph = StageGraph(
+            [
+                Stage("synthesis", synthesis, ("section_analyses",)),
+                Stage("title", title, ("synthesis",)),
+            ]
+        )
+
+        async def run():
+            with start_span("job"):
+                await graph.run({"section_analyses": []})
+
+        asyncio.run(run())
+        spans = self.read_spans()
+        self.assertEqual(spans["stage.title"]["parentSpanId"], spans["job"]["spanId"])
+        self.assertEqual(spans["stage.synthesis"]["traceId"], spans["job"]["traceId"])
+
+
+if __name__ == '__main__':
+    unittest.main()
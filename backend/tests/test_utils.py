@@ -473,6 +473,35 @@ class TestFormatIsoDurationToReadable(unittest.TestCase):
             pass
 
 
+class TestYouTubeMetadataCache(unittest.TestCase):
+    """Test repeat metadata lookups are served from memory."""
+
+    def setUp(self):
+        utils._metadata_cache.clear()
+
+    def tearDown(self):
+        utils._metadata_cache.clear()
+
+    def test_second_lookup_skips_the_api(self):
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "items": [{"snippet": {"title": "Cached"}, "contentDetails": {"duration": "PT1M"}}]
+        }
+        mock_client = Mock()
+        mock_client.get = AsyncMock(return_value=mock_response)
+
+        async def run_test():
+            with patch.dict(os.environ, {"YOUTUBE_API_KEY": "key"}):
+                first = await utils.fetch_youtube_metadata("video", client=mock_client)
+                second = await utils.fetch_youtube_metadata("video", client=mock_client)
+            return first, second
+
+        first, second = asyncio.run(run_test())
+        self.assertEqual(first, second)
+        self.assertEqual(first["title"], "Cached")
+        mock_client.get.assert_awaited_once()
+
+
 class TestUtilsIntegration(unittest.TestCase):
     """Test integration scenarios for utils module."""
     